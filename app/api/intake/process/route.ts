@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { writeFile, mkdir } from "fs/promises";
-import { existsSync } from "fs";
+import { createReadStream, existsSync } from "fs";
 import { join } from "path";
 import { supabase } from "@/lib/supabase";
 import { DEMO_PATIENT_ID, getPatientIdForUser } from "@/lib/auth";
@@ -150,47 +150,61 @@ export async function POST(request: NextRequest) {
 
     console.log(`Pipeline completed. Session ID: ${pipelineResult.session_id}`);
 
-    // Use the path from pipeline result
-    const zipPath = pipelineResult.final_zip_path;
+    // The pipeline streams artifacts to object storage itself when
+    // STORAGE_BACKEND=s3; otherwise upload them here
+    const isRemoteUrl = (url: string | null | undefined) =>
+      typeof url === "string" && /^https?:\/\//.test(url);
 
-    if (!existsSync(zipPath)) {
-      console.error(`Expected zip at: ${zipPath}`);
-      return NextResponse.json(
-        { error: "Pipeline completed but final.zip not found", path: zipPath },
-        { status: 500 }
-      );
-    }
-
-    // Upload to Supabase Storage
     const uniqueId = pipelineResult.session_id.substring(0, 8);
-    const zipFileName = `final_${uniqueId}.zip`;
-
-    const zipBuffer = await require("fs/promises").readFile(zipPath);
-    const { data: uploadData, error: uploadError } = await supabase.storage
-      .from("carebnbstoragebucket")
-      .upload(zipFileName, zipBuffer, {
-        contentType: "application/zip",
-        upsert: false,
-      });
-
-    if (uploadError) {
-      console.error("Supabase upload error:", uploadError);
-      return NextResponse.json(
-        { error: "Failed to upload to storage", details: uploadError.message },
-        { status: 500 }
-      );
-    }
+    let pdfUrl: string;
 
-    // Get public URL
-    const { data: urlData } = supabase.storage
-      .from("carebnbstoragebucket")
-      .getPublicUrl(zipFileName);
+    if (isRemoteUrl(pipelineResult.final_zip_url)) {
+      pdfUrl = pipelineResult.final_zip_url;
+    } else {
+      // Use the path from pipeline result
+      const zipPath = pipelineResult.final_zip_path;
+
+      if (!existsSync(zipPath)) {
+        console.error(`Expected zip at: ${zipPath}`);
+        return NextResponse.json(
+          { error: "Pipeline completed but final.zip not found", path: zipPath },
+          { status: 500 }
+        );
+      }
 
-    const pdfUrl = urlData.publicUrl;
+      // Upload to Supabase Storage
+      const zipFileName = `final_${uniqueId}.zip`;
+
+      // Stream the zip from disk instead of buffering the whole file
+      const { data: uploadData, error: uploadError } = await supabase.storage
+        .from("carebnbstoragebucket")
+        .upload(zipFileName, createReadStream(zipPath), {
+          contentType: "application/zip",
+          upsert: false,
+          duplex: "half",
+        });
+
+      if (uploadError) {
+        console.error("Supabase upload error:", uploadError);
+        return NextResponse.json(
+          { error: "Failed to upload to storage", details: uploadError.message },
+          { status: 500 }
+        );
+      }
+
+      // Get public URL
+      const { data: urlData } = supabase.storage
+        .from("carebnbstoragebucket")
+        .getPublicUrl(zipFileName);
+
+      pdfUrl = urlData.publicUrl;
+    }
 
     // Upload audio file to storage if it was audio input
     let audioUrl: string | null = null;
-    if (isAudio && audioFile) {
+    if (isRemoteUrl(pipelineResult.audio_url)) {
+      audioUrl = pipelineResult.audio_url;
+    } else if (isAudio && audioFile) {
       const audioFileName = `audio_${uniqueId}.${audioFile.name.split(".").pop() || "m4a"}`;
       const audioBytes = await audioFile.arrayBuffer();
       const audioBuffer = Buffer.from(audioBytes);
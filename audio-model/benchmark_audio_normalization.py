@@ -0,0 +1,85 @@
+"""
+Benchmark Audio Normalization
+
+Compares upload size and Whisper latency for recordings as recorded versus
+normalized to mono 16 kHz Opus (what Component 1 uploads).
+
+Usage:
+    python benchmark_audio_normalization.py <audio files...> [--no-whisper]
+
+Whisper timings need OPENAI_API_KEY; pass --no-whisper to only measure
+sizes and normalization time.
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from src.models.component1 import config
+from src.models.component1.audio_tools import ffmpeg_available, normalize_audio, probe_duration
+from src.models.component1.backends import OpenAIWhisperBackend
+
+
+def time_whisper(backend: OpenAIWhisperBackend, audio_path: Path) -> float:
+    """Upload and transcribe a file, returning wall time in seconds."""
+    start = time.perf_counter()
+    backend.transcribe(audio_path)
+    return time.perf_counter() - start
+
+
+def run_benchmark(audio_path: Path, backend, work_dir: Path):
+    """Normalize one recording and print size/latency before and after."""
+    normalized_path = work_dir / f"{audio_path.stem}_normalized.ogg"
+
+    start = time.perf_counter()
+    normalize_audio(audio_path, normalized_path)
+    normalize_seconds = time.perf_counter() - start
+
+    original_size = audio_path.stat().st_size
+    normalized_size = normalized_path.stat().st_size
+    duration = probe_duration(audio_path) or 0.0
+
+    print(f"\n{audio_path.name} ({duration:.0f}s)")
+    print(f"  upload bytes:   {original_size:>12,} -> {normalized_size:>12,} "
+          f"({normalized_size / original_size:.1%})")
+    print(f"  normalize time: {normalize_seconds:.2f}s")
+
+    if backend is not None:
+        before = time_whisper(backend, audio_path)
+        after = time_whisper(backend, normalized_path)
+        print(f"  whisper time:   {before:>11.2f}s -> {after:>11.2f}s "
+              f"(incl. normalize: {after + normalize_seconds:.2f}s)")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    skip_whisper = '--no-whisper' in sys.argv
+
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    if not ffmpeg_available():
+        print(f"✗ ffmpeg not found ({config.FFMPEG_BINARY})")
+        sys.exit(1)
+
+    backend = None
+    if not skip_whisper:
+        if not config.OPENAI_API_KEY:
+            print("✗ OPENAI_API_KEY not set (use --no-whisper to skip Whisper timings)")
+            sys.exit(1)
+        backend = OpenAIWhisperBackend()
+
+    print("=" * 70)
+    print(f"BENCHMARK: Audio normalization (mono {config.NORMALIZED_SAMPLE_RATE} Hz, "
+          f"Opus {config.NORMALIZED_BITRATE})")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for arg in args:
+            run_benchmark(Path(arg), backend, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
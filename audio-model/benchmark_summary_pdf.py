@@ -0,0 +1,83 @@
+"""
+Benchmark Summary PDF Rendering
+
+Times generate_final_summary_pdf per session for a typical analysis and for
+an oversized one that overflows onto continuation pages.
+
+Usage:
+    python benchmark_summary_pdf.py [sessions]
+"""
+
+import sys
+import time
+import tempfile
+import statistics
+from pathlib import Path
+
+from src.models.component4.cot_agent import extract_json_from_response
+from src.models.component4.pdf_generator import generate_final_summary_pdf
+
+
+def make_long_analysis(analysis: dict, factor: int = 6) -> dict:
+    """Repeat every text field so most sections overflow their boxes."""
+    long = dict(analysis)
+    long['transcript_summary'] = ' '.join([analysis['transcript_summary']] * factor)
+    long['patient_summary'] = ' '.join([analysis['patient_summary']] * factor * 2)
+    long['soap'] = {k: ' '.join([v] * factor) for k, v in analysis['soap'].items()}
+    long['healthcare_fields'] = analysis['healthcare_fields'] * factor
+    long['devices'] = analysis['devices'] * factor
+    return long
+
+
+def run_benchmark(name: str, analysis: dict, sessions: int, output_dir: Path):
+    """Render the summary PDF `sessions` times and print timing stats."""
+    timings = []
+    pages = 0
+
+    for i in range(sessions):
+        output_path = output_dir / f"{name}_{i}.pdf"
+        start = time.perf_counter()
+        generate_final_summary_pdf(
+            iteration=i,
+            keywords=analysis['keywords'],
+            transcript_summary=analysis['transcript_summary'],
+            patient_summary=analysis['patient_summary'],
+            soap=analysis['soap'],
+            healthcare_fields=analysis['healthcare_fields'],
+            devices=analysis['devices'],
+            urgency=analysis['urgency'],
+            output_path=output_path
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+
+        if i == 0:
+            import fitz
+            with fitz.open(str(output_path)) as doc:
+                pages = len(doc)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<10} sessions={sessions:<4} pages={pages:<3} "
+          f"mean={statistics.mean(timings):7.1f}ms  "
+          f"p50={statistics.median(timings):7.1f}ms  "
+          f"p95={p95:7.1f}ms")
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    # Default analysis used when the model response cannot be parsed
+    analysis = extract_json_from_response("")
+
+    print("=" * 70)
+    print("BENCHMARK: Summary PDF rendering (per session)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        run_benchmark("typical", analysis, sessions, output_dir)
+        run_benchmark("overflow", make_long_analysis(analysis), sessions, output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ Example Usage:
     # Process audio
     result = api.process_audio(audio_bytes, format='m4a')
 
+    # Process audio while it is still being received
+    result = api.process_audio_stream(chunk_iterator, format='webm')
+
     # Process text
     result = api.process_text("Patient has fever and swollen lymph nodes...")
 
@@ -24,7 +27,7 @@ Example Usage:
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Union
+from typing import Callable, Optional, List, Dict, Union, Iterator, Iterable
 from dataclasses import dataclass
 
 from pipeline_config import PipelineConfig
@@ -33,8 +36,13 @@ from src.models.session_manager import (
     get_session_path,
     update_session_metadata,
     get_session_metadata,
-    get_session_files
+    get_session_files,
+    get_session_artifacts,
+    artifact_url,
+    ingest_audio,
+    AudioSource
 )
+from src.models.session_artifacts import record_artifact
 
 
 @dataclass
@@ -51,6 +59,10 @@ class PipelineResult:
     final_zip_path: Optional[Path] = None
     highlighted_sources_paths: Optional[List[Path]] = None
 
+    # Storage backend URLs (src/models/artifact_storage.py)
+    final_zip_url: Optional[str] = None
+    audio_url: Optional[str] = None
+
     # Data (for serving via web)
     summary_pdf_data: Optional[bytes] = None
     final_zip_data: Optional[bytes] = None
@@ -71,25 +83,73 @@ class PipelineResult:
     component3_output: Optional[Dict] = None
     component4_output: Optional[Dict] = None
 
+    def iter_final_zip(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Stream the final ZIP in chunks without loading it into memory.
+
+        Args:
+            chunk_size: Bytes per chunk
+
+        Yields:
+            Consecutive chunks of final.zip
+        """
+        if self.final_zip_data is not None:
+            yield self.final_zip_data
+            return
+        if self.final_zip_path is None:
+            return
+        with open(self.final_zip_path, 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
 
 class PipelineAPI:
     """Main API wrapper for the AI pipeline"""
 
-    def __init__(self):
-        """Initialize the Pipeline API"""
+    def __init__(
+        self,
+        load_file_data: bool = True,
+        warm_up_transcriber: bool = False,
+        run_retention: bool = False
+    ):
+        """
+        Initialize the Pipeline API
+
+        Args:
+            load_file_data: If True, results carry summary_pdf_data and
+                final_zip_data in memory. Set False when callers only need
+                the paths (or stream via PipelineResult.iter_final_zip).
+            warm_up_transcriber: Load the local transcription model now rather
+                than on the first request (for long-lived workers).
+            run_retention: Start the background session retention worker
+                (for long-lived servers; see src/models/retention.py).
+        """
         PipelineConfig.ensure_directories()
+        self.load_file_data = load_file_data
+
+        if warm_up_transcriber:
+            from src.models.component1.backends import warm_up
+            warm_up()
+
+        if run_retention:
+            from src.models.retention import start_retention_worker
+            start_retention_worker()
 
     def process_audio(
         self,
-        audio_data: bytes,
+        audio_data: AudioSource,
         format: str = 'm4a',
         session_id: Optional[str] = None
     ) -> PipelineResult:
         """
         Process audio data through the full pipeline.
 
+        The audio is streamed into the session once (hashing and size-checking
+        on the way) and Component 1 reads that stored file.
+
         Args:
-            audio_data: Audio file as bytes
+            audio_data: Audio as bytes, a file path, a binary file object or
+                an iterator of byte chunks
             format: Audio format ('m4a', 'wav', 'mp3', etc.)
             session_id: Optional session ID (auto-generated if not provided)
 
@@ -106,90 +166,96 @@ class PipelineAPI:
                 error=f"Unsupported audio format: {format}. Supported: {PipelineConfig.AUDIO_FORMATS}"
             )
 
-        # Validate size
-        size_mb = len(audio_data) / (1024 * 1024)
-        if size_mb > PipelineConfig.MAX_AUDIO_SIZE_MB:
+        # Validate size up front when it is already known
+        max_bytes = PipelineConfig.MAX_AUDIO_SIZE_MB * 1024 * 1024
+        if isinstance(audio_data, (bytes, bytearray)):
+            known_size = len(audio_data)
+        elif isinstance(audio_data, (str, Path)) and Path(audio_data).exists():
+            known_size = Path(audio_data).stat().st_size
+        else:
+            known_size = None
+
+        if known_size is not None and known_size > max_bytes:
             return PipelineResult(
                 session_id=session_id or 'invalid',
                 status='failed',
-                error=f"Audio file too large: {size_mb:.1f}MB (max: {PipelineConfig.MAX_AUDIO_SIZE_MB}MB)"
+                error=f"Audio file too large: {known_size / (1024 * 1024):.1f}MB (max: {PipelineConfig.MAX_AUDIO_SIZE_MB}MB)"
             )
 
-        try:
-            # Create session
-            session_id = create_session(session_id)
+        def store_and_transcribe(session_id: str) -> Dict:
+            # Stream audio to the session input directory (single write)
+            audio = ingest_audio(session_id, audio_data, format, max_bytes=max_bytes)
             update_session_metadata(session_id, {
-                'status': 'processing',
-                'input_type': 'audio',
-                'input_format': format,
-                'input_size_mb': size_mb
+                'input_size_mb': audio['size_bytes'] / (1024 * 1024),
+                'input_sha256': audio['sha256']
             })
 
-            # Save audio to session input directory
-            audio_path = get_session_path(session_id) / 'input' / f'audio.{format}'
-            with open(audio_path, 'wb') as f:
-                f.write(audio_data)
-
-            # Import components (lazy import to avoid circular dependencies)
             from src.models.component1.transcriber import transcribe_audio
-            from src.models.component2.extractor import extract_keywords
-            from src.models.component3.agent import run_medical_rag
-            from src.models.component4.cot_agent import run_cot_summarizer
-
-            # Run Component 1: Transcription
-            result1 = transcribe_audio(
-                audio_path=audio_path,
-                audio_data=audio_data,
+            return transcribe_audio(
+                audio_path=audio['path'],
                 format=format,
-                session_id=session_id
+                session_id=session_id,
+                audio_sha256=audio['sha256']
             )
 
-            # Run Component 2: Keyword Extraction
-            result2 = extract_keywords(session_id=session_id)
+        return self._run_session(
+            session_id,
+            started_at,
+            {'input_type': 'audio', 'input_format': format},
+            store_and_transcribe
+        )
 
-            # Run Component 3: Medical RAG
-            result3 = run_medical_rag(session_id=session_id)
+    def process_audio_stream(
+        self,
+        audio_chunks: Iterable[bytes],
+        format: str = 'm4a',
+        session_id: Optional[str] = None
+    ) -> PipelineResult:
+        """
+        Process audio that is still arriving (e.g. an upload or stdin pipe).
 
-            # Run Component 4: CoT Summarizer
-            result4 = run_cot_summarizer(session_id=session_id)
+        Transcription starts on the first complete segment, so when the last
+        chunk lands the transcript is nearly done. The size limit is enforced
+        while reading.
 
-            # Mark as completed
-            completed_at = datetime.now()
-            duration = (completed_at - started_at).total_seconds()
+        Args:
+            audio_chunks: Audio bytes in chunks, in order
+            format: Audio format ('m4a', 'wav', 'mp3', etc.)
+            session_id: Optional session ID (auto-generated if not provided)
 
-            update_session_metadata(session_id, {
-                'status': 'completed',
-                'completed_at': completed_at.isoformat(),
-                'duration_seconds': duration
-            })
+        Returns:
+            PipelineResult object with all outputs
+        """
+        started_at = datetime.now()
 
-            # Build result object
-            return self._build_result(
-                session_id=session_id,
-                status='completed',
-                started_at=started_at,
-                completed_at=completed_at,
-                duration_seconds=duration,
-                component1_output=result1,
-                component2_output=result2,
-                component3_output=result3,
-                component4_output=result4
+        # Validate format
+        if format not in PipelineConfig.AUDIO_FORMATS:
+            return PipelineResult(
+                session_id=session_id or 'invalid',
+                status='failed',
+                error=f"Unsupported audio format: {format}. Supported: {PipelineConfig.AUDIO_FORMATS}"
             )
 
-        except Exception as e:
-            # Log error
-            update_session_metadata(session_id or 'unknown', {
-                'status': 'failed',
-                'error': str(e),
-                'failed_at': datetime.now().isoformat()
+        def transcribe_stream(session_id: str) -> Dict:
+            # Transcription saves the audio to the session input
+            from src.models.component1.transcriber import transcribe_audio
+            result1 = transcribe_audio(
+                audio_stream=audio_chunks,
+                format=format,
+                session_id=session_id,
+                max_bytes=PipelineConfig.MAX_AUDIO_SIZE_MB * 1024 * 1024
+            )
+            update_session_metadata(session_id, {
+                'input_size_mb': result1['metadata']['audio_bytes']['original'] / (1024 * 1024)
             })
+            return result1
 
-            return PipelineResult(
-                session_id=session_id or 'unknown',
-                status='failed',
-                error=str(e),
-                started_at=started_at
-            )
+        return self._run_session(
+            session_id,
+            started_at,
+            {'input_type': 'audio', 'input_format': format, 'input_streamed': True},
+            transcribe_stream
+        )
 
     def process_text(
         self,
@@ -223,19 +289,12 @@ class PipelineAPI:
                 error="Text cannot be empty"
             )
 
-        try:
-            # Create session
-            session_id = create_session(session_id)
-            update_session_metadata(session_id, {
-                'status': 'processing',
-                'input_type': 'text',
-                'input_length': len(text)
-            })
-
+        def store_text(session_id: str) -> Dict:
             # Save text to session input directory
             text_path = get_session_path(session_id) / 'input' / 'transcript.txt'
             with open(text_path, 'w') as f:
                 f.write(text)
+            record_artifact(session_id, text_path, 'input_text')
 
             # Create Component 1 output manually (since we're skipping transcription)
             component1_output = {
@@ -254,8 +313,45 @@ class PipelineAPI:
             component1_path = get_session_path(session_id, component=1) / 'transcript.json'
             with open(component1_path, 'w') as f:
                 json.dump(component1_output, f, indent=2)
+            record_artifact(session_id, component1_path, 'transcript')
+            return component1_output
+
+        return self._run_session(
+            session_id,
+            started_at,
+            {'input_type': 'text', 'input_length': len(text)},
+            store_text
+        )
+
+    def _run_session(
+        self,
+        session_id: Optional[str],
+        started_at: datetime,
+        input_metadata: Dict,
+        run_component1: Callable[[str], Dict]
+    ) -> PipelineResult:
+        """
+        Create a session and run it through the pipeline, tracking its status.
 
-            # Import components (lazy import)
+        Args:
+            session_id: Optional session ID (auto-generated if not provided)
+            started_at: When the request started
+            input_metadata: Input fields recorded with the 'processing' status
+            run_component1: Called with the session ID; stores the input and
+                returns the Component 1 output
+
+        Returns:
+            PipelineResult object with all outputs
+        """
+        try:
+            # Create session
+            session_id = create_session(session_id)
+            update_session_metadata(session_id, {'status': 'processing', **input_metadata})
+
+            # Run Component 1: Transcription (or the stored text)
+            result1 = run_component1(session_id)
+
+            # Import components (lazy import to avoid circular dependencies)
             from src.models.component2.extractor import extract_keywords
             from src.models.component3.agent import run_medical_rag
             from src.models.component4.cot_agent import run_cot_summarizer
@@ -286,7 +382,7 @@ class PipelineAPI:
                 started_at=started_at,
                 completed_at=completed_at,
                 duration_seconds=duration,
-                component1_output=component1_output,
+                component1_output=result1,
                 component2_output=result2,
                 component3_output=result3,
                 component4_output=result4
@@ -328,24 +424,17 @@ class PipelineAPI:
                     error='Session not found'
                 )
 
-            # Load component outputs
+            # Load component outputs listed in the session manifest
+            output_kinds = {
+                'transcript': 'component1',
+                'keywords': 'component2',
+                'source_metadata': 'component3'
+            }
             component_outputs = {}
-            for i in range(1, 5):
-                component_path = get_session_path(session_id, component=i)
-
-                # Try different possible output files
-                possible_files = [
-                    component_path / 'transcript.json',  # Component 1
-                    component_path / 'keywords.json',     # Component 2
-                    component_path / 'metadata.json',     # Component 3
-                    component_path / 'analysis.json'      # Component 4
-                ]
-
-                for file_path in possible_files:
-                    if file_path.exists():
-                        with open(file_path, 'r') as f:
-                            component_outputs[f'component{i}'] = json.load(f)
-                        break
+            for artifact in get_session_artifacts(session_id):
+                if artifact['kind'] in output_kinds:
+                    with open(get_session_path(session_id) / artifact['name'], 'r') as f:
+                        component_outputs[output_kinds[artifact['kind']]] = json.load(f)
 
             # Build result
             return self._build_result(
@@ -381,8 +470,13 @@ class PipelineAPI:
     ) -> PipelineResult:
         """Build a complete PipelineResult from component outputs"""
 
-        # Get file paths
+        # Get file paths and published URLs (presigned URLs are made fresh)
         files = get_session_files(session_id)
+        urls = {
+            artifact['kind']: artifact_url(session_id, artifact['name'])
+            for artifact in get_session_artifacts(session_id)
+            if 'key' in artifact
+        }
 
         # Extract data
         keywords = component2_output.get('keywords', []) if component2_output else []
@@ -393,11 +487,11 @@ class PipelineAPI:
         summary_pdf_data = None
         final_zip_data = None
 
-        if 'summary_pdf' in files:
+        if self.load_file_data and 'summary_pdf' in files:
             with open(files['summary_pdf'], 'rb') as f:
                 summary_pdf_data = f.read()
 
-        if 'final_zip' in files:
+        if self.load_file_data and 'final_zip' in files:
             with open(files['final_zip'], 'rb') as f:
                 final_zip_data = f.read()
 
@@ -407,6 +501,8 @@ class PipelineAPI:
             summary_pdf_path=files.get('summary_pdf'),
             final_zip_path=files.get('final_zip'),
             highlighted_sources_paths=files.get('highlighted_sources', []),
+            final_zip_url=urls.get('final_zip'),
+            audio_url=urls.get('audio'),
             summary_pdf_data=summary_pdf_data,
             final_zip_data=final_zip_data,
             keywords=keywords,
@@ -4,7 +4,11 @@ Pipeline Configuration
 Centralized configuration for both CLI and API modes.
 """
 
+import os
 from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
 
 class PipelineConfig:
     """Configuration settings for the AI pipeline"""
@@ -14,13 +18,31 @@ class PipelineConfig:
     DATA_DIR = PROJECT_ROOT / 'data'
     SESSIONS_DIR = DATA_DIR / 'sessions'
     COMPONENTS_DIR = DATA_DIR / 'components'  # Legacy iteration-based
+    ITERATION_TRACKER = COMPONENTS_DIR / 'iteration_tracker.txt'  # Next free CLI iteration
+    CACHE_DIR = DATA_DIR / 'cache'  # Persistent result caches
+    BLOBS_DIR = DATA_DIR / 'blobs'  # Content-addressed session artifacts (same filesystem as SESSIONS_DIR)
     OUTPUT_DIR = PROJECT_ROOT / 'output'
 
     # Session settings
     SESSION_RETENTION_DAYS = 7  # Auto-cleanup sessions older than this
+    SESSION_INDEX_FILE = 'index.sqlite3'  # Session metadata index, inside SESSIONS_DIR
+    SESSION_COLD_AFTER_HOURS = 24   # Compress transcripts, JSON and sources of finished sessions after this
+    SESSION_DISK_QUOTA_MB = 10240   # Beyond this total, compress sessions early (never deletes unexpired ones)
+    RETENTION_INTERVAL_SECONDS = 300  # Background retention worker period
+    RETENTION_BATCH_SIZE = 100      # Sessions per retention step and pass
     MAX_AUDIO_SIZE_MB = 100     # Maximum audio file size in MB
     MAX_TEXT_LENGTH = 50000     # Maximum text input length in characters
 
+    # Artifact storage (see src/models/artifact_storage.py)
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')  # 'local' or 's3'
+    STORAGE_LOCAL_DIR = os.getenv('STORAGE_LOCAL_DIR')  # Local backend root (default: SESSIONS_DIR, no copies)
+    STORAGE_PART_SIZE_MB = 8        # Multipart upload part size
+    S3_BUCKET = os.getenv('S3_BUCKET')
+    S3_PREFIX = os.getenv('S3_PREFIX', 'sessions')
+    S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')  # MinIO / Supabase Storage S3 endpoint
+    S3_REGION = os.getenv('S3_REGION')
+    S3_PUBLIC_BASE_URL = os.getenv('S3_PUBLIC_BASE_URL')  # Public bucket URL; presigned URLs otherwise
+
     # Supported formats
     AUDIO_FORMATS = {'m4a', 'wav', 'mp3', 'flac', 'aac', 'ogg', 'wma', 'aiff', 'webm'}
     TEXT_FORMATS = {'txt'}
@@ -38,6 +60,8 @@ class PipelineConfig:
         cls.DATA_DIR.mkdir(exist_ok=True)
         cls.SESSIONS_DIR.mkdir(exist_ok=True)
         cls.COMPONENTS_DIR.mkdir(exist_ok=True)
+        cls.CACHE_DIR.mkdir(exist_ok=True)
+        cls.BLOBS_DIR.mkdir(exist_ok=True)
         cls.OUTPUT_DIR.mkdir(exist_ok=True)
         cls.LOGS_DIR.mkdir(exist_ok=True)
 
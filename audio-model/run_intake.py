@@ -11,30 +11,44 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from pipeline_api import PipelineAPI
 
+STDIN_CHUNK_SIZE = 64 * 1024
+
+def read_stdin_chunks():
+    """Yield raw bytes from stdin as they arrive."""
+    stdin = sys.stdin.buffer
+    while True:
+        chunk = stdin.read1(STDIN_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
 def main():
     if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: run_intake.py <audio|text> <input_path_or_text>"}))
+        print(json.dumps({"error": "Usage: run_intake.py <audio|audio-stream|text|text-file> <input_path_or_text_or_format>"}))
         sys.exit(1)
 
     input_type = sys.argv[1]
     input_data = sys.argv[2]
 
     try:
-        api = PipelineAPI()
+        # Only paths are reported back; don't load the PDFs/zip into memory
+        api = PipelineAPI(load_file_data=False)
 
         if input_type == "audio":
-            # Read audio file and pass as bytes
+            # Pass the path; the pipeline streams it into the session once
             audio_path = Path(input_data)
             if not audio_path.exists():
                 print(json.dumps({"error": f"Audio file not found: {input_data}", "success": False}))
                 sys.exit(1)
 
-            with open(audio_path, 'rb') as f:
-                audio_bytes = f.read()
-
             # Get format from file extension
             audio_format = audio_path.suffix.lstrip('.')
-            result = api.process_audio(audio_bytes, format=audio_format)
+            result = api.process_audio(audio_path, format=audio_format)
+
+        elif input_type == "audio-stream":
+            # Audio piped on stdin; transcription starts before it has all arrived
+            audio_format = input_data.lstrip('.')
+            result = api.process_audio_stream(read_stdin_chunks(), format=audio_format)
 
         elif input_type == "text":
             # Direct text input
@@ -53,7 +67,7 @@ def main():
             result = api.process_text(text_content)
 
         else:
-            print(json.dumps({"error": "Invalid input type. Use 'audio', 'text', or 'text-file'"}))
+            print(json.dumps({"error": "Invalid input type. Use 'audio', 'audio-stream', 'text', or 'text-file'"}))
             sys.exit(1)
 
         if result.status != 'completed':
@@ -68,6 +82,8 @@ def main():
             "session_id": result.session_id,
             "final_zip_path": str(result.final_zip_path) if result.final_zip_path else None,
             "summary_pdf_path": str(result.summary_pdf_path) if result.summary_pdf_path else None,
+            "final_zip_url": result.final_zip_url,
+            "audio_url": result.audio_url,
             "transcript": result.transcript,
             "success": True,
             "status": result.status
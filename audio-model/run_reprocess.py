@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Script to reprocess existing sessions in bulk through the batch endpoint
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.models.session_manager import list_sessions
+from src.models.batch_reprocess import reprocess_sessions, OpenAIBatchBackend, LocalBatchBackend
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run Components 2 and 4 for many sessions as one batch")
+    parser.add_argument('session_ids', nargs='*', help="Sessions to reprocess (default: all completed sessions)")
+    parser.add_argument('--components', default='2,4', help="Components to re-run, e.g. '2,4' or '4'")
+    parser.add_argument('--local', action='store_true', help="Run requests synchronously instead of via the Batch API")
+    parser.add_argument('--poll', type=float, default=30, help="Seconds between batch status checks")
+    args = parser.parse_args()
+
+    session_ids = args.session_ids or [s['session_id'] for s in list_sessions(status='completed')]
+    if not session_ids:
+        print(json.dumps({"error": "No sessions to reprocess"}))
+        sys.exit(1)
+
+    components = [int(c) for c in args.components.split(',') if c.strip()]
+    backend = LocalBatchBackend() if args.local else OpenAIBatchBackend()
+
+    outcome = reprocess_sessions(session_ids, components=components, backend=backend, poll_seconds=args.poll)
+    print(json.dumps(outcome, indent=2))
+    sys.exit(0 if all(r['status'] == 'completed' for r in outcome.values()) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to run session retention (expiry, cold-tier compression, disk quota)
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pipeline_config import PipelineConfig
+from src.models.retention import run_retention_pass, RetentionWorker
+
+def main():
+    parser = argparse.ArgumentParser(description="Expire, compress and evict sessions incrementally")
+    parser.add_argument('--loop', action='store_true', help="Keep running a pass every --interval seconds")
+    parser.add_argument('--interval', type=float, default=PipelineConfig.RETENTION_INTERVAL_SECONDS,
+                        help="Seconds between passes with --loop")
+    parser.add_argument('--batch-size', type=int, default=PipelineConfig.RETENTION_BATCH_SIZE,
+                        help="Maximum sessions per step and pass")
+    args = parser.parse_args()
+
+    if args.loop:
+        PipelineConfig.RETENTION_BATCH_SIZE = args.batch_size
+        worker = RetentionWorker(args.interval)
+        worker.start()
+        try:
+            worker.join()
+        except KeyboardInterrupt:
+            worker.stop()
+        return
+
+    print(json.dumps(run_retention_pass(batch_size=args.batch_size), indent=2))
+
+if __name__ == "__main__":
+    main()
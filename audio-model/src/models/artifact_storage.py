@@ -0,0 +1,335 @@
+"""
+Artifact Storage Backends
+
+Where delivered session artifacts (final.zip, input audio) are published.
+Uploads are streaming: the producer writes chunks as it generates them, and
+the S3 backend sends them as multipart upload parts, so at most one part
+(STORAGE_PART_SIZE_MB) is held in memory however large the file is.
+
+- LocalStorageBackend: a directory on disk. With its default root (the
+  sessions directory) objects are the session files themselves, so nothing
+  is copied.
+- S3StorageBackend: any S3-compatible service (AWS S3, MinIO, Supabase
+  Storage's S3 endpoint) through boto3, which is only needed when this
+  backend is selected. A client can be passed in instead, e.g.
+  MemoryS3Client, an in-memory stand-in that enforces S3's multipart rules
+  (see test_storage.py).
+"""
+
+import io
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from pipeline_config import PipelineConfig
+
+
+class Upload:
+    """A streaming upload of one object."""
+
+    def write(self, data: bytes):
+        """Append data to the object."""
+        raise NotImplementedError
+
+    def complete(self):
+        """Finish the upload; the object becomes visible."""
+        raise NotImplementedError
+
+    def abort(self):
+        """Discard everything written so far."""
+        raise NotImplementedError
+
+    def __enter__(self) -> 'Upload':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.complete()
+        else:
+            self.abort()
+
+
+class StorageBackend:
+    """Object store for published session artifacts."""
+
+    name = 'base'
+
+    def open_upload(self, key: str, content_type: str) -> Upload:
+        """Start a streaming upload to key."""
+        raise NotImplementedError
+
+    def url(self, key: str) -> str:
+        """URL the object can be fetched from."""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Delete an object (missing objects are ignored)."""
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Where the object lives on this machine, if it does."""
+        return None
+
+    def upload_chunks(self, key: str, chunks: Iterable[bytes], content_type: str) -> str:
+        """
+        Upload an iterable of chunks.
+
+        Returns:
+            The object's URL
+        """
+        with self.open_upload(key, content_type) as upload:
+            for chunk in chunks:
+                upload.write(chunk)
+        return self.url(key)
+
+
+class _LocalUpload(Upload):
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial_path = path.with_name(path.name + '.part')
+        self._file = open(self.partial_path, 'wb')
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def complete(self):
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if self.partial_path.exists():
+            self.partial_path.unlink()
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects stored as files under a root directory."""
+
+    name = 'local'
+
+    def __init__(self, root: Optional[Path] = None, base_url: Optional[str] = None):
+        """
+        Args:
+            root: Directory objects are stored in (default: the sessions directory)
+            base_url: URL prefix the root is served under (default: file:// URLs)
+        """
+        self.root = Path(root) if root else None
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    def local_path(self, key: str) -> Path:
+        return (self.root or PipelineConfig.SESSIONS_DIR) / key
+
+    def open_upload(self, key: str, content_type: str) -> Upload:
+        return _LocalUpload(self.local_path(key))
+
+    def url(self, key: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{key}"
+        return self.local_path(key).resolve().as_uri()
+
+    def delete(self, key: str):
+        path = self.local_path(key)
+        if path.exists():
+            path.unlink()
+
+
+class _S3MultipartUpload(Upload):
+    """
+    Buffers up to one part, then sends it; objects smaller than a part are
+    sent with a single put_object.
+    """
+
+    def __init__(self, client, bucket: str, key: str, content_type: str, part_size: int):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict] = []
+
+    def _send_part(self, data: bytes):
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )
+            self._upload_id = response['UploadId']
+        number = len(self._parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=number, Body=data
+        )
+        self._parts.append({'PartNumber': number, 'ETag': response['ETag']})
+
+    def write(self, data: bytes):
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            self._send_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    def complete(self):
+        if self._upload_id is None:
+            self.client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer),
+                ContentType=self.content_type
+            )
+        else:
+            if self._buffer:
+                self._send_part(bytes(self._buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+        self._buffer = bytearray()
+
+    def abort(self):
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        self._buffer = bytearray()
+
+
+class S3StorageBackend(StorageBackend):
+    """S3-compatible object storage."""
+
+    name = 's3'
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = '',
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        public_base_url: Optional[str] = None,
+        url_expires_seconds: int = 7 * 24 * 3600,
+        part_size: int = 8 * 1024 * 1024,
+        client=None
+    ):
+        """
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix for all objects
+            endpoint_url: Non-AWS endpoint (MinIO, Supabase Storage S3 API)
+            region: Bucket region
+            public_base_url: URL prefix of a public bucket; otherwise URLs are presigned
+            url_expires_seconds: Lifetime of presigned URLs
+            part_size: Multipart part size (S3 minimum is 5MB)
+            client: boto3 S3 client (created from the environment if omitted)
+        """
+        if client is None:
+            import boto3
+            client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.public_base_url = public_base_url.rstrip('/') if public_base_url else None
+        self.url_expires_seconds = url_expires_seconds
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def open_upload(self, key: str, content_type: str) -> Upload:
+        return _S3MultipartUpload(self.client, self.bucket, self._key(key), content_type, self.part_size)
+
+    def url(self, key: str) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{self._key(key)}"
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': self._key(key)},
+            ExpiresIn=self.url_expires_seconds
+        )
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+class MemoryS3Client:
+    """
+    In-memory stand-in for the S3 client methods S3StorageBackend uses.
+
+    Like S3, parts other than the last must be at least 5MB, and an object
+    only appears once its multipart upload completes. fail_on_part makes
+    upload_part raise for that part number, to exercise aborts.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(self, fail_on_part: Optional[int] = None):
+        self.objects: Dict[str, Dict[str, bytes]] = {}
+        self.uploads: Dict[str, Dict] = {}
+        self.fail_on_part = fail_on_part
+        self.parts_uploaded = 0
+        self._next_id = 0
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str = None):
+        self.objects.setdefault(Bucket, {})[Key] = bytes(Body)
+        return {'ETag': str(len(Body))}
+
+    def get_object(self, Bucket: str, Key: str) -> Dict:
+        return {'Body': io.BytesIO(self.objects[Bucket][Key])}
+
+    def delete_object(self, Bucket: str, Key: str):
+        self.objects.get(Bucket, {}).pop(Key, None)
+
+    def create_multipart_upload(self, Bucket: str, Key: str, ContentType: str = None) -> Dict:
+        self._next_id += 1
+        upload_id = str(self._next_id)
+        self.uploads[upload_id] = {'bucket': Bucket, 'key': Key, 'parts': {}}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> Dict:
+        if PartNumber == self.fail_on_part:
+            raise ConnectionError(f"Simulated failure uploading part {PartNumber}")
+        self.uploads[UploadId]['parts'][PartNumber] = bytes(Body)
+        self.parts_uploaded += 1
+        return {'ETag': f'"{UploadId}-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part['PartNumber'] for part in MultipartUpload['Parts']]
+        if numbers != sorted(upload['parts']):
+            raise ValueError(f"Parts {numbers} do not match uploaded parts {sorted(upload['parts'])}")
+        bodies = [upload['parts'][number] for number in numbers]
+        if any(len(body) < self.MIN_PART_SIZE for body in bodies[:-1]):
+            raise ValueError("EntityTooSmall: only the last part may be smaller than 5MB")
+        self.objects.setdefault(Bucket, {})[Key] = b''.join(bodies)
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str):
+        self.uploads.pop(UploadId, None)
+
+    def generate_presigned_url(self, ClientMethod: str, Params: Dict, ExpiresIn: int) -> str:
+        return f"memory://{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the storage backend selected by PipelineConfig.STORAGE_BACKEND."""
+    global _backend
+    if _backend is None:
+        if PipelineConfig.STORAGE_BACKEND == 's3':
+            _backend = S3StorageBackend(
+                bucket=PipelineConfig.S3_BUCKET,
+                prefix=PipelineConfig.S3_PREFIX,
+                endpoint_url=PipelineConfig.S3_ENDPOINT_URL,
+                region=PipelineConfig.S3_REGION,
+                public_base_url=PipelineConfig.S3_PUBLIC_BASE_URL,
+                part_size=PipelineConfig.STORAGE_PART_SIZE_MB * 1024 * 1024
+            )
+        elif PipelineConfig.STORAGE_BACKEND == 'local':
+            _backend = LocalStorageBackend(PipelineConfig.STORAGE_LOCAL_DIR)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {PipelineConfig.STORAGE_BACKEND}")
+    return _backend
+
+
+def set_storage_backend(backend: Optional[StorageBackend]):
+    """Use a specific backend (e.g. a test stand-in); None re-reads the config."""
+    global _backend
+    _backend = backend
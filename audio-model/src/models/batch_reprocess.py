@@ -0,0 +1,357 @@
+"""
+Batch Reprocessing
+
+Re-runs Component 2 (keyword extraction) and Component 4 (chain-of-thought
+summary) for many existing sessions, e.g. after a prompt or model change.
+Instead of one interactive chat call per session, the requests of all
+sessions are written to a JSONL file and submitted through the OpenAI Batch
+API, which runs them at batch throughput (and half price) outside the
+interactive rate limits. Results are written back into each session
+directory by the normal component code.
+
+LocalBatchBackend runs the same JSONL files synchronously, for tests and
+small backfills.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+BATCH_DIR = PROJECT_ROOT / 'data' / 'batches'
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW = '24h'
+BATCH_POLL_SECONDS = 30
+BATCH_MAX_REQUESTS = 50000              # OpenAI per-batch limits
+BATCH_MAX_BYTES = 190 * 1024 * 1024     # (200 MB input file, with headroom)
+
+FINISHED_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+class BatchBackend:
+    """Runs a JSONL file of chat-completion requests."""
+
+    name = 'base'
+
+    def submit(self, requests_path: Path) -> str:
+        """Submit a request file and return the batch ID."""
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """Current state (one of FINISHED_STATES once done)."""
+        raise NotImplementedError
+
+    def output_lines(self, batch_id: str) -> List[str]:
+        """Result lines of a finished batch (successes and errors)."""
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API."""
+
+    name = 'openai'
+
+    def __init__(self, client=None):
+        if client is None:
+            from src.models.model_router import get_router
+            client = get_router().client('openai')
+        self.client = client
+
+    def submit(self, requests_path: Path) -> str:
+        with open(requests_path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def output_lines(self, batch_id: str) -> List[str]:
+        batch = self.client.batches.retrieve(batch_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(self.client.files.content(file_id).text.splitlines())
+        return lines
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Stand-in for the Batch API that runs each request immediately.
+
+    Results are written in the Batch API's output format, so the rest of
+    the reprocessing code cannot tell the difference.
+    """
+
+    name = 'local'
+
+    def __init__(self, responder: Optional[Callable[[Dict], str]] = None):
+        """
+        Args:
+            responder: Returns the answer text for a request body (defaults
+                to a synchronous chat-completion call)
+        """
+        self.responder = responder or self._chat_completion
+        self._outputs: Dict[str, Path] = {}
+
+    @staticmethod
+    def _chat_completion(body: Dict) -> str:
+        from src.models.model_router import get_router
+        response = get_router().client('openai').chat.completions.create(**body)
+        return response.choices[0].message.content
+
+    def submit(self, requests_path: Path) -> str:
+        batch_id = f"local_{requests_path.stem}"
+        output_path = requests_path.with_name(f"{requests_path.stem}_output.jsonl")
+
+        with open(requests_path) as requests, open(output_path, 'w') as output:
+            for line in requests:
+                request = json.loads(line)
+                try:
+                    text = self.responder(request['body'])
+                    result = {
+                        'custom_id': request['custom_id'],
+                        'response': {
+                            'status_code': 200,
+                            'body': {'choices': [{'message': {'role': 'assistant', 'content': text}}]}
+                        },
+                        'error': None
+                    }
+                except Exception as e:
+                    result = {'custom_id': request['custom_id'], 'response': None, 'error': {'message': str(e)}}
+                output.write(json.dumps(result) + '\n')
+
+        self._outputs[batch_id] = output_path
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        return 'completed'
+
+    def output_lines(self, batch_id: str) -> List[str]:
+        return self._outputs[batch_id].read_text().splitlines()
+
+
+def parse_output_lines(lines: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Parse Batch API result lines.
+
+    Returns:
+        custom_id -> {'text': answer} or {'error': message}
+    """
+    results = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        body = response.get('body') or {}
+
+        if record.get('error') or response.get('status_code') != 200:
+            error = record.get('error') or body.get('error') or {}
+            results[record['custom_id']] = {'error': error.get('message') or f"HTTP {response.get('status_code')}"}
+        else:
+            results[record['custom_id']] = {'text': body['choices'][0]['message']['content']}
+    return results
+
+
+def run_batch(
+    backend: BatchBackend,
+    requests: List[Dict],
+    work_dir: Path,
+    label: str,
+    poll_seconds: float = BATCH_POLL_SECONDS
+) -> Dict[str, Dict]:
+    """
+    Submit requests (split to fit the batch limits), wait, and collect results.
+
+    Args:
+        backend: Batch backend
+        requests: Batch API request lines (custom_id, method, url, body)
+        work_dir: Where request files are written
+        label: File name prefix
+        poll_seconds: Delay between status checks
+
+    Returns:
+        custom_id -> {'text': ...} or {'error': ...}
+    """
+    if not requests:
+        return {}
+
+    # Split into files within the per-batch request and size limits
+    files, lines, size = [], [], 0
+    for request in requests:
+        line = json.dumps(request) + '\n'
+        line_bytes = len(line.encode('utf-8'))
+        if lines and (len(lines) >= BATCH_MAX_REQUESTS or size + line_bytes > BATCH_MAX_BYTES):
+            files.append(lines)
+            lines, size = [], 0
+        lines.append(line)
+        size += line_bytes
+    files.append(lines)
+
+    batch_ids = []
+    for i, file_lines in enumerate(files, 1):
+        path = work_dir / f"{label}_{i}.jsonl"
+        path.write_text(''.join(file_lines))
+        batch_ids.append(backend.submit(path))
+        print(f"✓ Submitted {len(file_lines)} {label} requests ({backend.name} batch {batch_ids[-1]})")
+
+    results = {}
+    pending = list(batch_ids)
+    while pending:
+        for batch_id in list(pending):
+            state = backend.status(batch_id)
+            if state in FINISHED_STATES:
+                pending.remove(batch_id)
+                if state != 'completed':
+                    print(f"⚠ Batch {batch_id} {state}")
+                results.update(parse_output_lines(backend.output_lines(batch_id)))
+        if pending:
+            print(f"  Waiting for {len(pending)} batch(es)...")
+            time.sleep(poll_seconds)
+
+    return results
+
+
+def reprocess_sessions(
+    session_ids: List[str],
+    components: Iterable[int] = (2, 4),
+    backend: Optional[BatchBackend] = None,
+    poll_seconds: float = BATCH_POLL_SECONDS
+) -> Dict[str, Dict]:
+    """
+    Re-run Components 2 and/or 4 for many sessions through the batch endpoint.
+
+    Component 2 only batches transcripts that need the fine-tuned model
+    (the local tier and the keyword cache are served directly). Component 4
+    batches each session's CoT prompt on the cheapest OpenAI model the
+    router allows for the task; sources from Component 3 are reused.
+
+    Args:
+        session_ids: Sessions to reprocess
+        components: Which of 2 and 4 to re-run (in that order)
+        backend: Batch backend (default: OpenAIBatchBackend)
+        poll_seconds: Delay between batch status checks
+
+    Returns:
+        session_id -> {'status': 'completed' | 'failed', 'error': ...}
+    """
+    from src.models.session_manager import (
+        get_session_path, update_session_metadata, deduplicate_session
+    )
+    from src.models.retention import thaw_if_cold
+    from src.models.component2.config_handler import get_model_id
+    from src.models.component2.extractor import extract_keywords, needs_llm
+    from src.models.component2.prepare_dataset import SYSTEM_PROMPT
+    from src.models.component4.cot_agent import run_cot_summarizer, prepare_cot_prompt
+    from src.models.model_router import get_router, TASKS
+
+    backend = backend or OpenAIBatchBackend()
+    components = set(components)
+    outcome = {session_id: {'status': 'completed'} for session_id in session_ids}
+
+    # Sessions in the cold tier have compressed inputs
+    for session_id in session_ids:
+        thaw_if_cold(session_id)
+
+    work_dir = BATCH_DIR / datetime.now().strftime('%Y%m%d_%H%M%S')
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    def fail(session_id: str, error: str):
+        print(f"✗ {session_id}: {error}")
+        outcome[session_id] = {'status': 'failed', 'error': error}
+
+    def active() -> List[str]:
+        return [s for s in session_ids if outcome[s]['status'] != 'failed']
+
+    if 2 in components:
+        model_id = get_model_id()
+        requests = []
+        for session_id in active():
+            try:
+                with open(get_session_path(session_id, component=1) / 'transcript.json') as f:
+                    transcript = json.load(f)['transcript']
+                if model_id and needs_llm(transcript):
+                    requests.append({
+                        'custom_id': f"{session_id}:2",
+                        'method': 'POST',
+                        'url': BATCH_ENDPOINT,
+                        'body': {
+                            'model': model_id,
+                            'messages': [
+                                {'role': 'system', 'content': SYSTEM_PROMPT},
+                                {'role': 'user', 'content': transcript}
+                            ]
+                        }
+                    })
+                else:
+                    # Local tier or cache: no model call to batch
+                    extract_keywords(session_id=session_id)
+            except Exception as e:
+                fail(session_id, f"Component 2: {e}")
+
+        results = run_batch(backend, requests, work_dir, 'component2', poll_seconds)
+        batched = {request['custom_id'] for request in requests}
+        for session_id in active():
+            custom_id = f"{session_id}:2"
+            if custom_id not in batched:
+                continue
+            result = results.get(custom_id, {'error': 'missing from batch output'})
+            if 'error' in result:
+                fail(session_id, f"Component 2: {result['error']}")
+                continue
+            try:
+                extract_keywords(session_id=session_id, llm_output=(result['text'], model_id))
+            except Exception as e:
+                fail(session_id, f"Component 2: {e}")
+
+    if 4 in components:
+        openai_models = [spec for spec in get_router().candidates('cot_summary') if spec.provider == 'openai']
+        if not openai_models:
+            raise RuntimeError("No OpenAI model available for cot_summary batches")
+        model = openai_models[0].name
+
+        requests = []
+        for session_id in active():
+            try:
+                requests.append({
+                    'custom_id': f"{session_id}:4",
+                    'method': 'POST',
+                    'url': BATCH_ENDPOINT,
+                    'body': {
+                        'model': model,
+                        'messages': [{'role': 'user', 'content': prepare_cot_prompt(session_id)}],
+                        'max_tokens': TASKS['cot_summary'].max_tokens
+                    }
+                })
+            except Exception as e:
+                fail(session_id, f"Component 4: {e}")
+
+        results = run_batch(backend, requests, work_dir, 'component4', poll_seconds)
+        for session_id in active():
+            result = results.get(f"{session_id}:4", {'error': 'missing from batch output'})
+            if 'error' in result:
+                fail(session_id, f"Component 4: {result['error']}")
+                continue
+            try:
+                run_cot_summarizer(session_id=session_id, analysis_output=(result['text'], model))
+            except Exception as e:
+                fail(session_id, f"Component 4: {e}")
+
+    for session_id, result in outcome.items():
+        updates = {'reprocessed_at': datetime.now().isoformat(), 'reprocess_status': result['status']}
+        if 'error' in result:
+            updates['reprocess_error'] = result['error']
+        update_session_metadata(session_id, updates)
+        deduplicate_session(session_id)  # rewritten outputs back into the blob store
+
+    completed = sum(1 for r in outcome.values() if r['status'] == 'completed')
+    print(f"✓ Reprocessed {completed}/{len(session_ids)} sessions (batch files in {work_dir})")
+    return outcome
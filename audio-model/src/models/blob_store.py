@@ -0,0 +1,183 @@
+"""
+Content-Addressed Blob Store
+
+Session artifacts that repeat across sessions (the same PMC source PDFs,
+resubmitted audio, identical highlighted outputs) are stored once, under
+data/blobs/<first 2 hex>/<sha256>. Session files become hard links to the
+blob, so everything that reads session files by path keeps working, and the
+blob's link count is its reference count: a blob whose only link is its own
+store entry is unreferenced and can be freed.
+
+Which blob a session file links to is its SHA-256 in the session's
+artifact manifest (session_artifacts.py), so cleanup knows which blobs to
+check without re-hashing.
+
+Linked files are shared between sessions and must not be modified in
+place: writers either write a temp file and os.replace it, or call
+detach() before overwriting a file.
+"""
+
+import os
+import errno
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from pipeline_config import PipelineConfig
+
+# Only binary artifacts are deduplicated; small JSON outputs are rewritten in place
+DEDUP_EXTENSIONS = {'.pdf', '.zip'} | {f'.{ext}' for ext in PipelineConfig.AUDIO_FORMATS}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detach(path: Path):
+    """
+    Unlink a file if it is shared with the blob store, so it can be rewritten.
+
+    Call before writing to a session file in place.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class BlobStore:
+    """Hard-link based content-addressed store."""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Blob directory (must be on the same filesystem as the sessions)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, digest: str) -> Path:
+        """Store location of a blob."""
+        return self.root / digest[:2] / digest
+
+    def add(self, path: Path, digest: Optional[str] = None) -> Optional[str]:
+        """
+        Replace a file with a hard link to its blob, creating the blob if new.
+
+        Args:
+            path: File to deduplicate
+            digest: Its SHA-256, if already known
+
+        Returns:
+            The SHA-256, or None if the file could not be linked (e.g. the
+            store is on another filesystem); the file is then left as is
+        """
+        path = Path(path)
+        digest = digest or file_sha256(path)
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(exist_ok=True)
+
+        while True:
+            try:
+                if blob.exists() and os.path.samefile(blob, path):
+                    return digest
+
+                try:
+                    # First copy of this content: the file itself becomes the blob
+                    os.link(path, blob)
+                    return digest
+                except FileExistsError:
+                    pass
+
+                # Known content: swap the file for a link to the existing blob
+                temp_path = path.with_name(path.name + '.link')
+                if temp_path.exists():
+                    temp_path.unlink()
+                os.link(blob, temp_path)
+                os.replace(temp_path, path)
+                return digest
+
+            except FileNotFoundError:
+                if not path.exists():
+                    raise
+                # A concurrent release() freed the blob; link this file as the new blob
+                continue
+
+            except OSError as e:
+                if e.errno in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    return None
+                raise
+
+    def references(self, digest: str) -> int:
+        """Number of session files linked to a blob."""
+        try:
+            return self.blob_path(digest).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def release(self, digests: Iterable[str]) -> int:
+        """
+        Delete the given blobs that no session references any more.
+
+        A session linking a blob concurrently keeps its own link (and the
+        data), so a race here never loses content.
+
+        Returns:
+            Number of blobs deleted
+        """
+        freed = 0
+        for digest in set(digests):
+            blob = self.blob_path(digest)
+            try:
+                if blob.stat().st_nlink == 1:
+                    blob.unlink()
+                    freed += 1
+            except FileNotFoundError:
+                continue
+        return freed
+
+    def collect_garbage(self) -> int:
+        """
+        Delete every unreferenced blob (e.g. left behind by a crash).
+
+        Returns:
+            Number of blobs deleted
+        """
+        return self.release(blob.name for blob in self.root.glob('*/*'))
+
+    def is_linked(self, path: Path, digest: str) -> bool:
+        """Whether a file is a link to the given blob."""
+        try:
+            return os.path.samefile(self.blob_path(digest), path)
+        except FileNotFoundError:
+            return False
+
+    def stats(self) -> Dict:
+        """Blob count, stored bytes, and bytes saved by deduplication."""
+        blobs, stored, saved = 0, 0, 0
+        for blob in self.root.glob('*/*'):
+            st = blob.stat()
+            blobs += 1
+            stored += st.st_size
+            saved += st.st_size * max(st.st_nlink - 2, 0)
+        return {'blobs': blobs, 'stored_bytes': stored, 'saved_bytes': saved}
+
+
+_blob_stores: Dict[Path, BlobStore] = {}
+
+
+def get_blob_store() -> BlobStore:
+    """Return the blob store for the current BLOBS_DIR."""
+    root = PipelineConfig.BLOBS_DIR
+    if root not in _blob_stores:
+        _blob_stores[root] = BlobStore(root)
+    return _blob_stores[root]
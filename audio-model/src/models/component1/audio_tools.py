@@ -0,0 +1,290 @@
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from . import config
+
+DURATION_PATTERN = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+SILENCE_START_PATTERN = re.compile(r'silence_start: (-?\d+(?:\.\d+)?)')
+SILENCE_END_PATTERN = re.compile(r'silence_end: (-?\d+(?:\.\d+)?)')
+
+# Silence this close to the start/end of a recording is treated as leading/trailing
+EDGE_TOLERANCE = 0.1
+
+def speech_encoding_args() -> List[str]:
+    """ffmpeg output options for compact mono speech audio (Ogg/Opus)."""
+    return [
+        '-vn',
+        '-ac', '1',
+        '-ar', str(config.NORMALIZED_SAMPLE_RATE),
+        '-c:a', 'libopus',
+        '-b:a', config.NORMALIZED_BITRATE,
+        '-compression_level', str(config.NORMALIZED_COMPRESSION_LEVEL),
+        '-application', 'voip'
+    ]
+
+def ffmpeg_available() -> bool:
+    """Check whether the ffmpeg binary can be found."""
+    return shutil.which(config.FFMPEG_BINARY) is not None
+
+def run_ffmpeg(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    Run ffmpeg with the given arguments.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+    """
+    process = subprocess.run(
+        [config.FFMPEG_BINARY, '-hide_banner', '-nostdin', *args],
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {process.stderr.strip()[-500:]}")
+    return process
+
+def probe_duration(audio_path: Path) -> Optional[float]:
+    """
+    Get the duration of an audio file in seconds.
+
+    Returns:
+        Duration in seconds, or None if it cannot be determined
+    """
+    # ffmpeg exits non-zero without an output file but still prints the header
+    process = subprocess.run(
+        [config.FFMPEG_BINARY, '-hide_banner', '-nostdin', '-i', str(audio_path)],
+        capture_output=True,
+        text=True
+    )
+    match = DURATION_PATTERN.search(process.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+def detect_silences(
+    audio_path: Path,
+    noise_db: float = None,
+    min_silence: float = None,
+    duration: float = None
+) -> List[Tuple[float, float]]:
+    """
+    Find silent regions with ffmpeg's silencedetect filter.
+
+    Args:
+        audio_path: Audio file to scan
+        noise_db: Level below which audio counts as silence (dBFS)
+        min_silence: Minimum silence length in seconds
+        duration: Recording duration; if given, silence running to the end
+            of the file is reported as ending there
+
+    Returns:
+        List of (start, end) silences in seconds
+    """
+    process = run_ffmpeg([
+        '-i', str(audio_path),
+        '-af', silencedetect_filter(noise_db, min_silence),
+        '-f', 'null', '-'
+    ])
+    return parse_silences(process.stderr.splitlines(), duration)
+
+def silencedetect_filter(noise_db: float = None, min_silence: float = None) -> str:
+    """ffmpeg silencedetect filter (defaults: the chunk boundary settings)."""
+    if noise_db is None:
+        noise_db = config.SILENCE_NOISE_DB
+    if min_silence is None:
+        min_silence = config.SILENCE_MIN_SECONDS
+    return f'silencedetect=noise={noise_db}dB:d={min_silence}'
+
+def parse_silences(lines: List[str], duration: float = None) -> List[Tuple[float, float]]:
+    """
+    Read (start, end) silences from silencedetect log lines.
+
+    A silence still open at the end is reported as ending at `duration`,
+    or dropped if no duration is given.
+    """
+    silences = []
+    start = None
+    for line in lines:
+        start_match = SILENCE_START_PATTERN.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = SILENCE_END_PATTERN.search(line)
+        if end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
+
+    if start is not None and duration is not None and duration > start:
+        silences.append((start, duration))
+
+    return silences
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float,
+    overlap_seconds: float
+) -> List[Dict]:
+    """
+    Split a recording into chunks cut inside silences where possible.
+
+    Each cut is placed at the middle of the latest silence in the last
+    quarter of the target window, or at the target itself if there is none.
+    Chunks are extended by the overlap on both sides; each chunk still
+    "owns" only the span between its two cuts, which is used to drop
+    duplicated segments when stitching.
+
+    Args:
+        duration: Recording duration in seconds
+        silences: Silent regions from detect_silences
+        target_seconds: Desired chunk length
+        overlap_seconds: Audio shared with each neighbouring chunk
+
+    Returns:
+        List of dicts with start, end (audio to extract) and own_start, own_end
+    """
+    cuts = [0.0]
+    while duration - cuts[-1] > target_seconds:
+        cuts.append(next_cut(cuts[-1], silences, target_seconds))
+    cuts.append(duration)
+
+    return [
+        chunk_span(own_start, own_end, duration, overlap_seconds)
+        for own_start, own_end in zip(cuts, cuts[1:])
+    ]
+
+def next_cut(previous: float, silences: List[Tuple[float, float]], target_seconds: float) -> float:
+    """
+    Where to end the chunk starting at `previous`: the middle of the latest
+    silence in the last quarter of the target window, else the target.
+    """
+    target = previous + target_seconds
+    window_start = target - target_seconds / 4
+    candidates = [(s + e) / 2 for s, e in silences if window_start <= (s + e) / 2 <= target]
+    return max(candidates) if candidates else target
+
+def chunk_span(own_start: float, own_end: float, duration: float, overlap_seconds: float) -> Dict:
+    """A chunk owning [own_start, own_end), extended by the overlap on both sides."""
+    return {
+        'start': max(0.0, own_start - overlap_seconds),
+        'end': min(duration, own_end + overlap_seconds),
+        'own_start': own_start,
+        'own_end': own_end
+    }
+
+def speech_regions(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    padding: float
+) -> List[Tuple[float, float]]:
+    """
+    Invert silences into the regions of a recording that contain speech.
+
+    Interior silences are shrunk by `padding` on each side so word onsets
+    and tails are kept; silence at the very start or end is dropped fully.
+
+    Args:
+        duration: Recording duration in seconds
+        silences: Silent regions from detect_silences
+        padding: Seconds of silence kept around each speech region
+
+    Returns:
+        Ordered, non-overlapping (start, end) speech regions in seconds
+    """
+    regions = []
+    cursor = 0.0
+
+    for silence_start, silence_end in silences:
+        # Container and decoder durations differ slightly; treat near-edge silence as edge silence
+        cut_start = silence_start + padding if silence_start > EDGE_TOLERANCE else 0.0
+        cut_end = silence_end - padding if silence_end < duration - EDGE_TOLERANCE else duration
+        if cut_end <= cut_start:
+            continue
+        if cut_start > cursor:
+            regions.append((cursor, cut_start))
+        cursor = max(cursor, cut_end)
+
+    if cursor < duration:
+        regions.append((cursor, duration))
+
+    return [(start, end) for start, end in regions if end - start > 0.01]
+
+def trim_to_regions(audio_path: Path, regions: List[Tuple[float, float]], output_path: Path) -> Path:
+    """
+    Keep only the given regions of a recording, joined back to back.
+
+    The output uses the same compact speech encoding as normalize_audio.
+    """
+    selection = '+'.join(f'between(t,{start:.3f},{end:.3f})' for start, end in regions)
+    run_ffmpeg([
+        '-i', str(audio_path),
+        '-af', f"aselect='{selection}',asetpts=N/SR/TB",
+        *speech_encoding_args(),
+        '-y', str(output_path)
+    ])
+    return output_path
+
+def map_to_original(t: float, regions: List[Tuple[float, float]]) -> float:
+    """
+    Convert a time in the trimmed recording back to the original recording.
+
+    Args:
+        t: Seconds from the start of the trimmed audio
+        regions: Speech regions that were kept, from speech_regions
+
+    Returns:
+        Seconds from the start of the original audio
+    """
+    offset = 0.0
+    for start, end in regions:
+        length = end - start
+        if t <= offset + length:
+            return start + max(0.0, t - offset)
+        offset += length
+    return regions[-1][1] if regions else t
+
+def extract_clip(
+    audio_path: Path,
+    start: float,
+    end: float,
+    output_path: Path,
+    input_args: List[str] = ()
+) -> Path:
+    """
+    Extract [start, end) of a recording as compact mono speech audio.
+
+    Clips are re-encoded (not stream-copied) so they start exactly at
+    `start` and their timestamps can be offset precisely.
+
+    Args:
+        input_args: ffmpeg input options (e.g. the format of raw PCM)
+    """
+    run_ffmpeg([
+        *input_args,
+        '-ss', f'{start:.3f}',
+        '-t', f'{end - start:.3f}',
+        '-i', str(audio_path),
+        *speech_encoding_args(),
+        '-y', str(output_path)
+    ])
+    return output_path
+
+def normalize_audio(audio_path: Path, output_path: Path) -> Path:
+    """
+    Transcode a recording to mono, 16 kHz, low-bitrate Opus for upload.
+
+    Args:
+        audio_path: Original recording (any format ffmpeg can read)
+        output_path: Where to write the normalized .ogg file
+
+    Returns:
+        output_path
+    """
+    run_ffmpeg([
+        '-i', str(audio_path),
+        *speech_encoding_args(),
+        '-y', str(output_path)
+    ])
+    return output_path
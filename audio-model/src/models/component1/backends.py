@@ -0,0 +1,185 @@
+import importlib.util
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.models.model_router import get_router
+from . import config
+
+
+class TranscriptionBackend:
+    """
+    Base class for speech-to-text backends.
+
+    transcribe() returns a dict with text, duration, language, segments
+    (start/end/text, in seconds) and chunks.
+    """
+
+    name = 'base'
+
+    # Remote backends get normalized uploads and are split into chunks for
+    # long recordings; local backends read the original file directly
+    remote = True
+
+    @property
+    def model(self) -> str:
+        raise NotImplementedError
+
+    def transcribe(self, audio_path: Path) -> Dict:
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Whisper via the OpenAI transcription API."""
+
+    name = 'openai'
+    remote = True
+
+    def __init__(self, client=None):
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.client = client
+
+    @property
+    def model(self) -> str:
+        return config.WHISPER_MODEL
+
+    def transcribe(self, audio_path: Path) -> Dict:
+        with open(audio_path, 'rb') as audio_file, get_router().timed('transcription', config.WHISPER_MODEL):
+            response = self.client.audio.transcriptions.create(
+                model=config.WHISPER_MODEL,
+                file=audio_file,
+                response_format='verbose_json'
+            )
+
+        segments = []
+        for segment in getattr(response, 'segments', None) or []:
+            if isinstance(segment, dict):
+                start, end, text = segment['start'], segment['end'], segment['text']
+            else:
+                start, end, text = segment.start, segment.end, segment.text
+            segments.append({'start': float(start), 'end': float(end), 'text': text})
+
+        return {
+            'text': response.text,
+            'duration': getattr(response, 'duration', None),
+            'language': getattr(response, 'language', None),
+            'segments': segments,
+            'chunks': 1
+        }
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Whisper on the local CPU via faster-whisper (CTranslate2, int8).
+
+    The model is loaded on first use (or by warm_up) and kept for the life
+    of the process.
+    """
+
+    name = 'local'
+    remote = False
+
+    def __init__(self):
+        self._model = None
+        # CTranslate2 models are not safe to call from several threads at once
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        return f"faster-whisper-{config.LOCAL_WHISPER_MODEL}"
+
+    def load(self):
+        """Load the model weights (no-op if already loaded)."""
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+                print(f"  Loading local Whisper model ({config.LOCAL_WHISPER_MODEL})...")
+                self._model = WhisperModel(
+                    config.LOCAL_WHISPER_MODEL,
+                    device='cpu',
+                    compute_type=config.LOCAL_WHISPER_COMPUTE_TYPE,
+                    cpu_threads=config.LOCAL_WHISPER_CPU_THREADS
+                )
+
+    def transcribe(self, audio_path: Path) -> Dict:
+        self.load()
+        with self._lock, get_router().timed('transcription', self.model):
+            segment_iter, info = self._model.transcribe(
+                str(audio_path),
+                beam_size=config.LOCAL_WHISPER_BEAM_SIZE
+            )
+            # Segments are decoded lazily while iterating
+            segments: List[Dict] = [
+                {'start': float(s.start), 'end': float(s.end), 'text': s.text.strip()}
+                for s in segment_iter
+            ]
+
+        return {
+            'text': ' '.join(s['text'] for s in segments if s['text']),
+            'duration': info.duration,
+            'language': info.language,
+            'segments': segments,
+            'chunks': 1
+        }
+
+
+_local_backend: Optional[LocalWhisperBackend] = None
+_local_backend_lock = threading.Lock()
+
+
+def local_backend_available() -> bool:
+    """Check whether faster-whisper is installed."""
+    return importlib.util.find_spec('faster_whisper') is not None
+
+
+def get_local_backend() -> LocalWhisperBackend:
+    """Return the process-wide local backend (its model loads on first use)."""
+    global _local_backend
+    if _local_backend is None:
+        with _local_backend_lock:
+            if _local_backend is None:
+                _local_backend = LocalWhisperBackend()
+    return _local_backend
+
+
+def select_backend(duration: Optional[float], client=None) -> TranscriptionBackend:
+    """
+    Choose a transcription backend for a recording.
+
+    TRANSCRIPTION_BACKEND selects 'openai', 'local', or 'auto'. In auto mode
+    recordings up to LOCAL_MAX_SECONDS are transcribed locally when
+    faster-whisper is installed; everything else goes to OpenAI.
+
+    Args:
+        duration: Recording length in seconds (None if unknown)
+        client: Optional OpenAI client for the OpenAI backend
+
+    Returns:
+        TranscriptionBackend instance
+
+    Raises:
+        ImportError: If 'local' is configured but faster-whisper is missing
+    """
+    mode = config.TRANSCRIPTION_BACKEND
+
+    if mode == 'local':
+        if not local_backend_available():
+            raise ImportError("TRANSCRIPTION_BACKEND is 'local' but faster-whisper is not installed")
+        return get_local_backend()
+
+    if (
+        mode == 'auto'
+        and duration is not None
+        and duration <= config.LOCAL_MAX_SECONDS
+        and local_backend_available()
+    ):
+        return get_local_backend()
+
+    return OpenAIWhisperBackend(client)
+
+
+def warm_up():
+    """Load the local model ahead of the first request if it may be used."""
+    if config.TRANSCRIPTION_BACKEND in ('auto', 'local') and local_backend_available():
+        get_local_backend().load()
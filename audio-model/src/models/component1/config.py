@@ -9,11 +9,52 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 WHISPER_MODEL = 'whisper-1'  # OpenAI Whisper model
 
+# Transcription backend: 'openai', 'local' (faster-whisper on CPU) or 'auto'
+# (local for recordings up to LOCAL_MAX_SECONDS when faster-whisper is installed)
+TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', 'auto')
+LOCAL_MAX_SECONDS = 120
+LOCAL_WHISPER_MODEL = os.getenv('LOCAL_WHISPER_MODEL', 'base.en')
+LOCAL_WHISPER_COMPUTE_TYPE = 'int8'
+LOCAL_WHISPER_CPU_THREADS = 0  # 0 = let CTranslate2 decide
+LOCAL_WHISPER_BEAM_SIZE = 1    # Greedy decoding; raise for accuracy at the cost of speed
+
+# Audio tooling
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+
+# Normalization before upload (requires ffmpeg)
+NORMALIZE_AUDIO = True         # Transcode to compact speech audio before Whisper
+NORMALIZED_SAMPLE_RATE = 16000  # Whisper resamples to 16 kHz anyway
+NORMALIZED_BITRATE = '24k'      # Opus bitrate for mono speech
+NORMALIZED_COMPRESSION_LEVEL = 5  # Opus encoder effort (0-10); 10 is ~2x slower for <1% smaller files
+
+# Voice-activity trimming: drop long silences before transcription (requires ffmpeg)
+VAD_ENABLED = False
+VAD_MIN_SILENCE_SECONDS = 1.5   # Only silences at least this long are removed
+VAD_PADDING_SECONDS = 0.3       # Silence kept on each side of speech
+VAD_MIN_SAVING_SECONDS = 5.0    # Skip trimming if it would save less than this
+
+# Transcript cache, keyed by (audio SHA-256, model, VAD settings when enabled)
+TRANSCRIPT_CACHE_ENABLED = True
+TRANSCRIPT_CACHE_MAX_ENTRIES = 1000
+
+# Chunked transcription for long recordings (requires ffmpeg)
+CHUNK_THRESHOLD_MB = 20          # Whisper rejects uploads over 25 MB
+CHUNK_THRESHOLD_SECONDS = 600    # Split recordings longer than this
+CHUNK_TARGET_SECONDS = 300       # Desired chunk length
+CHUNK_OVERLAP_SECONDS = 2.0      # Audio shared between neighbouring chunks
+MAX_PARALLEL_TRANSCRIPTIONS = 4  # Concurrent Whisper requests per recording
+SILENCE_NOISE_DB = -35           # Silence threshold for chunk boundaries (dBFS)
+SILENCE_MIN_SECONDS = 0.5        # Minimum silence length for a boundary
+
+# Streaming transcription (audio transcribed while it is still arriving)
+STREAM_SEGMENT_SECONDS = 30      # Target chunk length cut from the incoming stream (cut in silences, CHUNK_OVERLAP_SECONDS overlap)
+STREAM_MIN_SEGMENT_SECONDS = 0.1  # Shorter trailing chunks are skipped
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'components' / 'component1'
-ITERATION_TRACKER = PROJECT_ROOT / 'data' / 'components' / 'iteration_tracker.txt'
 ERROR_LOG = PROJECT_ROOT / 'logs' / 'errors.log'
+CACHE_DB = PROJECT_ROOT / 'data' / 'cache' / 'results.sqlite3'
 
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,265 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from . import config
+from .audio_tools import ffmpeg_available, silencedetect_filter, parse_silences, next_cut, chunk_span, extract_clip
+from .backends import TranscriptionBackend
+
+
+class StreamingTranscriber:
+    """
+    Transcribe audio while it is still arriving.
+
+    Incoming bytes are spooled to disk and piped into ffmpeg, which decodes
+    them to raw mono PCM and runs silencedetect on the way. Whenever enough
+    audio has been decoded, the next chunk is cut the same way as
+    transcribe_chunked cuts a file (inside a silence near
+    STREAM_SEGMENT_SECONDS, extended by CHUNK_OVERLAP_SECONDS on both sides)
+    and sent to the backend, so by the time the last chunk arrives most of
+    the recording has already been transcribed, and words at chunk
+    boundaries are transcribed whole by one of the two chunks.
+
+    The recording is spooled to spool_path + '.part' and moved into place by
+    finish(), so a spool_path shared with the blob store (a hard link) is
+    replaced rather than overwritten.
+
+    Containers that cannot be decoded from a pipe (e.g. .m4a with the index
+    at the end), or a missing ffmpeg, make finish() raise RuntimeError; the
+    spooled file is complete at that point and can be transcribed the normal
+    way.
+
+    Usage:
+        streamer = StreamingTranscriber(backend, spool_path)
+        for chunk in chunks:
+            streamer.feed(chunk)
+        transcription = streamer.finish()
+    """
+
+    def __init__(
+        self,
+        backend: TranscriptionBackend,
+        spool_path: Path,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            backend: Backend used for each chunk
+            spool_path: Where to save the full recording as it arrives
+            max_bytes: Abort with ValueError once more bytes than this arrive
+        """
+        self.backend = backend
+        self.spool_path = spool_path
+        self.max_bytes = max_bytes
+        self.bytes_received = 0
+        self.bytes_uploaded = 0
+
+        self._digest = hashlib.sha256()
+        self._work_dir = tempfile.TemporaryDirectory()
+        self._work = Path(self._work_dir.name)
+        self._pcm_path = self._work / 'audio.pcm'
+        self._log_path = self._work / 'ffmpeg.log'
+        self._pcm_args = ['-f', 's16le', '-ar', str(config.NORMALIZED_SAMPLE_RATE), '-ac', '1']
+        self._bytes_per_second = config.NORMALIZED_SAMPLE_RATE * 2
+        self._stderr = open(self._log_path, 'w')
+        self._partial_path = spool_path.with_name(spool_path.name + '.part')
+        self._spool = open(self._partial_path, 'wb')
+
+        self._pool = ThreadPoolExecutor(max_workers=config.MAX_PARALLEL_TRANSCRIPTIONS)
+        self._lock = threading.Lock()
+        self._cuts = [0.0]
+        self._chunks: List[Dict] = []
+        self._futures: List[Future] = []
+
+        self._closed = False
+        self._process = None
+        self._ffmpeg_error = 'ffmpeg not found'
+        if ffmpeg_available():
+            try:
+                self._process = self._start_ffmpeg()
+            except OSError as e:
+                self._ffmpeg_error = str(e)
+        self._ffmpeg_ok = self._process is not None
+
+    def _start_ffmpeg(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                config.FFMPEG_BINARY, '-hide_banner', '-nostats', '-loglevel', 'info',
+                # Fail instead of silently emitting empty audio on bad input
+                '-xerror',
+                '-i', 'pipe:0',
+                '-vn',
+                '-af', silencedetect_filter(),
+                *self._pcm_args,
+                str(self._pcm_path)
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr
+        )
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of all bytes received so far."""
+        return self._digest.hexdigest()
+
+    def feed(self, chunk: bytes):
+        """Consume the next chunk of the recording."""
+        self.bytes_received += len(chunk)
+        if self.max_bytes is not None and self.bytes_received > self.max_bytes:
+            self.abort()
+            raise ValueError(
+                f"Audio stream too large: over {self.max_bytes / (1024 * 1024):.0f}MB"
+            )
+
+        self._digest.update(chunk)
+        self._spool.write(chunk)
+
+        if self._ffmpeg_ok:
+            try:
+                self._process.stdin.write(chunk)
+            except BrokenPipeError:
+                # ffmpeg gave up on the stream; keep spooling for the fallback
+                self._ffmpeg_ok = False
+            self._submit_ready_chunks()
+
+    def finish(self) -> Dict:
+        """
+        Wait for the remaining chunks and stitch the transcript.
+
+        Returns:
+            dict in the same shape as TranscriptionBackend.transcribe
+
+        Raises:
+            RuntimeError: If ffmpeg could not decode the stream
+        """
+        from .transcriber import stitch_transcripts
+
+        try:
+            self._spool.close()
+            os.replace(self._partial_path, self.spool_path)
+            if self._process is None:
+                raise RuntimeError(f"could not start ffmpeg: {self._ffmpeg_error}")
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self._process.wait()
+
+            if returncode != 0 or not self._ffmpeg_ok:
+                raise RuntimeError(f"ffmpeg could not decode stream: {self._log_path.read_text().strip()[-500:]}")
+
+            duration = self._submit_ready_chunks(final=True)
+            parts = [future.result() for future in self._futures]
+        finally:
+            self._close()
+
+        result = stitch_transcripts(self._chunks, parts)
+        result['duration'] = duration
+        return result
+
+    def abort(self):
+        """Stop ffmpeg and discard pending work."""
+        if self._closed:
+            return
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+        self._spool.close()
+        self._partial_path.unlink(missing_ok=True)
+        self._close()
+
+    def _submit_ready_chunks(self, final: bool = False) -> float:
+        """
+        Send every chunk whose audio (including the trailing overlap) has
+        been decoded to the backend; with final, also the last chunk.
+
+        Returns:
+            Seconds of audio decoded so far
+        """
+        decoded = self._pcm_path.stat().st_size / self._bytes_per_second if self._pcm_path.exists() else 0.0
+        target = config.STREAM_SEGMENT_SECONDS
+        overlap = config.CHUNK_OVERLAP_SECONDS
+
+        if decoded - self._cuts[-1] > target + overlap:
+            silences = parse_silences(self._log_path.read_text(errors='replace').splitlines())
+            while decoded - self._cuts[-1] > target + overlap:
+                cut = next_cut(self._cuts[-1], silences, target)
+                self._submit(chunk_span(self._cuts[-1], cut, decoded, overlap))
+                self._cuts.append(cut)
+
+        if final and decoded > self._cuts[-1]:
+            self._submit(chunk_span(self._cuts[-1], decoded, decoded, overlap))
+            self._cuts.append(decoded)
+
+        return decoded
+
+    def _submit(self, chunk: Dict):
+        index = len(self._chunks)
+        self._chunks.append(chunk)
+        if chunk['end'] - chunk['start'] < config.STREAM_MIN_SEGMENT_SECONDS:
+            # Whisper rejects near-empty clips (e.g. the last few ms)
+            self._futures.append(self._done({
+                'text': '', 'duration': 0.0, 'language': None, 'segments': [], 'chunks': 1
+            }))
+        else:
+            self._futures.append(self._pool.submit(self._transcribe_chunk, index, chunk))
+
+    def _transcribe_chunk(self, index: int, chunk: Dict) -> Dict:
+        clip_path = self._work / f'chunk_{index:04d}.ogg'
+        extract_clip(self._pcm_path, chunk['start'], chunk['end'], clip_path, self._pcm_args)
+        with self._lock:
+            self.bytes_uploaded += clip_path.stat().st_size
+        return self.backend.transcribe(clip_path)
+
+    @staticmethod
+    def _done(value: Dict) -> Future:
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def _close(self):
+        self._closed = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._stderr.close()
+        self._work_dir.cleanup()
+
+
+def transcribe_stream(
+    backend: TranscriptionBackend,
+    chunks: Iterable[bytes],
+    spool_path: Path,
+    max_bytes: Optional[int] = None
+) -> Tuple[Optional[Dict], StreamingTranscriber]:
+    """
+    Transcribe a chunked audio stream as it arrives.
+
+    Args:
+        backend: Transcription backend
+        chunks: Audio bytes as they arrive
+        spool_path: Where to save the full recording
+        max_bytes: Maximum accepted stream size
+
+    Returns:
+        (transcription, streamer). The transcription is None if the stream
+        could not be decoded incrementally; spool_path then holds the complete
+        recording for a normal transcription. The streamer carries the byte
+        counts and SHA-256 of the recording.
+    """
+    streamer = StreamingTranscriber(backend, spool_path, max_bytes)
+    try:
+        for chunk in chunks:
+            streamer.feed(chunk)
+    except Exception:
+        streamer.abort()
+        raise
+
+    try:
+        return streamer.finish(), streamer
+    except RuntimeError as e:
+        print(f"⚠ Streaming transcription unavailable, transcribing full file: {e}")
+        return None, streamer
@@ -1,10 +1,18 @@
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
-from openai import OpenAI
+from typing import Dict, Iterable, List, Optional
 from . import config
-from .utils import get_current_iteration, log_error
+from .audio_tools import (
+    ffmpeg_available, probe_duration, detect_silences, plan_chunks, extract_clip, normalize_audio,
+    speech_regions, trim_to_regions, map_to_original
+)
+from .backends import TranscriptionBackend, select_backend
+from .utils import get_current_iteration, log_error, file_sha256
+from src.models.blob_store import detach
+from src.models.result_cache import ResultCache
 
 def transcribe_audio(
     audio_file_path: str = None,
@@ -12,10 +20,13 @@ def transcribe_audio(
     audio_data: bytes = None,
     format: str = 'm4a',
     iteration: int = None,
-    session_id: str = None
+    session_id: str = None,
+    audio_stream: Iterable[bytes] = None,
+    max_bytes: int = None,
+    audio_sha256: str = None
 ) -> dict:
     """
-    Transcribe audio file using OpenAI Whisper API.
+    Transcribe audio file with Whisper (OpenAI API or a local CPU model).
 
     Args:
         audio_file_path: Path to audio file (legacy, string)
@@ -24,6 +35,10 @@ def transcribe_audio(
         format: Audio format ('m4a', 'wav', 'mp3', etc.)
         iteration: Iteration number (for CLI mode)
         session_id: Session ID (for API mode)
+        audio_stream: Audio bytes in chunks as they arrive; segments are
+            transcribed while the rest is still coming in
+        max_bytes: Maximum accepted size for audio_stream
+        audio_sha256: SHA-256 of the audio if already known (skips re-hashing)
 
     Returns:
         dict: Transcription results with metadata
@@ -39,11 +54,13 @@ def transcribe_audio(
             from src.models.session_manager import get_session_path
 
             # If audio_data provided, save to session input
-            if audio_data:
+            if audio_data or audio_stream is not None:
                 input_path = get_session_path(session_id) / 'input' / f'audio.{format}'
                 input_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(input_path, 'wb') as f:
-                    f.write(audio_data)
+                if audio_data:
+                    detach(input_path)
+                    with open(input_path, 'wb') as f:
+                        f.write(audio_data)
                 audio_path = input_path
             elif audio_path is None and audio_file_path:
                 audio_path = Path(audio_file_path)
@@ -57,42 +74,79 @@ def transcribe_audio(
             else:
                 current_iteration = iteration
 
-            if audio_path is None:
+            if audio_path is None and audio_file_path:
                 audio_path = Path(audio_file_path)
+            elif audio_path is None and audio_stream is not None:
+                audio_path = config.OUTPUT_DIR / f"{current_iteration}_1_audio.{format}"
 
             output_filename = f"{current_iteration}_1_output.json"
             output_path = config.OUTPUT_DIR / output_filename
 
+        streamed, streamer = None, None
+        if audio_stream is not None:
+            # Transcribe segments while the rest of the recording arrives
+            from .streaming import transcribe_stream
+            backend = select_backend(None)
+            streamed, streamer = transcribe_stream(backend, audio_stream, audio_path, max_bytes)
+
         # Validate audio file exists
         if not audio_path.exists():
             error_msg = f"Audio file not found: {audio_path}"
             log_error(1, error_msg)
             raise FileNotFoundError(error_msg)
 
-        # Initialize OpenAI client
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
+        audio_bytes = {'original': audio_path.stat().st_size, 'uploaded': 0}
+        if streamer:
+            audio_sha256 = streamer.sha256
+        cache = get_transcript_cache()
+
+        if streamed is not None:
+            transcription, cached = streamed, False
+            audio_bytes['uploaded'] = streamer.bytes_uploaded
+            cache_key = f"{audio_sha256}:{backend.model}"
+        else:
+            duration = probe_duration(audio_path) if ffmpeg_available() else None
+            backend = select_backend(duration)
 
-        # Call Whisper API
-        with open(audio_path, 'rb') as audio_file:
-            response = client.audio.transcriptions.create(
-                model=config.WHISPER_MODEL,
-                file=audio_file,
-                response_format='verbose_json'
-            )
+            # Identical audio (retries, double submits, reprocessing) is served from cache
+            if cache:
+                cache_key = f"{audio_sha256 or file_sha256(audio_path)}:{backend.model}"
+                if config.VAD_ENABLED:
+                    cache_key += vad_cache_tag()
+            transcription = cache.get(cache_key) if cache else None
+            cached = transcription is not None
+
+            if cached:
+                print(f"✓ Transcript cache hit ({cache_key[:12]}...)")
+            else:
+                transcription = transcribe_file(backend, audio_path, duration, audio_bytes)
+
+        if cache and not cached:
+            cache.put(cache_key, transcription)
 
         # Format output
         result = {
             'component': 1,
             'audio_file': audio_path.name,
             'timestamp': datetime.now().isoformat(),
-            'transcript': response.text,
+            'transcript': transcription['text'],
+            'segments': transcription['segments'],
             'metadata': {
-                'duration': getattr(response, 'duration', 'unknown'),
-                'model': config.WHISPER_MODEL,
-                'language': getattr(response, 'language', 'en')
+                'duration': transcription['duration'] or 'unknown',
+                'model': backend.model,
+                'backend': backend.name,
+                'language': transcription['language'] or 'en',
+                'chunks': transcription['chunks'],
+                'audio_bytes': audio_bytes,
+                'cached': cached,
+                'streamed': streamed is not None
             }
         }
 
+        if 'trimmed_duration' in transcription:
+            result['metadata']['trimmed_duration'] = transcription['trimmed_duration']
+            result['metadata']['speech_regions'] = transcription['speech_regions']
+
         # Add mode-specific fields
         if session_id:
             result['session_id'] = session_id
@@ -104,6 +158,15 @@ def transcribe_audio(
             json.dump(result, f, indent=2)
 
         if session_id:
+            from src.models.session_manager import update_session_metadata, get_session_path
+            from src.models.session_artifacts import record_artifact
+            if Path(audio_path).parent == get_session_path(session_id) / 'input':
+                record_artifact(session_id, audio_path, 'audio')
+            record_artifact(session_id, output_path, 'transcript')
+            update_session_metadata(session_id, {
+                'audio_original_bytes': audio_bytes['original'],
+                'audio_upload_bytes': audio_bytes['uploaded']
+            })
             print(f"✓ Transcription complete: session {session_id}")
         else:
             print(f"✓ Transcription complete: {output_path.name}")
@@ -115,3 +178,227 @@ def transcribe_audio(
         error_msg = f"Transcription failed: {str(e)}"
         log_error(1, error_msg)
         raise
+
+def transcribe_file(
+    backend: TranscriptionBackend,
+    audio_path: Path,
+    duration: Optional[float],
+    audio_bytes: Dict
+) -> Dict:
+    """
+    Transcribe a complete recording on disk.
+
+    Applies voice-activity trimming (if enabled), normalization and chunking
+    for remote backends, and maps segment times back to the original
+    recording when audio was trimmed.
+
+    Args:
+        backend: Transcription backend
+        audio_path: Original recording
+        duration: Recording duration in seconds (None if unknown)
+        audio_bytes: Byte counts; 'uploaded' is filled in
+
+    Returns:
+        dict in the same shape as TranscriptionBackend.transcribe, plus
+        trimmed_duration and speech_regions if audio was trimmed
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+
+        regions = plan_speech_trim(audio_path, duration)
+        if regions:
+            # Trimmed audio is already in the compact upload encoding
+            source_path = trim_to_regions(audio_path, regions, work_dir / 'trimmed.ogg')
+            source_duration = sum(end - start for start, end in regions)
+            print(f"  Trimmed silence: {duration:.0f}s -> {source_duration:.0f}s")
+        else:
+            source_path, source_duration = audio_path, duration
+
+        if not backend.remote:
+            # Local model reads the file directly; no upload, no chunking
+            transcription = backend.transcribe(source_path)
+        else:
+            # Shrink the payload to compact speech audio before upload
+            upload_path = source_path if regions else prepare_upload(audio_path, work_dir)
+            audio_bytes['uploaded'] = upload_path.stat().st_size
+
+            # Long or large recordings are split and transcribed in parallel
+            if should_chunk(upload_path, source_duration):
+                transcription = transcribe_chunked(backend, upload_path, source_duration)
+            else:
+                transcription = backend.transcribe(upload_path)
+
+    if regions:
+        for segment in transcription['segments']:
+            segment['start'] = round(map_to_original(segment['start'], regions), 3)
+            segment['end'] = round(map_to_original(segment['end'], regions), 3)
+        transcription['duration'] = duration
+        transcription['trimmed_duration'] = round(source_duration, 3)
+        transcription['speech_regions'] = [[round(start, 3), round(end, 3)] for start, end in regions]
+
+    return transcription
+
+def plan_speech_trim(audio_path: Path, duration: Optional[float]) -> Optional[List]:
+    """
+    Find the speech regions to keep, if voice-activity trimming is worthwhile.
+
+    Returns:
+        List of (start, end) regions, or None to transcribe the whole file
+    """
+    if not config.VAD_ENABLED or not duration or not ffmpeg_available():
+        return None
+
+    silences = detect_silences(
+        audio_path,
+        min_silence=config.VAD_MIN_SILENCE_SECONDS,
+        duration=duration
+    )
+    regions = speech_regions(duration, silences, config.VAD_PADDING_SECONDS)
+    kept = sum(end - start for start, end in regions)
+
+    if not regions or duration - kept < config.VAD_MIN_SAVING_SECONDS:
+        return None
+    return regions
+
+def vad_cache_tag() -> str:
+    """Transcript cache key suffix for the current trimming settings."""
+    return (f":vad={config.SILENCE_NOISE_DB},{config.VAD_MIN_SILENCE_SECONDS},"
+            f"{config.VAD_PADDING_SECONDS},{config.VAD_MIN_SAVING_SECONDS}")
+
+_transcript_cache = None
+
+def get_transcript_cache() -> Optional[ResultCache]:
+    """Return the transcript cache, or None if caching is disabled."""
+    global _transcript_cache
+    if not config.TRANSCRIPT_CACHE_ENABLED:
+        return None
+    if _transcript_cache is None:
+        _transcript_cache = ResultCache(
+            config.CACHE_DB,
+            namespace='transcripts',
+            max_entries=config.TRANSCRIPT_CACHE_MAX_ENTRIES
+        )
+    return _transcript_cache
+
+def prepare_upload(audio_path: Path, work_dir: Path) -> Path:
+    """
+    Normalize a recording to mono 16 kHz Opus for upload to Whisper.
+
+    Falls back to the original file if normalization is disabled, ffmpeg
+    is missing or fails, or the result would not be smaller.
+
+    Args:
+        audio_path: Original recording
+        work_dir: Directory for the normalized file
+
+    Returns:
+        Path of the file to upload
+    """
+    if not config.NORMALIZE_AUDIO or not ffmpeg_available():
+        return audio_path
+
+    normalized_path = work_dir / f"{audio_path.stem}_normalized.ogg"
+    try:
+        normalize_audio(audio_path, normalized_path)
+    except RuntimeError as e:
+        print(f"⚠ Audio normalization failed, uploading original: {e}")
+        return audio_path
+
+    original_size = audio_path.stat().st_size
+    normalized_size = normalized_path.stat().st_size
+    if normalized_size >= original_size:
+        return audio_path
+
+    print(f"  Normalized audio: {original_size / 1024:.0f}KB -> {normalized_size / 1024:.0f}KB")
+    return normalized_path
+
+def should_chunk(audio_path: Path, duration: Optional[float]) -> bool:
+    """Decide whether a recording must be split before transcription."""
+    if duration is None:
+        # Without ffmpeg there is no way to split the file
+        return False
+    size_mb = audio_path.stat().st_size / (1024 * 1024)
+    return size_mb > config.CHUNK_THRESHOLD_MB or duration > config.CHUNK_THRESHOLD_SECONDS
+
+def transcribe_chunked(backend: TranscriptionBackend, audio_path: Path, duration: float) -> Dict:
+    """
+    Transcribe a long recording as overlapping chunks in parallel.
+
+    Chunks are cut inside silences, extracted and transcribed concurrently
+    (at most MAX_PARALLEL_TRANSCRIPTIONS at a time), then stitched back in
+    order with timestamps relative to the full recording.
+
+    Returns:
+        dict in the same shape as TranscriptionBackend.transcribe
+    """
+    silences = detect_silences(audio_path)
+    chunks = plan_chunks(
+        duration,
+        silences,
+        config.CHUNK_TARGET_SECONDS,
+        config.CHUNK_OVERLAP_SECONDS
+    )
+    print(f"  Splitting {duration:.0f}s recording into {len(chunks)} chunks")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        def transcribe_chunk(index: int) -> Dict:
+            chunk = chunks[index]
+            clip_path = Path(work_dir) / f"chunk_{index:03d}.ogg"
+            extract_clip(audio_path, chunk['start'], chunk['end'], clip_path)
+            return backend.transcribe(clip_path)
+
+        with ThreadPoolExecutor(max_workers=config.MAX_PARALLEL_TRANSCRIPTIONS) as pool:
+            parts = list(pool.map(transcribe_chunk, range(len(chunks))))
+
+    result = stitch_transcripts(chunks, parts)
+    result['duration'] = duration
+    return result
+
+def stitch_transcripts(chunks: List[Dict], parts: List[Dict]) -> Dict:
+    """
+    Merge per-chunk transcriptions into one.
+
+    Segment times are shifted by their chunk's start. Overlapping audio is
+    transcribed twice, so each segment is kept only by the chunk whose owned
+    span contains the segment's midpoint.
+
+    Args:
+        chunks: Chunk plan from plan_chunks
+        parts: Backend results, one per chunk
+
+    Returns:
+        dict in the same shape as TranscriptionBackend.transcribe
+    """
+    segments = []
+    last = len(chunks) - 1
+
+    for index, (chunk, part) in enumerate(zip(chunks, parts)):
+        if not part['segments']:
+            # No timing information; attribute the text to the owned span
+            if part['text'].strip():
+                segments.append({
+                    'start': chunk['own_start'],
+                    'end': chunk['own_end'],
+                    'text': part['text'].strip()
+                })
+            continue
+
+        for segment in part['segments']:
+            start = segment['start'] + chunk['start']
+            end = segment['end'] + chunk['start']
+            midpoint = (start + end) / 2
+            owned = chunk['own_start'] <= midpoint and (midpoint < chunk['own_end'] or index == last)
+            if owned:
+                segments.append({
+                    'start': round(start, 3),
+                    'end': round(end, 3),
+                    'text': segment['text'].strip()
+                })
+
+    return {
+        'text': ' '.join(s['text'] for s in segments if s['text']),
+        'duration': None,
+        'language': next((p['language'] for p in parts if p['language']), None),
+        'segments': segments,
+        'chunks': len(chunks)
+    }
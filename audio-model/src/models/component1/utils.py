@@ -1,18 +1,7 @@
 from datetime import datetime
-from pathlib import Path
 from . import config
-
-def get_current_iteration() -> int:
-    """Read global iteration from tracker file."""
-    try:
-        with open(config.ITERATION_TRACKER, 'r') as f:
-            content = f.read().strip()
-            # Parse: iteration=N
-            if '=' in content:
-                return int(content.split('=')[1])
-            return 0
-    except (FileNotFoundError, ValueError):
-        return 0
+from src.models.iteration_tracker import get_current_iteration
+from src.models.blob_store import file_sha256
 
 def log_error(component_num: int, error_msg: str):
     """Log error to ClaudeInfo/errors_fixes.MD."""
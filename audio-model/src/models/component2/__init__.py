@@ -1,4 +1,5 @@
 from .extractor import extract_keywords
 from .fine_tune import fine_tune_model
+from .local_extractor import train_local_extractor
 
-__all__ = ['extract_keywords', 'fine_tune_model']
+__all__ = ['extract_keywords', 'fine_tune_model', 'train_local_extractor']
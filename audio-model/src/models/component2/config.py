@@ -11,14 +11,40 @@ BASE_MODEL = 'gpt-4o-mini-2024-07-18'  # Specific snapshot required for fine-tun
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'components' / 'component2'
-ITERATION_TRACKER = PROJECT_ROOT / 'data' / 'components' / 'iteration_tracker.txt'
 ERROR_LOG = PROJECT_ROOT / 'logs' / 'errors.log'
+CACHE_DB = PROJECT_ROOT / 'data' / 'cache' / 'results.sqlite3'
 
 # Dataset paths
 DATASET_CSV = PROJECT_ROOT / 'data' / 'medical-transcriptions' / 'mtsamples.csv'
 TRAINING_JSONL = OUTPUT_DIR / 'training_data.jsonl'
 VALIDATION_JSONL = OUTPUT_DIR / 'validation_data.jsonl'
 
+# Dataset builder (streams the CSV in chunks; scales to corpora far larger than mtsamples)
+DATASET_CHUNK_ROWS = 2000
+DATASET_WORKERS = min(4, os.cpu_count() or 1)   # Processes cleaning and hashing chunks
+VALIDATION_SHARE = 0.2
+MIN_EXAMPLE_TOKENS = 50             # Estimated tokens per example (about 4 characters each)
+MAX_EXAMPLE_TOKENS = 16000          # Longer examples dominate fine-tuning cost
+NEAR_DUPLICATE_THRESHOLD = 0.85     # Estimated Jaccard similarity of 5-word shingles
+SHINGLE_WORDS = 5
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 8                   # LSH bands; candidates are verified against the threshold
+
+# Local keyword extractor (tier 1; low-confidence transcripts fall back to the fine-tuned model)
+LOCAL_EXTRACTOR_ENABLED = True
+LOCAL_MODEL_PATH = OUTPUT_DIR / 'local_keyword_model.pkl'
+LOCAL_VOCAB_SIZE = 500              # Most frequent dataset keywords the model can predict
+LOCAL_MIN_KEYWORD_COUNT = 5         # Keywords seen fewer times are not learned
+LOCAL_KEYWORD_PROBABILITY = 0.3     # Minimum probability for a predicted keyword
+LOCAL_MIN_KEYWORDS = 3              # Confidence is the mean probability of the top N keywords
+LOCAL_MAX_KEYWORDS = 10
+LOCAL_TARGET_PRECISION = 0.8        # Calibrates the confidence threshold on the validation split
+LOCAL_CONFIDENCE_THRESHOLD = None   # Set to override the calibrated threshold
+
+# Keyword cache for the fine-tuned model, keyed by (normalized transcript hash, model ID)
+KEYWORD_CACHE_ENABLED = True
+KEYWORD_CACHE_MAX_ENTRIES = 5000
+
 # Component 1 input
 COMPONENT1_DIR = PROJECT_ROOT / 'data' / 'components' / 'component1'
 
@@ -5,13 +5,19 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+_UNSET = object()
+_model_id = _UNSET
+
 def get_model_id():
-    """Read KEYWORD_EXTRACTOR_MODEL_ID from src/models/config.py"""
-    try:
-        from src.models import config
-        return getattr(config, 'KEYWORD_EXTRACTOR_MODEL_ID', None)
-    except (ImportError, AttributeError):
-        return None
+    """Read KEYWORD_EXTRACTOR_MODEL_ID from src/models/config.py (once per process)"""
+    global _model_id
+    if _model_id is _UNSET:
+        try:
+            from src.models import config
+            _model_id = getattr(config, 'KEYWORD_EXTRACTOR_MODEL_ID', None)
+        except (ImportError, AttributeError):
+            return None
+    return _model_id
 
 def save_model_id(model_id: str):
     """Save model ID to src/models/config.py"""
@@ -40,6 +46,9 @@ def save_model_id(model_id: str):
     with open(config_path, 'w') as f:
         f.write(content)
 
+    global _model_id
+    _model_id = model_id
+
 def model_exists():
     """Check if fine-tuned model already exists"""
     model_id = get_model_id()
@@ -1,18 +1,27 @@
 import json
 from datetime import datetime
-from typing import Optional
-from openai import OpenAI
+from typing import Optional, Tuple, List
+from src.models.model_router import get_router
+from src.models.result_cache import ResultCache
 from .config_handler import get_model_id
+from .local_extractor import get_local_extractor
+from .prepare_dataset import SYSTEM_PROMPT
 from . import config
-from .utils import get_current_iteration, get_component1_output, log_error
+from .utils import get_current_iteration, get_component1_output, log_error, transcript_hash
 
-def extract_keywords(iteration: int = None, session_id: str = None) -> dict:
+def extract_keywords(
+    iteration: int = None,
+    session_id: str = None,
+    llm_output: Optional[Tuple[str, str]] = None
+) -> dict:
     """
     Extract keywords from Component 1 transcript.
 
     Args:
         iteration: Iteration number (for CLI mode)
         session_id: Session ID (for API mode)
+        llm_output: (response text, model ID) already obtained from the
+            fine-tuned model (batch reprocessing); used instead of calling it
 
     Returns:
         dict: Keywords and description
@@ -43,34 +52,42 @@ def extract_keywords(iteration: int = None, session_id: str = None) -> dict:
 
         transcript = component1_data['transcript']
 
-        # Get fine-tuned model ID
-        model_id = get_model_id()
-        if not model_id:
-            raise ValueError("No fine-tuned model found. Run fine-tuning first.")
-
-        # Initialize OpenAI client
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
-
-        # Call fine-tuned model
-        response = client.chat.completions.create(
-            model=model_id,
-            messages=[
-                {"role": "system", "content": "You are a medical transcription analyzer that extracts keywords and creates concise descriptions."},
-                {"role": "user", "content": transcript}
-            ]
-        )
-
-        # Parse response
-        content = response.choices[0].message.content
-
-        # Extract keywords and description
-        lines = content.split('\n')
-        keywords_line = next((l for l in lines if l.startswith('Keywords:')), '')
-        description_line = next((l for l in lines if l.startswith('Description:')), '')
-
-        keywords_raw = keywords_line.replace('Keywords:', '').strip()
-        keywords = [k.strip() for k in keywords_raw.split(',') if k.strip()]
-        description = description_line.replace('Description:', '').strip()
+        # Tier 1: local model; only low-confidence transcripts go to the fine-tuned model
+        local = get_local_extractor()
+        local_confidence = None
+        cached = False
+        if local:
+            prediction = local.predict(transcript)
+            local_confidence = prediction['confidence']
+
+        if local and local_confidence >= local.confidence_threshold:
+            keywords = prediction['keywords']
+            description = prediction['description']
+            model_id = 'local'
+            tier = 'local'
+            confidence = local_confidence
+        else:
+            # Resubmitted and reprocessed transcripts are served from cache.
+            # The model ID is part of the key, so a new fine-tuned model misses.
+            cache = get_keyword_cache()
+            model_id = llm_output[1] if llm_output else get_model_id()
+            cache_key = keyword_cache_key(transcript, model_id) if model_id else None
+            hit = cache.get(cache_key) if cache and cache_key else None
+            cached = hit is not None
+
+            if cached:
+                keywords, description = hit['keywords'], hit['description']
+                print(f"✓ Keyword cache hit ({cache_key[:12]}...)")
+            else:
+                if llm_output:
+                    keywords, description = parse_llm_output(llm_output[0])
+                else:
+                    keywords, description, model_id = extract_with_llm(transcript)
+                # Keyed by the model that actually produced the answer
+                if cache and model_id:
+                    cache.put(keyword_cache_key(transcript, model_id), {'keywords': keywords, 'description': description})
+            tier = 'llm'
+            confidence = 0.95  # Placeholder
 
         # Format output
         result = {
@@ -81,7 +98,10 @@ def extract_keywords(iteration: int = None, session_id: str = None) -> dict:
             'description': description,
             'metadata': {
                 'model': model_id,
-                'confidence': 0.95  # Placeholder
+                'tier': tier,
+                'cached': cached,
+                'confidence': confidence,
+                'local_confidence': local_confidence
             }
         }
 
@@ -95,10 +115,15 @@ def extract_keywords(iteration: int = None, session_id: str = None) -> dict:
         with open(output_path, 'w') as f:
             json.dump(result, f, indent=2)
 
+        if session_id:
+            from src.models.session_artifacts import record_artifact
+            record_artifact(session_id, output_path, 'keywords')
+
         if session_id:
             print(f"✓ Keyword extraction complete: session {session_id}")
         else:
             print(f"✓ Keyword extraction complete: {output_path.name}")
+        print(f"✓ Tier: {tier}" + (f" (local confidence {local_confidence:.2f})" if local_confidence is not None else ""))
         print(f"✓ Keywords: {', '.join(keywords[:5])}...")
         print(f"✓ Description: {description[:100]}...")
 
@@ -108,3 +133,76 @@ def extract_keywords(iteration: int = None, session_id: str = None) -> dict:
         error_msg = f"Keyword extraction failed: {str(e)}"
         log_error(2, error_msg)
         raise
+
+_keyword_cache = None
+
+def get_keyword_cache() -> Optional[ResultCache]:
+    """Return the keyword cache, or None if caching is disabled."""
+    global _keyword_cache
+    if not config.KEYWORD_CACHE_ENABLED:
+        return None
+    if _keyword_cache is None:
+        _keyword_cache = ResultCache(
+            config.CACHE_DB,
+            namespace='keywords',
+            max_entries=config.KEYWORD_CACHE_MAX_ENTRIES
+        )
+    return _keyword_cache
+
+def keyword_cache_key(transcript: str, model_id: str) -> str:
+    """Cache key for a transcript's fine-tuned model result."""
+    return f"{transcript_hash(transcript)}:{model_id}"
+
+def needs_llm(transcript: str) -> bool:
+    """
+    Check whether extract_keywords would call the fine-tuned model.
+
+    False if the local tier is confident or the result is already cached.
+    """
+    local = get_local_extractor()
+    if local and local.predict(transcript)['confidence'] >= local.confidence_threshold:
+        return False
+
+    cache = get_keyword_cache()
+    model_id = get_model_id()
+    return not (cache and model_id and keyword_cache_key(transcript, model_id) in cache)
+
+def extract_with_llm(transcript: str) -> Tuple[List[str], str, str]:
+    """
+    Extract keywords and a description with the fine-tuned model.
+
+    Returns:
+        (keywords, description, model_id)
+    """
+    # Get fine-tuned model ID
+    model_id = get_model_id()
+    if not model_id:
+        raise ValueError("No fine-tuned model found. Run fine-tuning first.")
+
+    # Call fine-tuned model (timed by the router)
+    response = get_router().complete(
+        'keyword_extraction',
+        [{"role": "user", "content": transcript}],
+        system=SYSTEM_PROMPT,
+        models=[model_id]
+    )
+
+    keywords, description = parse_llm_output(response['text'])
+    return keywords, description, model_id
+
+def parse_llm_output(content: str) -> Tuple[List[str], str]:
+    """
+    Parse the fine-tuned model's "Keywords: ... / Description: ..." answer.
+
+    Returns:
+        (keywords, description)
+    """
+    lines = content.split('\n')
+    keywords_line = next((l for l in lines if l.startswith('Keywords:')), '')
+    description_line = next((l for l in lines if l.startswith('Description:')), '')
+
+    keywords_raw = keywords_line.replace('Keywords:', '').strip()
+    keywords = [k.strip() for k in keywords_raw.split(',') if k.strip()]
+    description = description_line.replace('Description:', '').strip()
+
+    return keywords, description
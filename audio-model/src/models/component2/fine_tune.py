@@ -56,6 +56,12 @@ def fine_tune_model():
 
                 # Save model ID
                 save_model_id(model_id)
+
+                # Results from the previous model can no longer be hit; drop them
+                from .extractor import get_keyword_cache
+                cache = get_keyword_cache()
+                if cache:
+                    cache.invalidate()
                 return model_id
 
             elif status in ['failed', 'cancelled']:
@@ -0,0 +1,232 @@
+import os
+import re
+import pickle
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from . import config
+from .prepare_dataset import load_dataset_splits
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Sentences considered for the extractive description
+MAX_DESCRIPTION_SENTENCES = 40
+MAX_DESCRIPTION_CHARS = 300
+
+def normalize_keywords(raw: str) -> List[str]:
+    """Split a dataset keyword string into clean, lowercase keywords."""
+    keywords = []
+    for keyword in str(raw).split(','):
+        keyword = ' '.join(keyword.lower().split())
+        # Specialty labels ("allergy / immunology") and run-on artifacts are not keywords
+        if keyword and '/' not in keyword and len(keyword) < 50 and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+class LocalKeywordExtractor:
+    """
+    Tier-1 keyword extractor: TF-IDF features and one linear classifier per
+    keyword, trained on the same dataset as the fine-tuned model.
+    """
+
+    def __init__(self, bundle: Dict):
+        self.vectorizer = bundle['vectorizer']
+        self.classifier = bundle['classifier']
+        self.labels = bundle['labels']
+        self.calibrated_threshold = bundle['confidence_threshold']
+        self.metrics = bundle.get('metrics', {})
+
+    @property
+    def confidence_threshold(self) -> float:
+        if config.LOCAL_CONFIDENCE_THRESHOLD is not None:
+            return config.LOCAL_CONFIDENCE_THRESHOLD
+        return self.calibrated_threshold
+
+    def predict(self, transcript: str) -> Dict:
+        """
+        Predict keywords and a description for one transcript.
+
+        Returns:
+            dict with keywords, description and confidence (0-1)
+        """
+        return self.predict_many([transcript])[0]
+
+    def predict_many(self, transcripts: List[str]) -> List[Dict]:
+        """Predict keywords for several transcripts in one pass."""
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform(transcripts))
+        results = []
+
+        for transcript, row in zip(transcripts, probabilities):
+            ranked = sorted(range(len(row)), key=lambda i: row[i], reverse=True)
+            top = ranked[:config.LOCAL_MAX_KEYWORDS]
+
+            keywords = [self.labels[i] for i in top if row[i] >= config.LOCAL_KEYWORD_PROBABILITY]
+            if len(keywords) < config.LOCAL_MIN_KEYWORDS:
+                keywords = [self.labels[i] for i in top[:config.LOCAL_MIN_KEYWORDS]]
+
+            head = [row[i] for i in top[:config.LOCAL_MIN_KEYWORDS]]
+            results.append({
+                'keywords': keywords,
+                'description': describe(transcript, keywords),
+                'confidence': float(sum(head) / len(head)) if head else 0.0
+            })
+
+        return results
+
+def describe(transcript: str, keywords: List[str]) -> str:
+    """
+    Pick the early transcript sentence that mentions the most keywords.
+
+    Returns:
+        Description (at most MAX_DESCRIPTION_CHARS characters)
+    """
+    sentences = [s.strip() for s in SENTENCE_SPLIT.split(transcript.strip()) if s.strip()]
+    sentences = sentences[:MAX_DESCRIPTION_SENTENCES]
+    if not sentences:
+        return ''
+
+    def score(sentence: str) -> int:
+        lower = sentence.lower()
+        return sum(1 for keyword in keywords if keyword in lower)
+
+    # max() keeps the earliest sentence on ties
+    best = max(sentences, key=score)
+    if len(best) > MAX_DESCRIPTION_CHARS:
+        best = best[:MAX_DESCRIPTION_CHARS].rsplit(' ', 1)[0] + '...'
+    return best
+
+def calibrate_threshold(predictions: List[Dict], truths: List[List[str]], target_precision: float) -> Dict:
+    """
+    Find the lowest confidence at which accepted predictions stay precise.
+
+    Transcripts are accepted in order of decreasing confidence; the threshold
+    is the lowest confidence where keyword precision over everything accepted
+    so far is still at least target_precision.
+
+    Returns:
+        dict with threshold, coverage (share of transcripts accepted) and precision
+    """
+    order = sorted(range(len(predictions)), key=lambda i: predictions[i]['confidence'], reverse=True)
+    correct = predicted = 0
+    best = {'threshold': 1.01, 'coverage': 0.0, 'precision': 0.0}
+
+    for rank, i in enumerate(order, start=1):
+        keywords = predictions[i]['keywords']
+        truth = set(truths[i])
+        correct += sum(1 for k in keywords if k in truth)
+        predicted += len(keywords)
+
+        precision = correct / predicted if predicted else 0.0
+        if precision >= target_precision:
+            best = {
+                'threshold': predictions[i]['confidence'],
+                'coverage': rank / len(order),
+                'precision': precision
+            }
+
+    return best
+
+def train_local_extractor() -> Dict:
+    """
+    Train the local keyword extractor from the fine-tuning dataset.
+
+    Returns:
+        Validation metrics (threshold, coverage, precision, sizes)
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.multiclass import OneVsRestClassifier
+    from sklearn.preprocessing import MultiLabelBinarizer
+
+    train_df, val_df = load_dataset_splits()
+    train_keywords = [normalize_keywords(k) for k in train_df['keywords']]
+    val_keywords = [normalize_keywords(k) for k in val_df['keywords']]
+
+    # Vocabulary: most frequent keywords in the training split
+    counts = Counter(k for keywords in train_keywords for k in keywords)
+    labels = [
+        k for k, n in counts.most_common(config.LOCAL_VOCAB_SIZE)
+        if n >= config.LOCAL_MIN_KEYWORD_COUNT
+    ]
+    if not labels:
+        raise ValueError("No keywords occur often enough to train the local extractor")
+    print(f"Training local extractor on {len(train_df)} transcripts, {len(labels)} keywords...")
+
+    binarizer = MultiLabelBinarizer(classes=labels)
+    label_set = set(labels)
+    targets = binarizer.fit_transform([[k for k in keywords if k in label_set] for keywords in train_keywords])
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=(1, 2),
+        min_df=2,
+        max_features=50000,
+        sublinear_tf=True,
+        stop_words='english'
+    )
+    features = vectorizer.fit_transform(train_df['transcription'])
+
+    classifier = OneVsRestClassifier(
+        LogisticRegression(solver='liblinear', C=10.0),
+        n_jobs=-1
+    )
+    classifier.fit(features, targets)
+
+    extractor = LocalKeywordExtractor({
+        'vectorizer': vectorizer,
+        'classifier': classifier,
+        'labels': labels,
+        'confidence_threshold': 1.01
+    })
+    predictions = extractor.predict_many(list(val_df['transcription']))
+    calibration = calibrate_threshold(predictions, val_keywords, config.LOCAL_TARGET_PRECISION)
+
+    metrics = {
+        'trained_at': datetime.now().isoformat(),
+        'train_size': len(train_df),
+        'validation_size': len(val_df),
+        'vocabulary_size': len(labels),
+        **calibration
+    }
+
+    bundle = {
+        'vectorizer': vectorizer,
+        'classifier': classifier,
+        'labels': labels,
+        'confidence_threshold': calibration['threshold'],
+        'metrics': metrics
+    }
+    partial_path = config.LOCAL_MODEL_PATH.with_suffix('.part')
+    with open(partial_path, 'wb') as f:
+        pickle.dump(bundle, f)
+    os.replace(partial_path, config.LOCAL_MODEL_PATH)
+
+    global _extractor
+    _extractor = LocalKeywordExtractor(bundle)
+
+    print(f"✓ Confidence threshold: {calibration['threshold']:.3f}")
+    print(f"✓ Validation coverage: {calibration['coverage']:.0%} of transcripts "
+          f"at {calibration['precision']:.0%} keyword precision")
+    print(f"✓ Saved to {config.LOCAL_MODEL_PATH}")
+
+    return metrics
+
+_extractor = None
+
+def get_local_extractor() -> Optional[LocalKeywordExtractor]:
+    """
+    Load the trained local extractor once per process.
+
+    Returns:
+        LocalKeywordExtractor, or None if disabled or not trained yet
+    """
+    global _extractor
+    if not config.LOCAL_EXTRACTOR_ENABLED or not config.LOCAL_MODEL_PATH.exists():
+        return None
+    if _extractor is None:
+        try:
+            with open(config.LOCAL_MODEL_PATH, 'rb') as f:
+                _extractor = LocalKeywordExtractor(pickle.load(f))
+        except (ImportError, pickle.UnpicklingError, EOFError, KeyError) as e:
+            print(f"⚠ Local keyword extractor unavailable: {e}")
+            return None
+    return _extractor
@@ -1,43 +1,277 @@
-import pandas as pd
 import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+import pandas as pd
 from . import config
 
+SYSTEM_PROMPT = "You are a medical transcription analyzer that extracts keywords and creates concise descriptions."
+TEXT_COLUMNS = ['transcription', 'keywords', 'description']
+
+# Roughly four characters per token for English text
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 30
+
+# Shingles hashed per batch (each costs 8 bytes per permutation)
+MINHASH_BATCH_SHINGLES = 2048
+
+# MinHash permutations: each is a random 64-bit seed XORed into the shingle
+# hash, followed by the splitmix64 finalizer (uint64 arithmetic wraps)
+_PERMUTATION_SEEDS = np.random.default_rng(1).integers(
+    0, np.iinfo(np.uint64).max, size=config.MINHASH_PERMUTATIONS, dtype=np.uint64, endpoint=True
+)
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, in place."""
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+def minhash_signatures(texts: Iterable[str]) -> np.ndarray:
+    """
+    MinHash signatures of each text's word shingles.
+
+    Words of all texts are hashed in one call and combined into shingle
+    hashes with array arithmetic; the per-permutation minimums are then
+    taken in batches of about MINHASH_BATCH_SHINGLES, which keeps the
+    working set in cache.
+
+    Returns:
+        uint32 array of shape (len(texts), MINHASH_PERMUTATIONS)
+    """
+    size = config.SHINGLE_WORDS
+    words, starts, counts = [], [], []
+    for text in texts:
+        text_words = text.split()
+        starts.append(len(words))
+        counts.append(max(len(text_words) - size + 1, 1))
+        # Padding keeps shingles from spanning two texts (and covers texts shorter than a shingle)
+        words.extend(text_words)
+        words.extend([''] * (size - 1))
+
+    if not starts:
+        return np.empty((0, config.MINHASH_PERMUTATIONS), dtype=np.uint32)
+
+    word_hashes = pd.util.hash_array(np.array(words, dtype=object))
+    positions = len(words) - size + 1
+    shingle_hashes = word_hashes[:positions].copy()
+    for offset in range(1, size):
+        shingle_hashes *= np.uint64(0x100000001B3)
+        shingle_hashes ^= word_hashes[offset:offset + positions]
+
+    counts = np.array(counts)
+    valid = np.concatenate([np.arange(start, start + count) for start, count in zip(starts, counts)])
+    shingle_hashes = shingle_hashes[valid]
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    signatures = np.empty((len(counts), config.MINHASH_PERMUTATIONS), dtype=np.uint32)
+    first = 0
+    while first < len(counts):
+        # Take texts until the batch holds MINHASH_BATCH_SHINGLES shingles (at least one text)
+        last = max(int(np.searchsorted(offsets, offsets[first] + MINHASH_BATCH_SHINGLES, side='right')) - 1, first + 1)
+        batch = _mix64(shingle_hashes[offsets[first]:offsets[last], None] ^ _PERMUTATION_SEEDS)
+        minimums = np.minimum.reduceat(batch, offsets[first:last] - offsets[first], axis=0)
+        signatures[first:last] = minimums >> np.uint64(32)
+        first = last
+
+    return signatures
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive index over MinHash signatures.
+
+    Signatures are split into bands; documents sharing any band are
+    candidates, and a candidate is a near duplicate if the share of equal
+    signature values (the estimated Jaccard similarity) reaches threshold.
+    """
+
+    def __init__(self, permutations: int, bands: int, threshold: float):
+        self.rows = permutations // bands
+        self.bands = bands
+        self.threshold = threshold
+        self._buckets: List[Dict[int, int]] = [{} for _ in range(bands)]
+        self._signatures = np.empty((1024, permutations), dtype=np.uint32)
+        self._count = 0
+
+    def add_if_new(self, signature: np.ndarray) -> bool:
+        """
+        Add a signature unless a near duplicate is already indexed.
+
+        Returns:
+            True if added, False if it is a near duplicate
+        """
+        keys = [hash(signature[b * self.rows:(b + 1) * self.rows].tobytes()) for b in range(self.bands)]
+
+        for bucket, key in zip(self._buckets, keys):
+            match = bucket.get(key)
+            if match is not None and np.mean(self._signatures[match] == signature) >= self.threshold:
+                return False
+
+        if self._count == len(self._signatures):
+            self._signatures = np.resize(self._signatures, (2 * self._count, self._signatures.shape[1]))
+        self._signatures[self._count] = signature
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, self._count)
+        self._count += 1
+        return True
+
+def _process_chunk(chunk: pd.DataFrame, serialize: bool) -> Dict:
+    """
+    Clean one CSV chunk and compute everything deduplication needs.
+
+    Runs in a worker process.
+
+    Returns:
+        dict with the cleaned rows, their content hashes and MinHash
+        signatures, optional JSONL lines, and per-filter drop counts
+    """
+    rows_read = len(chunk)
+    chunk = chunk.dropna(subset=TEXT_COLUMNS).copy()
+    for column in TEXT_COLUMNS:
+        chunk[column] = chunk[column].astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    chunk = chunk[(chunk[TEXT_COLUMNS] != '').all(axis=1)]
+    missing = rows_read - len(chunk)
+
+    tokens = (
+        chunk[TEXT_COLUMNS].apply(lambda column: column.str.len()).sum(axis=1) // CHARS_PER_TOKEN
+        + MESSAGE_OVERHEAD_TOKENS
+    )
+    in_range = tokens.between(config.MIN_EXAMPLE_TOKENS, config.MAX_EXAMPLE_TOKENS)
+    chunk = chunk[in_range].reset_index(drop=True)
+
+    normalized = chunk['transcription'].str.lower()
+    result = {
+        'rows': chunk,
+        'hashes': pd.util.hash_pandas_object(normalized, index=False).to_numpy(),
+        'signatures': minhash_signatures(normalized),
+        'rows_read': rows_read,
+        'missing': missing,
+        'out_of_range': int((~in_range).sum()),
+        'lines': None
+    }
+
+    if serialize:
+        # Only the variable parts go through json.dumps; the rest is constant
+        user = chunk['transcription'].map(json.dumps)
+        assistant = ('Keywords: ' + chunk['keywords'] + '\nDescription: ' + chunk['description']).map(json.dumps)
+        prefix = '{"messages": [{"role": "system", "content": ' + json.dumps(SYSTEM_PROMPT) + '}, {"role": "user", "content": '
+        result['lines'] = (prefix + user + '}, {"role": "assistant", "content": ' + assistant + '}]}\n').tolist()
+
+    return result
+
+def iter_dataset(serialize: bool = False, stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Stream the cleaned, de-duplicated dataset chunk by chunk.
+
+    The CSV is read DATASET_CHUNK_ROWS rows at a time and chunks are cleaned
+    on DATASET_WORKERS processes. Duplicates are removed in file order:
+    exact duplicates by normalized transcript hash, near duplicates by
+    MinHash similarity. Each row's split comes from its content hash, so it
+    is stable across rebuilds and independent of chunking.
+
+    Args:
+        serialize: Also build the fine-tuning JSONL line for each row
+        stats: Optional dict updated with row counts per filter
+
+    Yields:
+        dict with 'rows' (DataFrame with a 'split' column of 'train' or
+        'validation') and 'lines' (JSONL lines aligned with rows, or None)
+    """
+    stats = stats if stats is not None else {}
+    for key in ('rows_read', 'missing', 'out_of_range', 'exact_duplicates', 'near_duplicates', 'kept'):
+        stats.setdefault(key, 0)
+
+    seen = set()
+    near_index = NearDuplicateIndex(
+        config.MINHASH_PERMUTATIONS, config.MINHASH_BANDS, config.NEAR_DUPLICATE_THRESHOLD
+    )
+    reader = pd.read_csv(config.DATASET_CSV, usecols=TEXT_COLUMNS, dtype=str, chunksize=config.DATASET_CHUNK_ROWS)
+
+    def processed_chunks():
+        if config.DATASET_WORKERS <= 1:
+            for chunk in reader:
+                yield _process_chunk(chunk, serialize)
+            return
+        # Bounded look-ahead keeps memory flat however large the CSV is
+        with ProcessPoolExecutor(max_workers=config.DATASET_WORKERS) as pool:
+            pending = deque()
+            for chunk in reader:
+                pending.append(pool.submit(_process_chunk, chunk, serialize))
+                if len(pending) >= 2 * config.DATASET_WORKERS:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    for processed in processed_chunks():
+        for key in ('rows_read', 'missing', 'out_of_range'):
+            stats[key] += processed[key]
+
+        keep = []
+        for i, (content_hash, signature) in enumerate(zip(processed['hashes'], processed['signatures'])):
+            if content_hash in seen:
+                stats['exact_duplicates'] += 1
+                continue
+            seen.add(content_hash)
+            if not near_index.add_if_new(signature):
+                stats['near_duplicates'] += 1
+                continue
+            keep.append(i)
+        stats['kept'] += len(keep)
+
+        rows = processed['rows'].iloc[keep].reset_index(drop=True)
+        in_validation = processed['hashes'][keep] % 100 < round(config.VALIDATION_SHARE * 100)
+        rows['split'] = np.where(in_validation, 'validation', 'train')
+        lines = [processed['lines'][i] for i in keep] if serialize else None
+
+        yield {'rows': rows, 'lines': lines}
+
+def load_dataset_splits():
+    """
+    Load the cleaned dataset and split it into train and validation.
+
+    The same split is used for fine-tuning and for the local extractor.
+
+    Returns:
+        (train_df, val_df)
+    """
+    chunks = [chunk['rows'] for chunk in iter_dataset()]
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=TEXT_COLUMNS + ['split'])
+
+    train_df = df[df['split'] == 'train'].sample(frac=1, random_state=42)
+    val_df = df[df['split'] == 'validation'].sample(frac=1, random_state=42)
+    return train_df, val_df
+
 def prepare_dataset():
     """Convert CSV to JSONL format for fine-tuning."""
-    # Load dataset
-    df = pd.read_csv(config.DATASET_CSV)
-
-    # Filter valid rows (non-null required fields)
-    df_clean = df.dropna(subset=['transcription', 'keywords', 'description'])
-
-    # Shuffle and split 80/20
-    df_shuffled = df_clean.sample(frac=1, random_state=42)
-    split_idx = int(len(df_shuffled) * 0.8)
-    train_df = df_shuffled[:split_idx]
-    val_df = df_shuffled[split_idx:]
-
-    # Convert to JSONL
-    def create_training_example(row):
-        return {
-            "messages": [
-                {"role": "system", "content": "You are a medical transcription analyzer that extracts keywords and creates concise descriptions."},
-                {"role": "user", "content": row['transcription']},
-                {"role": "assistant", "content": f"Keywords: {row['keywords']}\nDescription: {row['description']}"}
-            ]
-        }
-
-    # Write training JSONL
-    with open(config.TRAINING_JSONL, 'w') as f:
-        for _, row in train_df.iterrows():
-            f.write(json.dumps(create_training_example(row)) + '\n')
-
-    # Write validation JSONL
-    with open(config.VALIDATION_JSONL, 'w') as f:
-        for _, row in val_df.iterrows():
-            f.write(json.dumps(create_training_example(row)) + '\n')
-
-    print(f"✓ Training examples: {len(train_df)}")
-    print(f"✓ Validation examples: {len(val_df)}")
+    start = time.monotonic()
+    stats = {}
+    train_count = val_count = 0
+
+    with open(config.TRAINING_JSONL, 'w') as train_file, open(config.VALIDATION_JSONL, 'w') as val_file:
+        for chunk in iter_dataset(serialize=True, stats=stats):
+            for split, line in zip(chunk['rows']['split'], chunk['lines']):
+                if split == 'train':
+                    train_file.write(line)
+                    train_count += 1
+                else:
+                    val_file.write(line)
+                    val_count += 1
+
+    elapsed = time.monotonic() - start
+    input_mb = config.DATASET_CSV.stat().st_size / (1024 * 1024)
+
+    print(f"✓ Training examples: {train_count}")
+    print(f"✓ Validation examples: {val_count}")
+    print(f"✓ Dropped: {stats['missing']} incomplete, {stats['out_of_range']} outside "
+          f"{config.MIN_EXAMPLE_TOKENS}-{config.MAX_EXAMPLE_TOKENS} tokens, "
+          f"{stats['exact_duplicates']} exact and {stats['near_duplicates']} near duplicates")
+    print(f"✓ Throughput: {stats['rows_read'] / elapsed:,.0f} rows/s, {input_mb / elapsed:.1f} MB/s "
+          f"({stats['rows_read']} rows in {elapsed:.2f}s)")
     print(f"✓ Saved to {config.OUTPUT_DIR}")
 
-    return len(train_df), len(val_df)
+    return train_count, val_count
@@ -1,10 +1,13 @@
 import json
 from datetime import datetime
-from anthropic import Anthropic
+from pathlib import Path
 from typing import Dict, List
 from . import config
 from .utils import get_current_iteration, get_component2_output, log_error
 from .pubmed_tool import search_pubmed, download_source_pdf
+from src.models.keyword_vocab import filter_keywords
+from src.models.model_router import get_router
+from src.models.session_artifacts import record_artifact, remove_artifacts
 
 def run_medical_rag(iteration: int = None, session_id: str = None) -> Dict:
     """
@@ -58,18 +61,11 @@ def run_medical_rag(iteration: int = None, session_id: str = None) -> Dict:
         print(f"Keywords: {', '.join(keywords[:5])}...")
         print()
 
-        # Initialize Anthropic client
-        client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
-
         # Step 1: Search PMC (PubMed Central) for open-access articles
         print("Searching PubMed Central (PMC) for open-access articles...")
 
-        # Filter out bad keywords (training artifacts)
-        clean_keywords = [
-            k for k in keywords
-            if len(k) < 50 and 'NOTE' not in k and 'transcribed' not in k.lower()
-            and '/' not in k and 'soap' not in k.lower() and 'chart' not in k.lower()
-        ]
+        # Validate keywords against the medical vocabulary (drops training artifacts)
+        clean_keywords = filter_keywords(keywords, fallback_text=description)
 
         # Use cleaned keywords or fall back to description terms
         if clean_keywords:
@@ -119,29 +115,17 @@ Return ONLY a JSON object with the selected source numbers:
     "reasoning": "Brief explanation of why these 3 were selected"
 }}"""
 
-        response = client.messages.create(
-            model=config.CLAUDE_MODEL,
-            max_tokens=3000,
-            temperature=1,  # Required when thinking is enabled
-            thinking={
-                "type": "enabled",
-                "budget_tokens": 1500
-            },
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
+        # Cheapest healthy model meeting the task's quality tier, with failover
+        response = get_router().complete(
+            'source_selection',
+            [{"role": "user", "content": user_prompt}]
         )
-
-        # Extract response
-        response_text = ""
-        for block in response.content:
-            if hasattr(block, 'text'):
-                response_text += block.text
+        response_text = response['text']
 
         # Parse JSON from response
         selection = extract_json_from_response(response_text)
 
-        print("✓ Agent selected sources")
+        print(f"✓ Agent selected sources ({response['model']})")
         print(f"  Selected: {selection['selected_sources']}")
         if 'reasoning' in selection:
             print(f"  Reasoning: {selection['reasoning'][:80]}...")
@@ -150,7 +134,10 @@ Return ONLY a JSON object with the selected source numbers:
         # Step 3: Download FULL PDFs from PMC for selected sources
         print("Downloading FULL-TEXT PDFs from PMC for selected sources...")
         downloaded_sources = []
-        for i, source_idx in enumerate(selection['selected_sources'][:3], 1):
+        if session_id:
+            # A re-run replaces the previous run's sources
+            remove_artifacts(session_id, 'source')
+        for i, source_idx in enumerate(selection['selected_sources'][:config.TOP_SOURCES_TO_DOWNLOAD], 1):
             if source_idx <= len(search_results):
                 source = search_results[source_idx - 1]
                 print(f"  Source {i} ({source.get('pmc_id', 'N/A')}): {source['title'][:50]}...")
@@ -164,6 +151,8 @@ Return ONLY a JSON object with the selected source numbers:
                 if result['success']:
                     content_type = "Full-text" if result.get('has_full_text') else "Abstract"
                     print(f"    ✓ {content_type} PDF created: {result['filename']}")
+                    if session_id:
+                        record_artifact(session_id, Path(result['filepath']), 'source', index=i)
                     downloaded_sources.append({
                         'source_number': i,
                         'pmid': source['pmid'],
@@ -180,7 +169,7 @@ Return ONLY a JSON object with the selected source numbers:
         if session_id:
             print(f"  Files saved to session: {session_id}")
         else:
-            print(f"  Files: {current_iteration}_3_1.pdf, {current_iteration}_3_2.pdf, {current_iteration}_3_3.pdf")
+            print(f"  Files: {', '.join(Path(src['pdf_path']).name for src in downloaded_sources)}")
         print()
 
         # Save metadata for Component 4
@@ -190,6 +179,7 @@ Return ONLY a JSON object with the selected source numbers:
             'search_query': query,
             'total_results': len(search_results),
             'selected_sources': selection['selected_sources'],
+            'selection_model': response['model'],
             'downloaded_sources': downloaded_sources
         }
 
@@ -202,6 +192,8 @@ Return ONLY a JSON object with the selected source numbers:
 
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
+        if session_id:
+            record_artifact(session_id, metadata_path, 'source_metadata')
 
         # Return results
         result = {
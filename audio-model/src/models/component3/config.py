@@ -6,7 +6,7 @@ load_dotenv()
 
 # API Configuration
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
-CLAUDE_MODEL = 'claude-opus-4-20250514'  # Claude 4 Opus
+# Source selection model: routed by src/models/model_router.py (task 'source_selection')
 
 # Agent Settings
 ADAPTIVE_THINKING = True
@@ -20,7 +20,6 @@ TOP_SOURCES_TO_DOWNLOAD = 3  # Download PDFs for top 3 selected
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'components' / 'component3'
-ITERATION_TRACKER = PROJECT_ROOT / 'data' / 'components' / 'iteration_tracker.txt'
 ERROR_LOG = PROJECT_ROOT / 'logs' / 'errors.log'
 
 # Component 2 input
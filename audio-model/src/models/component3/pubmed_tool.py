@@ -3,6 +3,7 @@ from metapub.exceptions import MetaPubError
 from pathlib import Path
 import json
 from typing import List, Dict, Optional
+from src.models.blob_store import detach
 from . import config
 
 def search_pubmed(query: str, max_results: int = 10) -> List[Dict]:
@@ -139,6 +140,7 @@ def download_source_pdf(
 
         filename = f"source_{source_number}.pdf" if isinstance(iteration, str) and len(iteration) > 10 else f"{iteration}_3_{source_number}.pdf"
         filepath = output_dir / filename
+        detach(filepath)  # may be shared with other sessions via the blob store
 
         # Generate a comprehensive PDF with all article information
         from reportlab.lib.pagesizes import letter
@@ -1,16 +1,6 @@
 from datetime import datetime
 from . import config
-
-def get_current_iteration() -> int:
-    """Read global iteration from tracker file."""
-    try:
-        with open(config.ITERATION_TRACKER, 'r') as f:
-            content = f.read().strip()
-            if '=' in content:
-                return int(content.split('=')[1])
-            return 0
-    except (FileNotFoundError, ValueError):
-        return 0
+from src.models.iteration_tracker import get_current_iteration
 
 def get_component2_output(iteration: int):
     """Get Component 2 output file path for current iteration."""
@@ -6,13 +6,15 @@ load_dotenv()
 
 # API Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-MODEL = 'gpt-4o'  # GPT-4o for chain-of-thought reasoning
+# Chain-of-thought model: routed by src/models/model_router.py (task 'cot_summary')
+
+# Output Settings
+SAVE_HIGHLIGHTED_PDFS = True  # Also write highlighted sources to disk (they always go into the zip)
 
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'components' / 'component4'
 FINAL_OUTPUT_DIR = PROJECT_ROOT / 'output'
-ITERATION_TRACKER = PROJECT_ROOT / 'data' / 'components' / 'iteration_tracker.txt'
 ERROR_LOG = PROJECT_ROOT / 'logs' / 'errors.log'
 
 # Component 2 and 3 input directories
@@ -1,30 +1,56 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from openai import OpenAI
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from . import config
+from src.models.model_router import get_router
 from .utils import (
     get_current_iteration,
-    increment_and_save_iteration,
     get_component2_output,
     get_component3_sources,
     log_error
 )
-from .pdf_processor import extract_text_from_pdf, extract_source_pdfs_text
+from .pdf_processor import segment_pdf_sentences, format_sentences_for_prompt
 from .pdf_generator import generate_final_summary_pdf
-from .pdf_highlighter import highlight_source_pdfs
+from .pdf_highlighter import (
+    highlight_pdf_passages,
+    highlight_pdf_sentences,
+    get_highlighted_output_path
+)
+from .stream_parser import IncrementalJSONParser
 from .zip_handler import create_final_zip
+from src.models.keyword_vocab import filter_keywords
+from src.models.iteration_tracker import advance_iteration
+from src.models.session_artifacts import artifact_key, artifact_paths, record_artifact, remove_artifacts
+
+# Analysis fields needed to render the summary PDF
+SUMMARY_FIELDS = (
+    'keywords',
+    'transcript_summary',
+    'patient_summary',
+    'soap',
+    'healthcare_fields',
+    'devices',
+    'urgency'
+)
 
-def run_cot_summarizer(iteration: int = None, session_id: str = None) -> Dict:
+def run_cot_summarizer(
+    iteration: int = None,
+    session_id: str = None,
+    analysis_output: Optional[Tuple[str, str]] = None
+) -> Dict:
     """
     Run Component 4: Chain-of-Thought AI Agent Summarizer.
 
-    Uses o1-mini model with chain-of-thought to create final patient summary.
+    Uses the routed chain-of-thought model (see model_router) to create final patient summary.
 
     Args:
         iteration: Iteration number (for CLI mode)
         session_id: Session ID (for API mode)
+        analysis_output: (response text, model) for the prompt from
+            prepare_cot_prompt, already obtained in a batch; the model is
+            not called
 
     Returns:
         dict: Results including paths to generated files
@@ -34,6 +60,10 @@ def run_cot_summarizer(iteration: int = None, session_id: str = None) -> Dict:
         if session_id:
             # API mode: session-based
             from src.models.session_manager import get_session_path
+            from src.models.retention import thaw_if_cold
+
+            # Inputs of a session in the retention cold tier are compressed
+            thaw_if_cold(session_id)
 
             comp2_path = get_session_path(session_id, component=2) / 'keywords.json'
             output_dir = get_session_path(session_id, component=4)
@@ -63,11 +93,8 @@ def run_cot_summarizer(iteration: int = None, session_id: str = None) -> Dict:
         keywords = comp2_data['keywords']
         description = comp2_data['description']
 
-        # Filter out junk keywords
-        clean_keywords = [
-            k for k in keywords
-            if len(k) < 50 and 'NOTE' not in k and 'transcribed' not in k.lower()
-        ]
+        # Validate keywords against the medical vocabulary (drops training artifacts)
+        clean_keywords = filter_keywords(keywords, fallback_text=description)
 
         print(f"✓ Keywords: {', '.join(clean_keywords[:5])}...")
         print()
@@ -75,20 +102,10 @@ def run_cot_summarizer(iteration: int = None, session_id: str = None) -> Dict:
         # Step 2: Load Component 3 source PDFs
         print("Loading Component 3 source PDFs...")
         if session_id:
-            # Session mode: read from session directory
+            # Session mode: sources recorded by Component 3 in the session manifest
             metadata_path = get_session_path(session_id, component=3) / 'metadata.json'
-            comp3_dir = get_session_path(session_id, component=3)
-            print(f"  Checking directory: {comp3_dir}")
-            print(f"  Directory exists: {comp3_dir.exists()}")
-            if comp3_dir.exists():
-                all_files = list(comp3_dir.glob('*'))
-                print(f"  Files in directory: {[f.name for f in all_files]}")
-            source_paths = []
-            for i in range(1, 10):  # Check for up to 9 sources
-                source_path = comp3_dir / f'source_{i}.pdf'
-                print(f"  Checking: {source_path.name} - exists: {source_path.exists()}")
-                if source_path.exists():
-                    source_paths.append(source_path)
+            source_paths = artifact_paths(session_id, 'source')
+            print(f"  Sources in manifest: {[p.name for p in source_paths]}")
             if not source_paths:
                 print("⚠ WARNING: No sources found from Component 3")
                 print("  Will create summary based only on keywords and clinical knowledge")
@@ -99,38 +116,270 @@ def run_cot_summarizer(iteration: int = None, session_id: str = None) -> Dict:
             # CLI mode: use existing utility function
             metadata_path, source_paths = get_component3_sources(current_iteration)
 
-        # Extract text from source PDFs (if any exist)
+        # Segment source PDFs into numbered sentences (if any exist)
         if source_paths:
-            sources_text = extract_source_pdfs_text(source_paths)
+            # Each source is read once; its bytes feed segmentation,
+            # highlighting and the zip without touching the file again
+            source_data = {
+                i: path.read_bytes()
+                for i, path in enumerate(source_paths, 1)
+            }
+            source_sentences = {
+                i: segment_pdf_sentences(source_data[i])
+                for i in source_data
+            }
             print(f"✓ Loaded {len(source_paths)} source PDFs")
-            for i, source_path in enumerate(source_paths, 1):
-                text_len = len(sources_text[i])
-                print(f"  Source {i}: {text_len} characters")
+            for i in range(1, len(source_paths) + 1):
+                print(f"  Source {i}: {len(source_sentences[i])} sentences")
             print()
         else:
-            sources_text = {}
+            source_data = {}
+            source_sentences = {}
             print("✓ No source PDFs to load")
             print()
 
-        # Step 3: Run Chain-of-Thought with o1-mini
-        print("Running Chain-of-Thought analysis with o1-mini...")
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
+        # Step 3: Run Chain-of-Thought analysis
+        print("Running Chain-of-Thought analysis...")
 
-        # Combine all source texts (limit to prevent token overflow)
-        combined_sources = ""
-        if source_paths:
-            for i in range(1, len(source_paths) + 1):
-                combined_sources += f"\n\n=== SOURCE {i} ===\n"
-                combined_sources += sources_text[i][:5000]  # Limit each source to 5k chars
-                if len(sources_text[i]) > 5000:
-                    combined_sources += "\n[...truncated...]"
+        prompt = build_cot_prompt(clean_keywords, description, source_sentences)
+
+        if session_id:
+            summary_pdf_path = output_dir / 'summary.pdf'
         else:
-            combined_sources = "\n\nNo research articles available. Base analysis on clinical knowledge and symptoms."
+            summary_pdf_path = config.OUTPUT_DIR / f"{current_iteration}_4_output.pdf"
+
+        # PDF work starts while the model is still generating: the summary PDF
+        # is rendered once every summary field has closed in the stream, and
+        # each source is highlighted once its highlight list has closed.
+        # PyMuPDF is not thread-safe, so all PDF jobs share one worker thread.
+        pdf_executor = ThreadPoolExecutor(max_workers=1)
+        streamed_fields = {}
+        summary_job = None
+        highlight_jobs = {}
+        total_ai_highlights = 0
+
+        def submit_summary(fields: Dict):
+            return pdf_executor.submit(
+                generate_final_summary_pdf,
+                iteration=current_iteration,
+                keywords=fields['keywords'],
+                transcript_summary=fields['transcript_summary'],
+                patient_summary=fields['patient_summary'],
+                soap=fields['soap'],
+                healthcare_fields=fields['healthcare_fields'],
+                devices=fields['devices'],
+                urgency=fields['urgency'],
+                output_path=summary_pdf_path
+            )
+
+        def submit_highlight(source_number: int, selection: List):
+            source_path = source_paths[source_number - 1]
+            output_path = None
+            if config.SAVE_HIGHLIGHTED_PDFS:
+                output_path = get_highlighted_output_path(output_dir, current_iteration, source_number)
+            print(f"    Highlighting source {source_number}: {source_path.name}")
+
+            # Sentence IDs map straight to positions; anything else (keyword
+            # fallbacks, or quotes from a model ignoring the protocol) is searched
+            sentence_ids = parse_sentence_ids(selection)
+            if sentence_ids is not None:
+                job = pdf_executor.submit(
+                    highlight_pdf_sentences, source_data[source_number], output_path,
+                    source_sentences[source_number], sentence_ids
+                )
+            else:
+                job = pdf_executor.submit(
+                    highlight_pdf_passages, source_data[source_number], output_path, selection
+                )
+            highlight_jobs[source_number] = job
+
+        def on_field(path: Tuple[str, ...], value):
+            nonlocal summary_job, total_ai_highlights
+            if len(path) == 1:
+                streamed_fields[path[0]] = value
+                if summary_job is None and all(f in streamed_fields for f in SUMMARY_FIELDS):
+                    print("  → Summary fields complete, rendering summary PDF in background")
+                    summary_job = submit_summary(streamed_fields)
+            elif path[0] == 'highlights':
+                source_number = parse_source_key(path[1])
+                if (source_number and source_number <= len(source_paths)
+                        and source_number not in highlight_jobs
+                        and isinstance(value, list) and value):
+                    print(f"      AI selected {len(value)} sentences for source {source_number}")
+                    total_ai_highlights += len(value)
+                    submit_highlight(source_number, value)
+
+        try:
+            if analysis_output:
+                analysis = parse_analysis(analysis_output[0])
+                analysis_model = analysis_output[1]
+            else:
+                analysis, analysis_model = stream_analysis(prompt, on_field=on_field)
+
+            print(f"✓ Chain-of-Thought analysis complete ({analysis_model})")
+            print()
+
+            # Step 4: Generate final summary PDF
+            print("Generating final summary PDF...")
+            if summary_job is None:
+                summary_job = submit_summary(analysis)
+            summary_job.result()
+
+            print(f"✓ Summary PDF: {summary_pdf_path.name}")
+            print()
+            if session_id:
+                record_artifact(session_id, summary_pdf_path, 'summary')
+
+            # Step 5: Create highlighted source PDFs
+            if source_paths:
+                print("Creating highlighted source PDFs...")
+
+                # Sources whose highlights never closed in the stream (with
+                # fallback to keywords if not present)
+                highlights_dict = analysis.get('highlights', {})
+
+                for i in range(1, len(source_paths) + 1):
+                    if i in highlight_jobs:
+                        continue
+
+                    source_highlights = highlights_dict.get(f"source_{i}", [])
+
+                    # Log AI-selected highlights
+                    if source_highlights:
+                        print(f"      AI selected {len(source_highlights)} sentences for source {i}")
+                        total_ai_highlights += len(source_highlights)
+
+                    # Fallback to keywords if no highlights provided
+                    if not source_highlights:
+                        source_highlights = [kw for kw in clean_keywords[:5] if len(kw) > 3]
+                        print(f"      Using {len(source_highlights)} keyword-based fallbacks for source {i}")
+
+                    submit_highlight(i, source_highlights)
+
+                if total_ai_highlights > 0:
+                    print(f"    → Total AI-selected sentences: {total_ai_highlights}")
+                else:
+                    print(f"    → No AI passages found, using keyword fallback")
+
+                # Highlighted PDFs go to the zip as bytes
+                highlighted_entries = []
+                for i in range(1, len(source_paths) + 1):
+                    path = get_highlighted_output_path(output_dir, current_iteration, i)
+                    highlighted_entries.append((path.name, highlight_jobs[i].result()))
+
+                print(f"✓ Created {len(highlighted_entries)} highlighted source PDFs")
+                print()
+            else:
+                print("⚠ No sources to highlight (Component 3 found 0 relevant articles)")
+                highlighted_entries = []
+                print()
+        finally:
+            pdf_executor.shutdown(wait=True)
+
+        # Step 6: Create final ZIP
+        print("Creating final ZIP file...")
+        if session_id:
+            zip_path = output_dir / 'final.zip'
+        else:
+            zip_path = config.FINAL_OUTPUT_DIR / f"{current_iteration}_final.zip"
 
-        # Create prompt for GPT-4o with chain-of-thought
-        num_sources = len(source_paths)
+        # In session mode the zip is also streamed to the storage backend
+        zip_upload = None
+        if session_id:
+            from src.models.session_manager import open_artifact_upload
+            zip_upload = open_artifact_upload(session_id, 'component4/final.zip', 'application/zip')
+
+        create_final_zip(
+            summary_pdf=summary_pdf_path,
+            highlighted_sources=highlighted_entries,
+            output_zip=zip_path,
+            upload=zip_upload
+        )
+
+        # Highlighted PDFs on disk (only when saving them is enabled)
+        highlighted_sources = []
+        if config.SAVE_HIGHLIGHTED_PDFS:
+            highlighted_sources = [
+                get_highlighted_output_path(output_dir, current_iteration, i)
+                for i in range(1, len(highlighted_entries) + 1)
+            ]
+
+        if session_id:
+            remove_artifacts(session_id, 'highlighted_source')
+            for i, path in enumerate(highlighted_sources, 1):
+                record_artifact(session_id, path, 'highlighted_source', index=i)
+            record_artifact(session_id, zip_path, 'final_zip', key=artifact_key(session_id, 'component4/final.zip'))
+
+        print(f"✓ ZIP file: {zip_path}")
+        print()
 
-        prompt = f"""You are a doctor evaluating a patient based on keywords, symptoms, and medical research.
+        # Step 7: Move the iteration tracker past this iteration (a no-op when
+        # run_pipeline.py reserved it). ONLY in CLI mode - session mode doesn't
+        # use iteration tracker
+        new_iteration = None
+        if not session_id:
+            new_iteration = advance_iteration(current_iteration)
+
+        print("=" * 60)
+        print("✓ COMPONENT 4 COMPLETE")
+        print("=" * 60)
+        print(f"Summary PDF: {summary_pdf_path.name}")
+        highlighted_names = ", ".join([name for name, _ in highlighted_entries])
+        print(f"Highlighted sources ({len(highlighted_entries)}): {highlighted_names}")
+        print(f"Final ZIP: {zip_path.name}")
+        if new_iteration:
+            print(f"Next iteration: {new_iteration}")
+        print()
+
+        # Return results
+        result = {
+            'component': 4,
+            'timestamp': datetime.now().isoformat(),
+            'summary_pdf': str(summary_pdf_path),
+            'highlighted_sources': [str(p) for p in highlighted_sources],
+            'final_zip': str(zip_path),
+            'analysis': analysis,
+            'model': analysis_model
+        }
+
+        if session_id:
+            result['session_id'] = session_id
+        else:
+            result['iteration'] = current_iteration
+            result['next_iteration'] = new_iteration
+
+        return result
+
+    except Exception as e:
+        error_msg = f"CoT Summarizer failed: {str(e)}"
+        log_error(4, error_msg)
+        raise
+
+def build_cot_prompt(clean_keywords: List[str], description: str, source_sentences: Dict[int, List]) -> str:
+    """
+    Build the chain-of-thought evaluation prompt.
+
+    Args:
+        clean_keywords: Validated keywords from Component 2
+        description: Description from Component 2
+        source_sentences: Numbered sentences per source (1-based)
+
+    Returns:
+        Prompt text
+    """
+    # Combine all numbered source sentences (limit to prevent token overflow)
+    combined_sources = ""
+    if source_sentences:
+        for i in range(1, len(source_sentences) + 1):
+            combined_sources += f"\n\n=== SOURCE {i} ===\n"
+            combined_sources += format_sentences_for_prompt(source_sentences[i], max_chars=5000)
+    else:
+        combined_sources = "\n\nNo research articles available. Base analysis on clinical knowledge and symptoms."
+
+    # Create chain-of-thought prompt
+    num_sources = len(source_sentences)
+
+    prompt = f"""You are a doctor evaluating a patient based on keywords, symptoms, and medical research.
 
 PATIENT INFORMATION:
 Keywords: {', '.join(clean_keywords[:10])}
@@ -172,17 +421,15 @@ IMPORTANT GUIDELINES:
 - Be medically accurate but accessible
 - Write in a professional clinical tone
 
-8. HIGHLIGHTS FOR SOURCE PDFs: For each source, identify 6-10 text passages that appear EXACTLY as written in the source (word-for-word quotes, 8-25 words each) that provide educational value. MANDATORY: You MUST include highlights from EARLY, MIDDLE, AND LATE sections of each document. These will be highlighted in yellow in the final PDFs.
+8. HIGHLIGHTS FOR SOURCE PDFs: Each source above is split into numbered sentences, written as "[12] sentence text". For each source, select 6-10 sentence numbers whose sentences provide educational value. These sentences will be highlighted in yellow in the final PDFs.
 
 CRITICAL REQUIREMENTS:
-- You MUST copy the exact text word-for-word from the sources
-- Do NOT paraphrase, rephrase, or create new sentences
-- Do NOT generate medical phrases that aren't in the source
-- Each highlight must be a verbatim quote that appears in the source document
-- If you can't find exact relevant text, look for related general medical concepts
+- Return ONLY sentence numbers (integers) for highlights - do NOT copy any sentence text
+- Only use numbers that appear in brackets in that source
+- Sentence numbers restart at 1 for each source
 
 HIGHLIGHTING PHILOSOPHY:
-Your goal is to highlight passages from the sources that educate the reader about:
+Your goal is to highlight sentences from the sources that educate the reader about:
 - Pathophysiology, mechanisms, and biological processes
 - Clinical reasoning, diagnostic approaches, and differential diagnosis
 - Treatment principles, therapeutic approaches, and clinical management
@@ -191,57 +438,19 @@ Your goal is to highlight passages from the sources that educate the reader abou
 - Even tangentially related content has educational value
 
 HIGHLIGHTING GUIDELINES:
-- Copy EXACT VERBATIM TEXT from the sources (8-25 words)
-- Select complete phrases/sentences that convey medical concepts
-- DO NOT highlight single words - highlight phrases that contain those words in context
-- Look for phrases containing medical information: causes, mechanisms, symptoms, diagnoses, treatments
+- Select sentences that convey complete medical concepts
+- Skip headings, citations, author lists, and figure or table captions
 - Aim for 6-10 highlights per source for comprehensive coverage
-- CRITICAL: Distribute highlights THROUGHOUT the entire document - find highlights in early pages, middle pages, AND later pages
-- Do NOT cluster all highlights at the beginning - spread them across the full document
 - Prioritize: pathophysiology, clinical findings, diagnostic methods, treatment approaches, complications
 
-WHAT TO LOOK FOR IN SOURCES (find exact text about):
-- Disease mechanisms and biological processes
-- Clinical presentations and symptom patterns
-- Diagnostic criteria and testing approaches
-- Treatment options and therapeutic strategies
-- Risk factors and complications
-- Patient assessment and monitoring methods
-- General medical principles and clinical reasoning
-- Results, discussion, and conclusion sections often contain valuable insights
-- Even if source topic differs, find relevant general medical content
-
 DISTRIBUTION STRATEGY (CRITICAL):
-You MUST distribute highlights across the ENTIRE document. Follow this mandatory approach:
-
-1. Divide each source into THREE sections: Early (first 1/3), Middle (middle 1/3), Late (last 1/3)
-2. Select AT LEAST 2 highlights from EARLY section (introduction, background, methods)
-3. Select AT LEAST 2 highlights from MIDDLE section (results, findings, data)
-4. Select AT LEAST 2 highlights from LATE section (discussion, conclusions, implications)
-5. For a 10-page source: find highlights on pages 1-3, pages 4-7, AND pages 8-10
-6. For a 5-page source: find highlights on pages 1-2, page 3, AND pages 4-5
+Sentence numbers increase through each document, so spread your selection across the whole numbered range of each source:
+- First third of the numbers (introduction, background, methods): 2-3 highlights
+- Middle third (results, findings, data): 2-3 highlights
+- Last third (discussion, conclusions, implications): 2-4 highlights
 
 DO NOT cluster all highlights at the beginning. Readers need educational content from throughout the paper, especially conclusions and clinical implications which appear at the END.
 
-REQUIRED MINIMUM DISTRIBUTION:
-- Pages 1-33% of document: 2-3 highlights
-- Pages 34-66% of document: 2-3 highlights
-- Pages 67-100% of document: 2-4 highlights
-
-GOOD HIGHLIGHTS (showing proper distribution):
-✓ FROM EARLY PAGES (introduction/background):
-  "clinical assessment should include evaluation of vital signs and physical examination findings"
-✓ FROM MIDDLE PAGES (methods/results):
-  "laboratory testing revealed elevated white blood cell count in 78 percent of cases"
-✓ FROM LATE PAGES (discussion/conclusion):
-  "these findings suggest that early intervention improves patient outcomes significantly"
-
-BAD HIGHLIGHTS:
-✗ ALL from pages 1-2 only (must distribute throughout)
-✗ Single words: "fever", "infection", "treatment"
-✗ Invented phrases not in source: "prolonged fever indicates bacteremia" (if not exact quote)
-✗ Ignoring late sections of the paper
-
 Provide your analysis in JSON format:
 {{
   "keywords": ["keyword1", "keyword2", ...],
@@ -265,165 +474,98 @@ Provide your analysis in JSON format:
     "recommended_action": "Timeframe and next steps"
   }},
   "highlights": {{
-    "source_1": [
-      "exact verbatim phrase from early in source 1 about pathophysiology or mechanism",
-      "exact verbatim phrase from middle of source 1 about clinical findings or diagnosis",
-      "exact verbatim phrase from later in source 1 about treatment or outcomes"
-    ],
-    "source_2": [
-      "exact verbatim phrase from source 2 methods or background section",
-      "exact verbatim phrase from source 2 results or discussion section"
-    ]
+    "source_1": [4, 11, 19, 27, 36, 44],
+    "source_2": [2, 9, 18, 30, 41]
   }}
 }}"""
 
-        # Call o1-mini (note: o1 models don't use system messages)
-        response = client.chat.completions.create(
-            model=config.MODEL,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+    return prompt
 
-        # Extract response
-        response_text = response.choices[0].message.content
+def prepare_cot_prompt(session_id: str) -> str:
+    """
+    Build the prompt run_cot_summarizer would send for a session, without
+    calling the model (used to submit it as part of a batch).
+    """
+    from src.models.session_manager import get_session_path
+    from src.models.retention import thaw_if_cold
 
-        # Parse JSON from response
-        analysis = extract_json_from_response(response_text)
+    thaw_if_cold(session_id)
+    with open(get_session_path(session_id, component=2) / 'keywords.json', 'r') as f:
+        comp2_data = json.load(f)
+    clean_keywords = filter_keywords(comp2_data['keywords'], fallback_text=comp2_data['description'])
 
-        print("✓ Chain-of-Thought analysis complete")
-        print()
+    source_sentences = {
+        i: segment_pdf_sentences(path.read_bytes())
+        for i, path in enumerate(artifact_paths(session_id, 'source'), 1)
+    }
 
-        # Step 4: Generate final summary PDF
-        print("Generating final summary PDF...")
-        if session_id:
-            summary_pdf_path = output_dir / 'summary.pdf'
-        else:
-            summary_pdf_path = config.OUTPUT_DIR / f"{current_iteration}_4_output.pdf"
+    return build_cot_prompt(clean_keywords, comp2_data['description'], source_sentences)
 
-        generate_final_summary_pdf(
-            iteration=current_iteration,
-            keywords=analysis['keywords'],
-            transcript_summary=analysis['transcript_summary'],
-            patient_summary=analysis['patient_summary'],
-            soap=analysis['soap'],
-            healthcare_fields=analysis['healthcare_fields'],
-            devices=analysis['devices'],
-            urgency=analysis['urgency'],
-            output_path=summary_pdf_path
-        )
+def parse_analysis(text: str) -> Dict:
+    """Parse a complete chain-of-thought answer into the analysis dictionary."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    if parser.value is not None:
+        return parser.value
+    return extract_json_from_response(text)
 
-        print(f"✓ Summary PDF: {summary_pdf_path.name}")
-        print()
+def stream_analysis(
+    prompt: str,
+    on_field: Optional[Callable[[Tuple[str, ...], object], None]] = None
+) -> Tuple[Dict, str]:
+    """
+    Stream the chain-of-thought completion and parse it incrementally.
 
-        # Step 5: Create highlighted source PDFs
-        if source_paths:
-            print("Creating highlighted source PDFs...")
+    Args:
+        prompt: Full evaluation prompt
+        on_field: Called with (key_path, value) as each field of the JSON
+            answer closes, while the rest is still being generated
 
-            # Extract highlights from analysis (with fallback to keywords if not present)
-            highlights_dict = analysis.get('highlights', {})
-            highlights_per_source = []
-            total_ai_highlights = 0
+    Returns:
+        (parsed analysis dictionary, model that produced it)
+    """
+    parser = IncrementalJSONParser(on_field)
 
-            for i in range(1, len(source_paths) + 1):
-                source_key = f"source_{i}"
-                source_highlights = highlights_dict.get(source_key, [])
-
-                # Log AI-selected highlights
-                if source_highlights:
-                    print(f"      AI selected {len(source_highlights)} passages for source {i}")
-                    total_ai_highlights += len(source_highlights)
-
-                # Fallback to keywords if no highlights provided
-                # Convert keywords to longer search phrases for better matching
-                if not source_highlights:
-                    # Create phrase-based searches from keywords
-                    keyword_phrases = []
-                    for kw in clean_keywords[:5]:
-                        # Expand keywords into searchable medical phrases
-                        if len(kw) > 3:
-                            keyword_phrases.append(kw)  # Use keyword directly for now
-                    source_highlights = keyword_phrases
-                    print(f"      Using {len(source_highlights)} keyword-based fallbacks for source {i}")
-
-                highlights_per_source.append(source_highlights)
-
-            if total_ai_highlights > 0:
-                print(f"    → Total AI-selected passages: {total_ai_highlights}")
-            else:
-                print(f"    → No AI passages found, using keyword fallback")
+    # The whole prompt goes in as a single user message
+    model, deltas = get_router().stream(
+        'cot_summary',
+        [{"role": "user", "content": prompt}]
+    )
 
-            highlighted_sources = highlight_source_pdfs(
-                source_paths=source_paths,
-                output_dir=output_dir,
-                iteration=current_iteration,
-                highlights_per_source=highlights_per_source
-            )
+    for delta in deltas:
+        parser.feed(delta)
 
-            print(f"✓ Created {len(highlighted_sources)} highlighted source PDFs")
-            print()
-        else:
-            print("⚠ No sources to highlight (Component 3 found 0 relevant articles)")
-            highlighted_sources = []
-            print()
+    if parser.value is not None:
+        return parser.value, model
 
-        # Step 6: Create final ZIP
-        print("Creating final ZIP file...")
-        if session_id:
-            zip_path = output_dir / 'final.zip'
-        else:
-            zip_path = config.FINAL_OUTPUT_DIR / f"{current_iteration}_final.zip"
-
-        create_final_zip(
-            summary_pdf=summary_pdf_path,
-            highlighted_sources=highlighted_sources,
-            output_zip=zip_path
-        )
+    # Stream was not a clean JSON object; fall back to regex extraction
+    return extract_json_from_response(parser.text), model
 
-        print(f"✓ ZIP file: {zip_path}")
-        print()
-
-        # Step 7: Increment iteration tracker (Component 4's responsibility!)
-        # ONLY in CLI mode - session mode doesn't use iteration tracker
-        new_iteration = None
-        if not session_id:
-            print("Incrementing iteration tracker...")
-            new_iteration = increment_and_save_iteration()
-            print()
+def parse_source_key(key: str) -> Optional[int]:
+    """Parse a highlights key like 'source_2' into its 1-based source number."""
+    prefix, _, number = key.partition('_')
+    if prefix == 'source' and number.isdigit():
+        return int(number)
+    return None
 
-        print("=" * 60)
-        print("✓ COMPONENT 4 COMPLETE")
-        print("=" * 60)
-        print(f"Summary PDF: {summary_pdf_path.name}")
-        highlighted_names = ", ".join([p.name for p in highlighted_sources])
-        print(f"Highlighted sources ({len(highlighted_sources)}): {highlighted_names}")
-        print(f"Final ZIP: {zip_path.name}")
-        if new_iteration:
-            print(f"Next iteration: {new_iteration}")
-        print()
-
-        # Return results
-        result = {
-            'component': 4,
-            'timestamp': datetime.now().isoformat(),
-            'summary_pdf': str(summary_pdf_path),
-            'highlighted_sources': [str(p) for p in highlighted_sources],
-            'final_zip': str(zip_path),
-            'analysis': analysis
-        }
+def parse_sentence_ids(selection: List) -> Optional[List[int]]:
+    """
+    Interpret a highlight selection as sentence IDs.
 
-        if session_id:
-            result['session_id'] = session_id
+    Returns:
+        List of integer IDs, or None if any item is not an ID
+    """
+    ids = []
+    for item in selection:
+        if isinstance(item, bool):
+            return None
+        if isinstance(item, int):
+            ids.append(item)
+        elif isinstance(item, str) and item.strip().isdigit():
+            ids.append(int(item.strip()))
         else:
-            result['iteration'] = current_iteration
-            result['next_iteration'] = new_iteration
-
-        return result
-
-    except Exception as e:
-        error_msg = f"CoT Summarizer failed: {str(e)}"
-        log_error(4, error_msg)
-        raise
+            return None
+    return ids
 
 def extract_json_from_response(text: str) -> Dict:
     """Extract JSON object from model response."""
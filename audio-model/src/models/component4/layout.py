@@ -0,0 +1,196 @@
+import re
+import fitz  # PyMuPDF
+from functools import lru_cache
+from typing import List, Tuple
+
+# Sentence ending: terminal punctuation plus closing quotes/brackets, before whitespace or end
+SENTENCE_END = re.compile(r'[.!?]["\'\)\]]*(?=\s|$)')
+
+WORD = re.compile(r'\S+')
+
+@lru_cache(maxsize=None)
+def get_font(fontname: str = "helv") -> fitz.Font:
+    """Load a font once per process (base-14 names such as 'helv', 'hebo')."""
+    return fitz.Font(fontname)
+
+def measure(text: str, fontsize: float, fontname: str = "helv") -> float:
+    """Width of text in points, using real font metrics."""
+    return get_font(fontname).text_length(text, fontsize=fontsize)
+
+def wrap_text(text: str, width: float, fontsize: float, fontname: str = "helv") -> List[Tuple[str, int, int]]:
+    """
+    Greedily wrap text into lines that fit within width.
+
+    Explicit newlines start a new line; blank lines are kept. Words wider
+    than the whole line are broken at character level.
+
+    Args:
+        text: Text to wrap
+        width: Available line width in points
+        fontsize: Font size in points
+        fontname: Font name
+
+    Returns:
+        List of (line_text, start, end) with character offsets into text
+    """
+    font = get_font(fontname)
+    space = font.text_length(' ', fontsize=fontsize)
+    lines = []
+
+    paragraph_start = 0
+    for paragraph in text.split('\n'):
+        words = list(WORD.finditer(paragraph))
+        if not words:
+            lines.append(('', paragraph_start, paragraph_start))
+
+        line_words = []
+        line_width = 0.0
+        for match in words:
+            word = match.group()
+            start = paragraph_start + match.start()
+            word_width = font.text_length(word, fontsize=fontsize)
+
+            if line_words and line_width + space + word_width > width:
+                lines.append(_join_line(line_words))
+                line_words, line_width = [], 0.0
+
+            # Break words that cannot fit on a line of their own
+            while word_width > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and font.text_length(word[:cut], fontsize=fontsize) > width:
+                    cut -= 1
+                if line_words:
+                    lines.append(_join_line(line_words))
+                    line_words, line_width = [], 0.0
+                lines.append((word[:cut], start, start + cut))
+                word, start = word[cut:], start + cut
+                word_width = font.text_length(word, fontsize=fontsize)
+
+            line_width += (space if line_words else 0.0) + word_width
+            line_words.append((word, start))
+
+        if line_words:
+            lines.append(_join_line(line_words))
+
+        paragraph_start += len(paragraph) + 1
+
+    return lines
+
+def _join_line(line_words: List[Tuple[str, int]]) -> Tuple[str, int, int]:
+    last_word, last_start = line_words[-1]
+    return ' '.join(w for w, _ in line_words), line_words[0][1], last_start + len(last_word)
+
+def fit_text(
+    text: str,
+    width: float,
+    max_height: float,
+    fontsize: float,
+    lineheight: float,
+    fontname: str = "helv"
+) -> Tuple[List[str], str]:
+    """
+    Fit text into a box, cutting at the last complete sentence that fits.
+
+    Args:
+        text: Text to fit
+        width: Box width in points
+        max_height: Box height in points
+        fontsize: Font size in points
+        lineheight: Line height multiplier
+        fontname: Font name
+
+    Returns:
+        (lines that fit, overflow text that did not)
+    """
+    text = text.strip()
+    lines = wrap_text(text, width, fontsize, fontname)
+    max_lines = max(1, int(max_height // (fontsize * lineheight)))
+
+    if len(lines) <= max_lines:
+        return [line for line, _, _ in lines], ''
+
+    # Last sentence boundary inside the lines that fit; fall back to the line boundary
+    limit = lines[max_lines - 1][2]
+    cut = limit
+    for match in SENTENCE_END.finditer(text, 0, limit):
+        cut = match.end()
+
+    kept = [line for line, _, _ in wrap_text(text[:cut].rstrip(), width, fontsize, fontname)]
+    return kept, text[cut:].strip()
+
+def draw_lines(
+    page: fitz.Page,
+    x: float,
+    top: float,
+    lines: List[str],
+    fontsize: float,
+    lineheight: float,
+    fontname: str = "helv"
+) -> float:
+    """
+    Draw pre-wrapped lines starting at the given top-left position.
+
+    Returns:
+        y coordinate just below the last line
+    """
+    step = fontsize * lineheight
+    baseline = top + fontsize * get_font(fontname).ascender
+    for line in lines:
+        if line:
+            page.insert_text((x, baseline), line, fontsize=fontsize, fontname=fontname)
+        baseline += step
+    return top + step * len(lines)
+
+def flow_sections(
+    doc: fitz.Document,
+    sections: List[Tuple[str, str]],
+    fontsize: float,
+    lineheight: float,
+    fontname: str = "helv",
+    heading_fontname: str = "hebo",
+    margin: float = 50
+):
+    """
+    Flow titled text sections onto continuation pages appended to doc.
+
+    Pages use the size of the document's first page. Lines are placed top to
+    bottom and a new page starts whenever the next line would cross the
+    bottom margin, so the output depends only on the input text.
+
+    Args:
+        doc: Document to append pages to
+        sections: List of (title, text)
+        fontsize: Body font size in points
+        lineheight: Line height multiplier
+        fontname: Body font name
+        heading_fontname: Section title font name
+        margin: Page margin in points
+    """
+    if not sections:
+        return
+
+    page_rect = doc[0].rect
+    width = page_rect.width - 2 * margin
+    bottom = page_rect.height - margin
+    step = fontsize * lineheight
+    heading_size = fontsize + 2
+
+    page = None
+    y = bottom  # Forces a new page for the first line
+
+    def new_page():
+        new = doc.new_page(width=page_rect.width, height=page_rect.height)
+        return new, margin
+
+    for title, text in sections:
+        # Keep each heading with at least its first body line
+        if page is None or y + heading_size * lineheight + step > bottom:
+            page, y = new_page()
+        y = draw_lines(page, margin, y, [title], heading_size, lineheight, heading_fontname)
+
+        for line, _, _ in wrap_text(text, width, fontsize, fontname):
+            if y + step > bottom:
+                page, y = new_page()
+            y = draw_lines(page, margin, y, [line], fontsize, lineheight, fontname)
+
+        y += step
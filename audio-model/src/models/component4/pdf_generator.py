@@ -1,62 +1,9 @@
 import fitz  # PyMuPDF
-import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
-
-def truncate_at_sentence(text: str, max_length: int) -> str:
-    """
-    Truncate text to fit within max_length, ensuring the last sentence is complete.
-
-    Args:
-        text: The text to truncate
-        max_length: Maximum character length
-
-    Returns:
-        Truncated text ending at a complete sentence
-    """
-    if len(text) <= max_length:
-        return text
-
-    # Find all sentence endings up to max_length
-    truncated = text[:max_length]
-
-    # Look for sentence boundaries (. ! ?) followed by space or end
-    sentences = re.split(r'([.!?])\s+', truncated)
-
-    # Rebuild up to last complete sentence
-    result = ""
-    for i in range(0, len(sentences) - 1, 2):
-        if i + 1 < len(sentences):
-            sentence = sentences[i] + sentences[i + 1]
-            if len(result + sentence) <= max_length:
-                result += sentence + " "
-
-    return result.strip()
-
-def estimate_text_height(text: str, width: int, fontsize: float, lineheight: float) -> float:
-    """
-    Estimate the height needed for text in a textbox.
-
-    Args:
-        text: The text content
-        width: Width of the textbox in points
-        fontsize: Font size in points
-        lineheight: Line height multiplier
-
-    Returns:
-        Estimated height in points
-    """
-    # Rough estimate: average character width is ~0.5 * fontsize
-    chars_per_line = int(width / (fontsize * 0.5))
-    num_lines = max(1, len(text) / chars_per_line)
-
-    # Add extra lines for manual line breaks
-    num_lines += text.count('\n')
-
-    # Calculate height
-    line_height_pts = fontsize * lineheight
-    return num_lines * line_height_pts
+from src.models.blob_store import detach
+from .layout import fit_text, draw_lines, flow_sections
 
 def generate_final_summary_pdf(
     iteration: int,
@@ -120,111 +67,101 @@ def generate_final_summary_pdf(
     # Format urgency
     urgency_text = f"Level: {urgency['level']}\n\nJustification: {urgency['justification']}\n\nRecommended Action: {urgency['recommended_action']}"
 
-    # Define replacements with smart height limits
-    # Heights are calculated based on template spacing to prevent overflow
+    # Placeholder boxes; heights come from template spacing. Text that does
+    # not fit its box is cut at a sentence boundary and the remainder flows
+    # onto continuation pages under the section title.
     replacements = {
         "[key words here separate different key words with comma]": {
+            "title": "Keywords",
             "content": keywords_text,
-            "max_height": 53,  # Updated from template analysis
-            "max_chars": 500
+            "max_height": 53
         },
         "[summary insert here]": {
+            "title": "Summary of Transcript",
             "content": transcript_summary,
-            "max_height": 102,  # Updated from template analysis
-            "max_chars": 900
+            "max_height": 102
         },
         "[Patient Summary Here]": {
+            "title": "Patient Summary",
             "content": patient_summary,
-            "max_height": 194,  # Updated from template analysis
-            "max_chars": 1800
+            "max_height": 194
         },
         "[Insert SOAP subjective component here]": {
+            "title": "SOAP - Subjective",
             "content": soap["subjective"],
-            "max_height": 60,  # Updated from template analysis
-            "max_chars": 550
+            "max_height": 60
         },
         "[Insert SOAP objective component here]": {
+            "title": "SOAP - Objective",
             "content": soap["objective"],
-            "max_height": 60,  # Updated from template analysis
-            "max_chars": 550
+            "max_height": 60
         },
         "[Insert SOAP assessment component here]": {
+            "title": "SOAP - Assessment",
             "content": soap["assessment"],
-            "max_height": 60,  # Updated from template analysis
-            "max_chars": 550
+            "max_height": 60
         },
         "[Insert SOAP plan component here]": {
+            "title": "SOAP - Plan",
             "content": soap["plan"],
-            "max_height": 101,  # Updated from template analysis (to page end)
-            "max_chars": 900
+            "max_height": 101  # To page end
         },
         "[Insert Related Healthcare Fields here]": {
+            "title": "Related Healthcare Fields",
             "content": fields_text,
-            "max_height": 225,  # Updated from template analysis
-            "max_chars": 2000
+            "max_height": 225
         },
         "[Insert devices needed here]": {
+            "title": "Devices Needed",
             "content": devices_text,
-            "max_height": 224,  # Updated from template analysis
-            "max_chars": 2000
+            "max_height": 224
         },
         "[Insert urgency level here]": {
+            "title": "Urgency Level",
             "content": urgency_text,
-            "max_height": 291,  # Updated from template analysis (to page end)
-            "max_chars": 2500
+            "max_height": 291  # To page end
         }
     }
 
-    # Process each page
+    overflow_sections = []
+
+    # Process each page (template pages only; continuation pages come after)
     for page_num in range(len(doc)):
         page = doc[page_num]
         page_width = page.rect.width
-        page_height = page.rect.height
 
-        # Replace each placeholder
+        # Find every placeholder first so redactions are applied once per page
+        placements = []
         for placeholder, settings in replacements.items():
-            instances = page.search_for(placeholder)
-
-            if instances:
-                for rect in instances:
-                    # Get content and constraints
-                    content = settings["content"]
-                    max_height = settings["max_height"]
-                    max_chars = settings["max_chars"]
-
-                    # Calculate available width
-                    width = page_width - rect.x0 - 50  # Leave 50pt right margin
-
-                    # Estimate if text will fit
-                    estimated_height = estimate_text_height(content, width, fontsize, lineheight)
-
-                    # If text is too long, truncate at sentence boundary
-                    if estimated_height > max_height or len(content) > max_chars:
-                        content = truncate_at_sentence(content, max_chars)
-
-                    # Redact placeholder
-                    page.add_redact_annot(rect)
-                    page.apply_redactions()
-
-                    # Create rectangle for content
-                    expanded_rect = fitz.Rect(
-                        rect.x0,
-                        rect.y0,
-                        rect.x0 + width,
-                        rect.y0 + max_height
-                    )
-
-                    # Insert text with proper formatting
-                    page.insert_textbox(
-                        expanded_rect,
-                        content,
-                        fontsize=fontsize,
-                        fontname=fontname,
-                        lineheight=lineheight,
-                        align=fitz.TEXT_ALIGN_LEFT
-                    )
-
-    # Save to output path
+            for rect in page.search_for(placeholder):
+                placements.append((rect, settings))
+                page.add_redact_annot(rect)
+
+        if not placements:
+            continue
+        page.apply_redactions()
+
+        for rect, settings in placements:
+            # Calculate available width
+            width = page_width - rect.x0 - 50  # Leave 50pt right margin
+
+            lines, overflow = fit_text(
+                settings["content"],
+                width,
+                settings["max_height"],
+                fontsize,
+                lineheight,
+                fontname
+            )
+            draw_lines(page, rect.x0, rect.y0, lines, fontsize, lineheight, fontname)
+
+            if overflow:
+                overflow_sections.append((f"{settings['title']} (continued)", overflow))
+
+    flow_sections(doc, overflow_sections, fontsize, lineheight, fontname)
+
+    # Save to output path (unlinking a copy shared via the blob store)
+    detach(output_path)
     doc.save(str(output_path))
     doc.close()
 
@@ -1,22 +1,60 @@
 import fitz  # PyMuPDF
 from pathlib import Path
-from typing import List
-
-def highlight_pdf_passages(input_pdf_path: Path, output_pdf_path: Path, passages: List[str]) -> bool:
+from typing import Dict, List, Optional, Union
+from src.models.blob_store import detach
+
+# Highlight limits, shared by passage- and sentence-based highlighting
+MAX_HIGHLIGHTS_PER_PAGE = 6
+MAX_HIGHLIGHTS_TOTAL = 10
+
+# Serialization options for highlighted PDFs
+SAVE_OPTIONS = {'garbage': 3, 'deflate': True}
+
+# A PDF given either as a file path or as its raw bytes
+PdfSource = Union[Path, bytes]
+
+def open_pdf(source: PdfSource) -> fitz.Document:
+    """Open a PDF from a path or from in-memory bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(str(source))
+
+def _finish(doc: fitz.Document, output_pdf_path: Optional[Path]) -> bytes:
+    """Serialize a document to bytes, optionally also writing it to disk."""
+    data = doc.tobytes(**SAVE_OPTIONS)
+    doc.close()
+    if output_pdf_path is not None:
+        detach(output_pdf_path)
+        output_pdf_path.write_bytes(data)
+    return data
+
+def _unhighlighted(source: PdfSource, output_pdf_path: Optional[Path]) -> bytes:
+    """Fallback when highlighting fails: the original PDF, unchanged."""
+    data = bytes(source) if isinstance(source, (bytes, bytearray)) else Path(source).read_bytes()
+    if output_pdf_path is not None:
+        detach(output_pdf_path)
+        output_pdf_path.write_bytes(data)
+    return data
+
+def highlight_pdf_passages(
+    source: PdfSource,
+    output_pdf_path: Optional[Path],
+    passages: List[str]
+) -> bytes:
     """
     Add yellow highlights to PDF for specific relevant passages.
 
     Args:
-        input_pdf_path: Path to input PDF
-        output_pdf_path: Path to save highlighted PDF
+        source: Input PDF (path or bytes)
+        output_pdf_path: Optional path to also save the highlighted PDF to
         passages: List of specific text passages to highlight (AI-selected)
 
     Returns:
-        bool: True if successful
+        Highlighted PDF bytes (the original PDF if highlighting failed)
     """
     try:
         # Open the PDF
-        doc = fitz.open(str(input_pdf_path))
+        doc = open_pdf(source)
 
         highlight_count = 0
         highlights_per_page = {}
@@ -36,7 +74,7 @@ def highlight_pdf_passages(input_pdf_path: Path, output_pdf_path: Path, passages
             # Search across all pages
             for page_num, page in enumerate(doc):
                 # Skip if this page already has too many highlights
-                if highlights_per_page.get(page_num, 0) >= 6:  # Increased from 5 to 6
+                if highlights_per_page.get(page_num, 0) >= MAX_HIGHLIGHTS_PER_PAGE:
                     continue
 
                 # Try exact match first
@@ -54,7 +92,7 @@ def highlight_pdf_passages(input_pdf_path: Path, output_pdf_path: Path, passages
                 # Highlight each instance (but limit per page)
                 for inst in text_instances:
                     # Check if we've hit the page limit
-                    if highlights_per_page.get(page_num, 0) >= 6:
+                    if highlights_per_page.get(page_num, 0) >= MAX_HIGHLIGHTS_PER_PAGE:
                         break
 
                     # Add yellow highlight annotation
@@ -73,59 +111,90 @@ def highlight_pdf_passages(input_pdf_path: Path, output_pdf_path: Path, passages
                 if found:
                     break
 
-            # Stop if we've hit overall limit (10 highlights total)
-            if highlight_count >= 10:  # Increased from 8 to 10
+            # Stop if we've hit overall limit
+            if highlight_count >= MAX_HIGHLIGHTS_TOTAL:
                 break
 
-        # Save the highlighted PDF
-        doc.save(str(output_pdf_path))
-        doc.close()
+        data = _finish(doc, output_pdf_path)
 
         print(f"      → Added {highlight_count} phrase-based highlights")
-        return True
+        return data
 
     except Exception as e:
         print(f"      ✗ Highlighting error: {str(e)}")
-        # If highlighting fails, just copy the original
-        import shutil
-        shutil.copy(input_pdf_path, output_pdf_path)
-        return False
-
-def highlight_source_pdfs(
-    source_paths: List[Path],
-    output_dir: Path,
-    iteration,  # Can be int (CLI mode) or str (session_id in API mode)
-    highlights_per_source: List[List[str]]
-) -> List[Path]:
+        return _unhighlighted(source, output_pdf_path)
+
+def highlight_pdf_sentences(
+    source: PdfSource,
+    output_pdf_path: Optional[Path],
+    sentences: List[Dict],
+    sentence_ids: List[int]
+) -> bytes:
     """
-    Create highlighted versions of source PDFs using AI-selected passages.
+    Add yellow highlights to PDF for AI-selected sentence IDs.
+
+    Sentences come from segment_pdf_sentences, so each ID maps straight to
+    its page and line rectangles; no text search is needed.
 
     Args:
-        source_paths: List of paths to original source PDFs
-        output_dir: Directory to save highlighted PDFs
-        iteration: Current iteration number (int) or session_id (str)
-        highlights_per_source: List of passage lists (one per source)
+        source: Input PDF (path or bytes)
+        output_pdf_path: Optional path to also save the highlighted PDF to
+        sentences: Segmented sentences of the input PDF
+        sentence_ids: Sentence IDs to highlight (AI-selected)
 
     Returns:
-        List of paths to highlighted PDFs
+        Highlighted PDF bytes (the original PDF if highlighting failed)
     """
-    highlighted_paths = []
+    try:
+        doc = open_pdf(source)
+
+        by_id = {s['id']: s for s in sentences}
+        highlight_count = 0
+        highlights_per_page = {}
+
+        for sentence_id in dict.fromkeys(sentence_ids):  # De-duplicate, keep order
+            sentence = by_id.get(sentence_id)
+            if sentence is None:
+                continue
+
+            page_num = sentence['page']
+            if highlights_per_page.get(page_num, 0) >= MAX_HIGHLIGHTS_PER_PAGE:
+                continue
 
-    for i, source_path in enumerate(source_paths):
-        # Use different naming based on mode
-        if isinstance(iteration, str) and len(iteration) > 10:  # Session ID
-            output_path = output_dir / f"source_{i + 1}_highlighted.pdf"
-        else:  # Iteration number
-            output_path = output_dir / f"{iteration}_4_source_{i + 1}.pdf"
+            page = doc[page_num]
+            quads = [fitz.Rect(r).quad for r in sentence['rects']]
+            highlight = page.add_highlight_annot(quads)
+            highlight.set_colors(stroke=(1, 1, 0))  # Yellow
+            highlight.update()
 
-        print(f"    Highlighting source {i + 1}: {source_path.name}")
+            highlight_count += 1
+            highlights_per_page[page_num] = highlights_per_page.get(page_num, 0) + 1
 
-        # Get passages for this source
-        passages = highlights_per_source[i] if i < len(highlights_per_source) else []
+            if highlight_count >= MAX_HIGHLIGHTS_TOTAL:
+                break
+
+        data = _finish(doc, output_pdf_path)
+
+        print(f"      → Added {highlight_count} sentence highlights")
+        return data
+
+    except Exception as e:
+        print(f"      ✗ Highlighting error: {str(e)}")
+        return _unhighlighted(source, output_pdf_path)
 
-        # Create highlighted version
-        success = highlight_pdf_passages(source_path, output_path, passages)
+def get_highlighted_output_path(output_dir: Path, iteration, source_number: int) -> Path:
+    """
+    Get the output path for a highlighted source PDF.
 
-        highlighted_paths.append(output_path)
+    Args:
+        output_dir: Directory to save highlighted PDFs
+        iteration: Current iteration number (int) or session_id (str)
+        source_number: 1-based source number
 
-    return highlighted_paths
+    Returns:
+        Path for the highlighted PDF
+    """
+    # Use different naming based on mode
+    if isinstance(iteration, str) and len(iteration) > 10:  # Session ID
+        return output_dir / f"source_{source_number}_highlighted.pdf"
+    return output_dir / f"{iteration}_4_source_{source_number}.pdf"
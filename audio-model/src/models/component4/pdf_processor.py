@@ -1,39 +1,113 @@
-import PyPDF2
+import re
+import fitz  # PyMuPDF
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Union
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
+# Word ending a sentence: terminal punctuation, optionally followed by closing quotes/brackets
+SENTENCE_END = re.compile(r'[.!?]["\'\)\]]*$')
+
+# Abbreviations common in PMC articles that end in a period but not a sentence
+ABBREVIATIONS = {
+    'e.g.', 'i.e.', 'al.', 'cf.', 'vs.', 'viz.', 'approx.', 'ca.', 'resp.', 'incl.',
+    'fig.', 'figs.', 'eq.', 'eqs.', 'ref.', 'refs.', 'no.', 'nos.', 'vol.', 'pp.', 'suppl.',
+    'dr.', 'prof.', 'mr.', 'mrs.', 'ms.', 'st.'
+}
+
+# Fragments shorter than this (page numbers, running headers) are not numbered
+MIN_SENTENCE_WORDS = 4
+
+def segment_pdf_sentences(pdf: Union[Path, bytes]) -> List[Dict]:
     """
-    Extract all text from a PDF file.
+    Split a PDF into numbered sentences with their page positions.
+
+    Sentences never span text blocks or pages. Each sentence keeps the
+    rectangles of the line fragments it covers, so it can be highlighted
+    directly without searching for its text.
 
     Args:
-        pdf_path: Path to PDF file
+        pdf: Path to PDF file, or its bytes
 
     Returns:
-        Extracted text as string
+        List of sentences, each a dict with:
+            id: 1-based sentence number within the document
+            page: 0-based page number
+            text: Sentence text (words joined by single spaces)
+            rects: [x0, y0, x1, y1] for each line fragment of the sentence
     """
+    sentences = []
+
+    if isinstance(pdf, (bytes, bytearray)):
+        doc = fitz.open(stream=pdf, filetype='pdf')
+    else:
+        doc = fitz.open(str(pdf))
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-    except Exception as e:
-        return f"Error extracting text from {pdf_path.name}: {str(e)}"
-
-def extract_source_pdfs_text(source_paths: List[Path]) -> Dict[int, str]:
+        for page_num, page in enumerate(doc):
+            # (x0, y0, x1, y1, word, block_no, line_no, word_no)
+            words = page.get_text("words", sort=True)
+            current = []
+            current_block = None
+
+            def flush():
+                if len(current) >= MIN_SENTENCE_WORDS:
+                    sentences.append(_build_sentence(len(sentences) + 1, page_num, current))
+                current.clear()
+
+            for x0, y0, x1, y1, word, block_no, line_no, _ in words:
+                if current and block_no != current_block:
+                    flush()
+                current_block = block_no
+
+                current.append((word, (block_no, line_no), (x0, y0, x1, y1)))
+
+                if ends_sentence(word):
+                    flush()
+            flush()
+    finally:
+        doc.close()
+
+    return sentences
+
+def ends_sentence(word: str) -> bool:
+    """Check whether a word closes a sentence (and is not an abbreviation such as "e.g.")."""
+    if not SENTENCE_END.search(word):
+        return False
+    return word.lstrip('(["\'').lower() not in ABBREVIATIONS
+
+def _build_sentence(sentence_id: int, page_num: int, words: List[tuple]) -> Dict:
+    """Merge segmented words into a sentence record with one rect per line."""
+    line_rects = {}
+    for _, line_key, (x0, y0, x1, y1) in words:
+        if line_key in line_rects:
+            r = line_rects[line_key]
+            line_rects[line_key] = [min(r[0], x0), min(r[1], y0), max(r[2], x1), max(r[3], y1)]
+        else:
+            line_rects[line_key] = [x0, y0, x1, y1]
+
+    return {
+        'id': sentence_id,
+        'page': page_num,
+        'text': ' '.join(w[0] for w in words),
+        'rects': [[round(v, 2) for v in r] for r in line_rects.values()]
+    }
+
+def format_sentences_for_prompt(sentences: List[Dict], max_chars: int = 5000) -> str:
     """
-    Extract text from all 3 source PDFs.
+    Render numbered sentences as prompt text ("[12] Sentence text").
 
     Args:
-        source_paths: List of paths to source PDFs
+        sentences: Output of segment_pdf_sentences
+        max_chars: Character budget for the rendered text
 
     Returns:
-        Dictionary mapping source number to extracted text
+        Prompt text, with a truncation marker if the budget ran out
     """
-    sources_text = {}
-    for i, path in enumerate(source_paths, 1):
-        text = extract_text_from_pdf(path)
-        sources_text[i] = text
-    return sources_text
+    lines = []
+    used = 0
+    for sentence in sentences:
+        line = f"[{sentence['id']}] {sentence['text']}"
+        if used + len(line) > max_chars:
+            lines.append("[...truncated...]")
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return '\n'.join(lines)
@@ -0,0 +1,169 @@
+import json
+from typing import Callable, List, Optional, Tuple
+
+# Characters that terminate a bare JSON scalar (number, true, false, null)
+_SCALAR_TERMINATORS = set(',}] \t\r\n')
+
+
+class _Frame:
+    """One open object or array on the parser stack."""
+
+    def __init__(self, kind: str, path: Tuple[str, ...], start: int, emit: bool):
+        self.kind = kind      # 'object' | 'array'
+        self.path = path      # Key path from the root object
+        self.start = start    # Offset of the opening bracket
+        self.emit = emit      # Whether children of this frame are reported
+        self.key = None       # Last key read (objects only)
+        self.state = 'key' if kind == 'object' else 'value'
+
+
+class IncrementalJSONParser:
+    """
+    Incrementally scan a streamed JSON object and report fields as they close.
+
+    Text is fed in arbitrary chunks (e.g. LLM stream deltas). Anything before
+    the first '{' (such as a ```json fence) is skipped. Whenever a value at
+    depth 1..max_depth of the root object is complete, on_field is called with
+    its key path and parsed value, e.g. (('urgency',), {...}) or
+    (('highlights', 'source_1'), [...]). Values inside arrays are only
+    reported as part of the enclosing array.
+    """
+
+    def __init__(
+        self,
+        on_field: Optional[Callable[[Tuple[str, ...], object], None]] = None,
+        max_depth: int = 2
+    ):
+        self.on_field = on_field
+        self.max_depth = max_depth
+        self.value = None      # Parsed root object once it closes
+        self.failed = False    # Set if the stream turned out not to be valid JSON
+
+        self._chunks: List[str] = []
+        self._text = ''
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._scalar_start = None
+
+    @property
+    def text(self) -> str:
+        """Full text received so far."""
+        if self._chunks:
+            self._text += ''.join(self._chunks)
+            self._chunks = []
+        return self._text
+
+    @property
+    def done(self) -> bool:
+        return self.value is not None or self.failed
+
+    def feed(self, chunk: str):
+        """Consume the next chunk of streamed text."""
+        self._chunks.append(chunk)
+        if not self.done:
+            self._scan()
+
+    def _scan(self):
+        text = self.text
+        i = self._pos
+
+        while i < len(text) and not self.done:
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(i + 1)
+                i += 1
+                continue
+
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._stack.append(_Frame('object', (), i, emit=True))
+                i += 1
+                continue
+
+            if self._scalar_start is not None:
+                if ch not in _SCALAR_TERMINATORS:
+                    i += 1
+                    continue
+                start, self._scalar_start = self._scalar_start, None
+                self._close_value(start, i)
+                # Fall through so the terminator itself is processed
+
+            if ch in ' \t\r\n':
+                i += 1
+                continue
+
+            frame = self._stack[-1]
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = frame.kind == 'object' and frame.state == 'key'
+            elif ch in '{[' and frame.state == 'value':
+                if frame.kind == 'object':
+                    path = frame.path + (frame.key,)
+                    emit = frame.emit
+                else:
+                    path = frame.path
+                    emit = False
+                kind = 'object' if ch == '{' else 'array'
+                self._stack.append(_Frame(kind, path, i, emit))
+            elif ch in '}]':
+                closed = self._stack.pop()
+                if not self._stack:
+                    self.value = self._loads(closed.start, i + 1)
+                else:
+                    self._close_value(closed.start, i + 1)
+            elif ch == ':' and frame.kind == 'object' and frame.state == 'colon':
+                frame.state = 'value'
+            elif ch == ',' and frame.state == 'comma':
+                frame.state = 'key' if frame.kind == 'object' else 'value'
+            elif frame.state == 'value':
+                self._scalar_start = i
+            else:
+                self.failed = True
+
+            i += 1
+
+        self._pos = i
+
+    def _close_string(self, end: int):
+        if self._string_is_key:
+            frame = self._stack[-1]
+            frame.key = self._loads(self._string_start, end)
+            frame.state = 'colon'
+        else:
+            self._close_value(self._string_start, end)
+
+    def _close_value(self, start: int, end: int):
+        """A value belonging to the top frame has closed at text[start:end]."""
+        frame = self._stack[-1]
+        frame.state = 'comma'
+
+        if frame.kind != 'object' or not frame.emit or self.on_field is None:
+            return
+
+        path = frame.path + (frame.key,)
+        if len(path) <= self.max_depth:
+            value = self._loads(start, end)
+            if not self.failed:
+                self.on_field(path, value)
+
+    def _loads(self, start: int, end: int):
+        try:
+            return json.loads(self._text[start:end])
+        except json.JSONDecodeError:
+            self.failed = True
+            return None
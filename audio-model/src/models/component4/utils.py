@@ -1,32 +1,7 @@
 from datetime import datetime
 from pathlib import Path
 from . import config
-
-def get_current_iteration() -> int:
-    """Read global iteration from tracker file."""
-    try:
-        with open(config.ITERATION_TRACKER, 'r') as f:
-            content = f.read().strip()
-            if '=' in content:
-                return int(content.split('=')[1])
-            return 0
-    except (FileNotFoundError, ValueError):
-        return 0
-
-def increment_and_save_iteration() -> int:
-    """
-    Increment global iteration and save to tracker.
-
-    ONLY Component 4 should call this function - after successful completion.
-    """
-    current = get_current_iteration()
-    new_iteration = current + 1
-
-    with open(config.ITERATION_TRACKER, 'w') as f:
-        f.write(f'iteration={new_iteration}\n')
-
-    print(f"✓ Iteration tracker updated: {current} → {new_iteration}")
-    return new_iteration
+from src.models.iteration_tracker import get_current_iteration
 
 def get_component2_output(iteration: int) -> Path:
     """Get Component 2 output file path for current iteration."""
@@ -1,29 +1,166 @@
+import io
+import os
+import zlib
 import zipfile
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# A zip entry is either a file on disk or an in-memory (name, bytes) pair
+ZipEntry = Union[Path, Tuple[str, bytes]]
+
+# Formats that are already compressed; deflating them costs CPU for ~no gain
+STORED_EXTENSIONS = {'.pdf', '.zip', '.png', '.jpg', '.jpeg', '.m4a', '.mp3', '.ogg', '.webm'}
+
+# Other entries are deflated only if a sample of them shrinks by at least this much
+MIN_DEFLATE_SAVING = 0.1
+SAMPLE_SIZE = 64 * 1024
+
+CHUNK_SIZE = 64 * 1024
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that buffers zip output until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return iter(chunks)
+
+def choose_compression(name: str, sample: bytes) -> int:
+    """
+    Pick ZIP_STORED or ZIP_DEFLATED for an entry.
+
+    Args:
+        name: Entry name (its extension is checked first)
+        sample: Leading bytes of the entry
+
+    Returns:
+        zipfile compression constant
+    """
+    if Path(name).suffix.lower() in STORED_EXTENSIONS or not sample:
+        return zipfile.ZIP_STORED
+
+    compressed = zlib.compress(sample, 1)
+    if len(compressed) <= len(sample) * (1 - MIN_DEFLATE_SAVING):
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+def _open_entry(entry: ZipEntry) -> Tuple[str, int, io.BufferedIOBase]:
+    """Return (name, size, readable stream) for an entry."""
+    if isinstance(entry, tuple):
+        name, data = entry
+        return name, len(data), io.BytesIO(data)
+    path = Path(entry)
+    return path.name, path.stat().st_size, open(path, 'rb')
+
+def iter_zip(entries: Iterable[ZipEntry], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Build a zip archive and yield it in chunks as it is produced.
+
+    The archive never exists in full in memory, so it can be written
+    straight to a socket or upload stream.
+
+    Args:
+        entries: Files on disk and/or (name, bytes) pairs
+        chunk_size: Read size for entry data
+
+    Yields:
+        Consecutive chunks of the zip archive
+    """
+    sink = _ChunkSink()
+    date_time = datetime.now().timetuple()[:6]
+
+    with zipfile.ZipFile(sink, 'w') as zipf:
+        for entry in entries:
+            name, size, source = _open_entry(entry)
+            with source:
+                first = source.read(max(chunk_size, SAMPLE_SIZE))
+
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.compress_type = choose_compression(name, first[:SAMPLE_SIZE])
+                info.file_size = size
+
+                with zipf.open(info, 'w') as dest:
+                    data = first
+                    while data:
+                        dest.write(data)
+                        yield from sink.drain()
+                        data = source.read(chunk_size)
+            yield from sink.drain()
+
+    yield from sink.drain()
+
+def stream_final_zip(
+    summary_pdf: ZipEntry,
+    highlighted_sources: List[ZipEntry],
+    persist_to: Optional[Path] = None
+) -> Iterator[bytes]:
+    """
+    Stream the final ZIP (summary PDF plus highlighted sources) in chunks.
+
+    Args:
+        summary_pdf: Final summary PDF (path or (name, bytes))
+        highlighted_sources: Highlighted source PDFs (paths or (name, bytes))
+        persist_to: Optional path to also save the archive to. It is written
+            alongside the stream and only appears once complete.
+
+    Yields:
+        Consecutive chunks of the zip archive
+    """
+    chunks = iter_zip([summary_pdf, *highlighted_sources])
+
+    if persist_to is None:
+        yield from chunks
+        return
+
+    partial_path = persist_to.with_name(persist_to.name + '.part')
+    try:
+        with open(partial_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(partial_path, persist_to)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
 
 def create_final_zip(
-    summary_pdf: Path,
-    highlighted_sources: List[Path],
-    output_zip: Path
+    summary_pdf: ZipEntry,
+    highlighted_sources: List[ZipEntry],
+    output_zip: Path,
+    upload=None
 ) -> Path:
     """
     Create ZIP file containing final summary and highlighted source PDFs.
 
     Args:
-        summary_pdf: Path to final summary PDF
-        highlighted_sources: List of paths to highlighted source PDFs
+        summary_pdf: Path to final summary PDF (or (name, bytes))
+        highlighted_sources: List of paths to highlighted source PDFs (or (name, bytes))
         output_zip: Path where ZIP should be saved
+        upload: Optional streaming upload (src/models/artifact_storage.py)
+            that receives the archive chunk by chunk as it is built
 
     Returns:
         Path to created ZIP file
     """
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add summary PDF
-        zipf.write(summary_pdf, summary_pdf.name)
+    chunks = stream_final_zip(summary_pdf, highlighted_sources, persist_to=output_zip)
+
+    if upload is None:
+        for _ in chunks:
+            pass
+        return output_zip
 
-        # Add all highlighted source PDFs
-        for source_pdf in highlighted_sources:
-            zipf.write(source_pdf, source_pdf.name)
+    with upload:
+        for chunk in chunks:
+            upload.write(chunk)
 
     return output_zip
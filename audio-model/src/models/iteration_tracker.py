@@ -0,0 +1,94 @@
+"""
+CLI Iteration Tracker
+
+CLI mode keys every artifact on an iteration number ({N}_1_output.json,
+{N}_final.zip, ...). data/components/iteration_tracker.txt holds the next
+free iteration ("iteration=N").
+
+A pipeline run reserves its iteration up front with reserve_iteration(),
+which reads and bumps the tracker under an exclusive lock, so concurrent CLI
+runs on one machine always get distinct iterations. Components run on their
+own (without an iteration) keep using get_current_iteration(), and
+Component 4 calls advance_iteration() when it finishes, which only ever
+moves the tracker forward.
+"""
+
+import os
+from contextlib import contextmanager
+
+from pipeline_config import PipelineConfig
+
+try:
+    import fcntl
+except ImportError:  # Windows: reservations are not locked
+    fcntl = None
+
+LOCK_SUFFIX = '.lock'
+
+
+@contextmanager
+def _locked():
+    """Hold the exclusive tracker lock (a sidecar file, as the tracker is replaced)."""
+    tracker = PipelineConfig.ITERATION_TRACKER
+    tracker.parent.mkdir(parents=True, exist_ok=True)
+    with open(tracker.with_name(tracker.name + LOCK_SUFFIX), 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def _write(iteration: int):
+    tracker = PipelineConfig.ITERATION_TRACKER
+    temp_path = tracker.with_name(tracker.name + '.tmp')
+    with open(temp_path, 'w') as f:
+        f.write(f'iteration={iteration}\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, tracker)
+
+
+def get_current_iteration() -> int:
+    """Read the next free iteration from the tracker file."""
+    try:
+        with open(PipelineConfig.ITERATION_TRACKER, 'r') as f:
+            content = f.read().strip()
+            # Parse: iteration=N
+            if '=' in content:
+                return int(content.split('=')[1])
+            return 0
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def reserve_iteration() -> int:
+    """
+    Atomically allocate an iteration for a CLI pipeline run.
+
+    Returns:
+        The reserved iteration; no other caller will get it
+    """
+    with _locked():
+        iteration = get_current_iteration()
+        _write(iteration + 1)
+    return iteration
+
+
+def advance_iteration(completed: int) -> int:
+    """
+    Move the tracker past a completed iteration (never backwards).
+
+    A no-op for iterations allocated with reserve_iteration().
+
+    Args:
+        completed: The iteration that just finished
+
+    Returns:
+        The next free iteration
+    """
+    with _locked():
+        current = get_current_iteration()
+        if current <= completed:
+            _write(completed + 1)
+            print(f"✓ Iteration tracker updated: {current} → {completed + 1}")
+            return completed + 1
+    return current
@@ -0,0 +1,246 @@
+"""
+Medical Keyword Vocabulary
+
+Shared keyword cleaning for Components 3 and 4. The vocabulary is built
+from the keyword column of mtsamples.csv and compiled into an Aho-Corasick
+automaton over word tokens, so canonical terms are found in a transcript
+(or an LLM keyword) in one linear pass and only whole-word phrases match.
+The compiled vocabulary is pickled and loaded once per process.
+"""
+
+import os
+import re
+import pickle
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pipeline_config import PipelineConfig
+from src.models.component2.config import DATASET_CSV
+from src.models.component2.local_extractor import normalize_keywords
+
+VOCAB_PATH = PipelineConfig.CACHE_DIR / 'keyword_vocab.pkl'
+
+TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Terms must appear in at least this many dataset rows
+MIN_TERM_COUNT = 2
+
+# Transcription/format artifacts that show up in the dataset's keyword column
+ARTIFACT_TOKENS = {'note', 'transcribed', 'soap', 'chart', 'dictated'}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for matching."""
+    return TOKEN.findall(text.lower())
+
+
+def normalize_term(text: str) -> str:
+    """Canonical form of a term: its tokens joined by single spaces."""
+    return ' '.join(tokenize(text))
+
+
+class KeywordVocabulary:
+    """Aho-Corasick automaton over the token sequences of vocabulary terms."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = []
+        self._index: Dict[str, int] = {}
+
+        # Trie: per node, token -> child node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._term_at: List[int] = [-1]   # Term ending exactly at the node
+        self._fail: List[int] = [0]
+        self._output: List[int] = [0]     # Nearest node on the fail chain with a term
+
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term: str):
+        tokens = tokenize(term)
+        canonical = ' '.join(tokens)
+        if not tokens or canonical in self._index:
+            return
+
+        self._index[canonical] = len(self.terms)
+        self.terms.append(canonical)
+
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._term_at.append(-1)
+                self._fail.append(0)
+                self._output.append(0)
+            node = child
+        self._term_at[node] = self._index[canonical]
+
+    def _link(self):
+        """Compute failure and output links breadth-first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                target = self._fail[child]
+                self._output[child] = target if self._term_at[target] >= 0 else self._output[target]
+                queue.append(child)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_term(term) in self._index
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find vocabulary terms in text, leftmost-longest and non-overlapping.
+
+        Returns:
+            List of (start_token, end_token, term) in text order
+        """
+        found = []
+        node = 0
+        for position, token in enumerate(tokenize(text)):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+
+            hit = node if self._term_at[node] >= 0 else self._output[node]
+            while hit:
+                term = self.terms[self._term_at[hit]]
+                length = term.count(' ') + 1
+                found.append((position - length + 1, position + 1, term))
+                hit = self._output[hit]
+
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        selected = []
+        end = 0
+        for match in found:
+            if match[0] >= end:
+                selected.append(match)
+                end = match[1]
+        return selected
+
+    def find(self, text: str) -> List[str]:
+        """Distinct vocabulary terms in text, in order of first occurrence."""
+        return list(dict.fromkeys(term for _, _, term in self.matches(text)))
+
+
+def build_vocabulary(csv_path: Path = None, save_to: Path = None) -> KeywordVocabulary:
+    """
+    Build the vocabulary from the dataset's keyword column and save it.
+
+    Args:
+        csv_path: mtsamples.csv (defaults to DATASET_CSV)
+        save_to: Pickle path (defaults to VOCAB_PATH)
+
+    Returns:
+        Compiled KeywordVocabulary
+    """
+    import pandas as pd
+
+    csv_path = csv_path or DATASET_CSV
+    save_to = save_to or VOCAB_PATH
+
+    counts = Counter()
+    for raw in pd.read_csv(csv_path, usecols=['keywords'])['keywords'].dropna():
+        row_terms = set()
+        # Same keyword cleaning as the local extractor's training labels
+        for keyword in normalize_keywords(raw):
+            tokens = tokenize(keyword)
+            if tokens and not ARTIFACT_TOKENS.intersection(tokens):
+                row_terms.add(' '.join(tokens))
+        counts.update(row_terms)
+
+    vocabulary = KeywordVocabulary(
+        term for term, count in counts.most_common() if count >= MIN_TERM_COUNT
+    )
+
+    save_to.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = save_to.with_suffix('.part')
+    with open(partial_path, 'wb') as f:
+        pickle.dump(vocabulary, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial_path, save_to)
+
+    return vocabulary
+
+
+_vocabulary = None
+
+
+def get_vocabulary() -> Optional[KeywordVocabulary]:
+    """
+    Load the compiled vocabulary once per process.
+
+    It is rebuilt when the dataset is newer than the saved copy.
+
+    Returns:
+        KeywordVocabulary, or None if neither the dataset nor a saved copy exists
+    """
+    global _vocabulary
+    if _vocabulary is not None:
+        return _vocabulary
+
+    dataset_mtime = DATASET_CSV.stat().st_mtime if DATASET_CSV.exists() else None
+
+    if VOCAB_PATH.exists() and (dataset_mtime is None or VOCAB_PATH.stat().st_mtime >= dataset_mtime):
+        with open(VOCAB_PATH, 'rb') as f:
+            _vocabulary = pickle.load(f)
+    elif dataset_mtime is not None:
+        _vocabulary = build_vocabulary()
+
+    return _vocabulary
+
+
+def _is_artifact(keyword: str) -> bool:
+    """Heuristic junk filter used when no vocabulary is available."""
+    lower = keyword.lower()
+    return (
+        len(keyword) >= 50 or 'NOTE' in keyword or 'transcribed' in lower
+        or '/' in keyword or 'soap' in lower or 'chart' in lower
+    )
+
+
+def filter_keywords(keywords: List[str], fallback_text: str = None, limit: int = None) -> List[str]:
+    """
+    Clean LLM-extracted keywords against the medical vocabulary.
+
+    Keywords that are vocabulary terms are kept in canonical form; other
+    keywords contribute the vocabulary terms they contain ("severe ankle
+    pain" -> "ankle pain"). If nothing survives, terms are taken from
+    fallback_text (e.g. the description or transcript). Without a vocabulary,
+    a heuristic artifact filter is applied instead.
+
+    Args:
+        keywords: Keywords from Component 2
+        fallback_text: Text to mine for terms if no keyword validates
+        limit: Maximum number of keywords returned
+
+    Returns:
+        Cleaned keywords, de-duplicated, in input order
+    """
+    vocabulary = get_vocabulary()
+
+    if vocabulary is None:
+        cleaned = [k for k in keywords if not _is_artifact(k)]
+    else:
+        cleaned = []
+        for keyword in keywords:
+            if keyword in vocabulary:
+                cleaned.append(normalize_term(keyword))
+            else:
+                cleaned.extend(vocabulary.find(keyword))
+
+        if not cleaned and fallback_text:
+            cleaned = vocabulary.find(fallback_text)
+
+    cleaned = list(dict.fromkeys(cleaned))
+    return cleaned[:limit] if limit else cleaned
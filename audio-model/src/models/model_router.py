@@ -0,0 +1,391 @@
+"""
+Model Router
+
+Central registry of the LLMs the pipeline calls, and a router that picks
+one per request. Each task declares the minimum quality tier it needs; the
+router tries the cheapest registered model that meets it, skipping models
+that have recently been slow or failing, and fails over to the next one
+when a call errors or exceeds the task's timeout.
+
+Latency and outcome of every call are recorded in SQLite (next to the
+result cache) so routing decisions carry over between pipeline processes.
+"""
+
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATS_DB = PROJECT_ROOT / 'data' / 'cache' / 'results.sqlite3'
+
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+
+# Health: a model is deprioritized for a task when, over its last WINDOW calls
+# (with at least MIN_SAMPLES), the error rate or median latency is too high,
+# or when its last call failed less than COOLDOWN_SECONDS ago
+WINDOW = 20
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.3
+COOLDOWN_SECONDS = 60
+KEEP_CALLS = 200                # Recorded calls kept per (model, task)
+
+# Quality tiers
+BASIC = 1
+STANDARD = 2
+PREMIUM = 3
+
+
+@dataclass
+class ModelSpec:
+    """A model the router can call."""
+
+    name: str
+    provider: str           # 'openai' | 'anthropic'
+    tier: int
+    cost: float             # USD per 1M input + 1M output tokens (for ranking)
+
+
+@dataclass
+class TaskSpec:
+    """Routing policy for one kind of call."""
+
+    min_tier: int
+    timeout: float                      # Seconds before failing over
+    latency_budget: float               # Median latency above this marks a model slow
+    max_tokens: int = 4096
+    thinking_budget: Optional[int] = None   # Extended thinking (Anthropic models only)
+
+
+MODELS: Dict[str, ModelSpec] = {
+    spec.name: spec for spec in [
+        ModelSpec('gpt-4o-mini', 'openai', BASIC, 0.75),
+        ModelSpec('gpt-4o', 'openai', STANDARD, 12.5),
+        ModelSpec('claude-sonnet-4-20250514', 'anthropic', STANDARD, 18.0),
+        ModelSpec('claude-opus-4-20250514', 'anthropic', PREMIUM, 90.0),
+    ]
+}
+
+TASKS: Dict[str, TaskSpec] = {
+    # Component 2: the fine-tuned model (passed explicitly by the caller)
+    'keyword_extraction': TaskSpec(min_tier=BASIC, timeout=30, latency_budget=10),
+    # Component 3: pick 3 of 10 search results. Stays on Opus with extended
+    # thinking, the model it used before routing.
+    'source_selection': TaskSpec(
+        min_tier=PREMIUM, timeout=60, latency_budget=30, max_tokens=3000, thinking_budget=1500
+    ),
+    # Component 4: chain-of-thought summary (streamed)
+    'cot_summary': TaskSpec(min_tier=STANDARD, timeout=180, latency_budget=90, max_tokens=8192),
+    # Component 1: recorded only; backend choice lives in component1.backends
+    'transcription': TaskSpec(min_tier=BASIC, timeout=600, latency_budget=120),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    task TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    latency REAL NOT NULL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS model_calls_recent ON model_calls (model, task, id);
+"""
+
+
+def spec_for(name: str) -> ModelSpec:
+    """Registry entry for a model, or a default spec for unregistered (e.g. fine-tuned) models."""
+    if name in MODELS:
+        return MODELS[name]
+    provider = 'anthropic' if name.startswith('claude') else 'openai'
+    return ModelSpec(name, provider, BASIC, 0.0)
+
+
+class ModelRouter:
+    """Picks, calls, and times models for each task."""
+
+    def __init__(self, path: Path = STATS_DB):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._clients: Dict[str, object] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, model: str, task: str, latency: float, ok: bool):
+        """Record the outcome of one call."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO model_calls (model, task, finished_at, latency, ok) VALUES (?, ?, ?, ?, ?)",
+                (model, task, time.time(), latency, int(ok))
+            )
+            conn.execute(
+                "DELETE FROM model_calls WHERE model = ? AND task = ? AND id <= ("
+                "SELECT id FROM model_calls WHERE model = ? AND task = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (model, task, model, task, KEEP_CALLS)
+            )
+
+    @contextmanager
+    def timed(self, task: str, model: str):
+        """Record the latency and outcome of the wrapped call."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.record(model, task, time.monotonic() - start, ok=False)
+            raise
+        self.record(model, task, time.monotonic() - start, ok=True)
+
+    def model_stats(self, model: str, task: str) -> Dict:
+        """
+        Recent performance of a model on a task.
+
+        Returns:
+            dict with calls, error_rate, p50_latency and p95_latency (seconds,
+            successful calls only; None without data), last_error_at and
+            last_ok
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT latency, ok, finished_at FROM model_calls WHERE model = ? AND task = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (model, task, WINDOW)
+            ).fetchall()
+
+        latencies = sorted(latency for latency, ok, _ in rows if ok)
+        errors = [finished_at for _, ok, finished_at in rows if not ok]
+        return {
+            'calls': len(rows),
+            'error_rate': len(errors) / len(rows) if rows else 0.0,
+            'p50_latency': statistics.median(latencies) if latencies else None,
+            'p95_latency': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else None,
+            'last_error_at': max(errors) if errors else None,
+            'last_ok': bool(rows[0][1]) if rows else None
+        }
+
+    def stats(self) -> List[Dict]:
+        """Recent performance of every (model, task) pair with recorded calls."""
+        with self._lock, self._connect() as conn:
+            pairs = conn.execute("SELECT DISTINCT model, task FROM model_calls ORDER BY task, model").fetchall()
+        return [{'model': model, 'task': task, **self.model_stats(model, task)} for model, task in pairs]
+
+    def is_healthy(self, model: str, task: str, stats: Optional[Dict] = None) -> bool:
+        """False if the model has recently been failing or slow on this task."""
+        stats = stats or self.model_stats(model, task)
+        if stats['last_ok'] is False and time.time() - stats['last_error_at'] < COOLDOWN_SECONDS:
+            return False
+        if stats['calls'] < MIN_SAMPLES:
+            return True
+        if stats['error_rate'] > MAX_ERROR_RATE:
+            return False
+        p50 = stats['p50_latency']
+        return p50 is None or p50 <= TASKS[task].latency_budget
+
+    def candidates(self, task: str, models: Optional[List[str]] = None) -> List[ModelSpec]:
+        """
+        Models to try for a task, best first.
+
+        Args:
+            task: Key of TASKS
+            models: Restrict routing to these models (default: every
+                registered model meeting the task's tier)
+
+        Returns:
+            Healthy models before unhealthy ones; within each group the
+            cheapest first, then the fastest
+        """
+        policy = TASKS[task]
+        if models is None:
+            specs = [spec for spec in MODELS.values() if spec.tier >= policy.min_tier]
+        else:
+            specs = [spec_for(name) for name in models]
+        specs = [spec for spec in specs if self._api_key(spec.provider)]
+
+        def rank(spec: ModelSpec):
+            stats = self.model_stats(spec.name, task)
+            p50 = stats['p50_latency']
+            return (not self.is_healthy(spec.name, task, stats), spec.cost, p50 if p50 is not None else 0.0)
+
+        return sorted(specs, key=rank)
+
+    def complete(
+        self,
+        task: str,
+        messages: List[Dict],
+        system: Optional[str] = None,
+        models: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Run a chat completion on the best available model for a task.
+
+        Args:
+            task: Key of TASKS
+            messages: Chat messages ({'role', 'content'}) without the system prompt
+            system: Optional system prompt
+            models: Restrict routing to these models
+
+        Returns:
+            dict with text, model and latency
+
+        Raises:
+            RuntimeError: If no model is available for the task
+            Exception: The last provider error if every candidate failed
+        """
+        policy = TASKS[task]
+        last_error = None
+
+        for spec in self._require_candidates(task, models):
+            start = time.monotonic()
+            try:
+                with self.timed(task, spec.name):
+                    text = self._complete(spec, policy, messages, system)
+            except Exception as e:
+                print(f"⚠ {spec.name} failed for {task} ({type(e).__name__}), trying next model")
+                last_error = e
+                continue
+            return {'text': text, 'model': spec.name, 'latency': time.monotonic() - start}
+
+        raise last_error
+
+    def stream(
+        self,
+        task: str,
+        messages: List[Dict],
+        system: Optional[str] = None,
+        models: Optional[List[str]] = None
+    ) -> Tuple[str, Iterator[str]]:
+        """
+        Stream a chat completion from the best available model for a task.
+
+        Failover happens while the request is being opened; once text has
+        started arriving, errors are raised to the caller.
+
+        Returns:
+            (model name, iterator of text deltas)
+        """
+        policy = TASKS[task]
+        last_error = None
+
+        for spec in self._require_candidates(task, models):
+            start = time.monotonic()
+            try:
+                deltas = self._open_stream(spec, policy, messages, system)
+            except Exception as e:
+                self.record(spec.name, task, time.monotonic() - start, ok=False)
+                print(f"⚠ {spec.name} failed for {task} ({type(e).__name__}), trying next model")
+                last_error = e
+                continue
+            return spec.name, self._timed_stream(task, spec.name, start, deltas)
+
+        raise last_error
+
+    def _require_candidates(self, task: str, models: Optional[List[str]]) -> List[ModelSpec]:
+        specs = self.candidates(task, models)
+        if not specs:
+            raise RuntimeError(f"No model available for {task} (check API keys)")
+        return specs
+
+    def _timed_stream(self, task: str, model: str, start: float, deltas: Iterator[str]) -> Iterator[str]:
+        try:
+            yield from deltas
+        except BaseException:
+            self.record(model, task, time.monotonic() - start, ok=False)
+            raise
+        self.record(model, task, time.monotonic() - start, ok=True)
+
+    @staticmethod
+    def _api_key(provider: str) -> Optional[str]:
+        return OPENAI_API_KEY if provider == 'openai' else ANTHROPIC_API_KEY
+
+    def client(self, provider: str):
+        """Shared API client for a provider (retries are left to failover)."""
+        with self._lock:
+            if provider not in self._clients:
+                if provider == 'openai':
+                    from openai import OpenAI
+                    self._clients[provider] = OpenAI(api_key=OPENAI_API_KEY, max_retries=1)
+                else:
+                    from anthropic import Anthropic
+                    self._clients[provider] = Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=1)
+            return self._clients[provider]
+
+    def _anthropic_args(self, spec: ModelSpec, policy: TaskSpec, messages: List[Dict], system: Optional[str]) -> Dict:
+        args = {
+            'model': spec.name,
+            'max_tokens': policy.max_tokens,
+            'messages': messages,
+            'timeout': policy.timeout
+        }
+        if system:
+            args['system'] = system
+        if policy.thinking_budget:
+            args['thinking'] = {'type': 'enabled', 'budget_tokens': policy.thinking_budget}
+            args['temperature'] = 1  # Required when thinking is enabled
+        return args
+
+    def _openai_messages(self, messages: List[Dict], system: Optional[str]) -> List[Dict]:
+        return ([{'role': 'system', 'content': system}] if system else []) + messages
+
+    def _complete(self, spec: ModelSpec, policy: TaskSpec, messages: List[Dict], system: Optional[str]) -> str:
+        client = self.client(spec.provider)
+
+        if spec.provider == 'anthropic':
+            response = client.messages.create(**self._anthropic_args(spec, policy, messages, system))
+            return ''.join(block.text for block in response.content if hasattr(block, 'text'))
+
+        response = client.chat.completions.create(
+            model=spec.name,
+            messages=self._openai_messages(messages, system),
+            timeout=policy.timeout
+        )
+        return response.choices[0].message.content
+
+    def _open_stream(self, spec: ModelSpec, policy: TaskSpec, messages: List[Dict], system: Optional[str]) -> Iterator[str]:
+        client = self.client(spec.provider)
+
+        if spec.provider == 'anthropic':
+            events = client.messages.create(**self._anthropic_args(spec, policy, messages, system), stream=True)
+            return (
+                event.delta.text for event in events
+                if event.type == 'content_block_delta' and event.delta.type == 'text_delta'
+            )
+
+        chunks = client.chat.completions.create(
+            model=spec.name,
+            messages=self._openai_messages(messages, system),
+            stream=True,
+            timeout=policy.timeout
+        )
+        return (
+            chunk.choices[0].delta.content for chunk in chunks
+            if chunk.choices and chunk.choices[0].delta.content
+        )
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """Return the process-wide router."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
@@ -0,0 +1,167 @@
+"""
+Result Cache
+
+Persistent key/value cache for expensive model results (transcripts,
+extracted keywords, ...), stored in SQLite so it survives across pipeline
+processes. Entries are evicted least-recently-used once a namespace holds
+more than max_entries. Hit and miss counters are kept per namespace.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class ResultCache:
+    """SQLite-backed LRU cache of JSON-serializable results."""
+
+    def __init__(self, path: Path, namespace: str, max_entries: int = 1000):
+        """
+        Open (or create) a cache.
+
+        Args:
+            path: SQLite database file (shared by all namespaces)
+            namespace: Name separating this cache's entries from others
+            max_entries: Entries kept in this namespace before LRU eviction
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute(
+                "INSERT OR IGNORE INTO counters (namespace) VALUES (?)",
+                (namespace,)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Returns:
+            The stored value, or None on a miss
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                conn.execute(
+                    "UPDATE counters SET misses = misses + 1 WHERE namespace = ?",
+                    (self.namespace,)
+                )
+                return None
+
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, key)
+            )
+            conn.execute(
+                "UPDATE counters SET hits = hits + 1 WHERE namespace = ?",
+                (self.namespace,)
+            )
+            return json.loads(row[0])
+
+    def __contains__(self, key: str) -> bool:
+        """Check for an entry without counting a hit or miss."""
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone() is not None
+
+    def put(self, key: str, value: Dict):
+        """Store a result, evicting the least recently used entries if full."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now, now)
+            )
+
+            excess = conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()[0] - self.max_entries
+
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key IN ("
+                    "SELECT key FROM entries WHERE namespace = ? ORDER BY accessed_at LIMIT ?)",
+                    (self.namespace, self.namespace, excess)
+                )
+                conn.execute(
+                    "UPDATE counters SET evictions = evictions + ? WHERE namespace = ?",
+                    (excess, self.namespace)
+                )
+
+    def invalidate(self, key: str = None):
+        """Remove one entry, or every entry in the namespace if key is None."""
+        with self._lock, self._connect() as conn:
+            if key is None:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+            else:
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict with entries, hits, misses, evictions and hit_rate
+        """
+        with self._lock, self._connect() as conn:
+            entries = conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()[0]
+            hits, misses, evictions = conn.execute(
+                "SELECT hits, misses, evictions FROM counters WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()
+
+        lookups = hits + misses
+        return {
+            'namespace': self.namespace,
+            'entries': entries,
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
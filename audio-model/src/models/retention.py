@@ -0,0 +1,328 @@
+"""
+Session Retention
+
+Keeps session storage bounded with small incremental passes over the
+session index (oldest first) instead of scanning every session directory:
+
+1. Expire: delete sessions older than SESSION_RETENTION_DAYS.
+2. Cold tier: compress the transcripts, JSON outputs and source PDFs of
+   finished sessions older than SESSION_COLD_AFTER_HOURS. A partial index
+   holds only finished sessions that are not cold, so compressed sessions
+   are never rescanned and thawed ones are compressed again.
+3. Quota: while the sessions' recorded disk usage exceeds
+   SESSION_DISK_QUOTA_MB, compress more finished sessions regardless of
+   SESSION_COLD_AFTER_HOURS, then delete further sessions past the
+   retention limit. Sessions within the limit are never deleted; if usage
+   is still over quota a warning is printed.
+
+Each step handles at most RETENTION_BATCH_SIZE sessions per pass, so a pass
+costs the same under sustained load and the backlog is worked off over
+successive passes. The deliverables (summary, highlighted PDFs, final.zip)
+are never compressed; compressed files are restored by thaw_session, which
+runs whenever a cold session's artifacts are listed (thaw_if_cold) and
+before batch reprocessing.
+
+Compression uses zstd when the optional zstandard package is installed and
+gzip otherwise. RetentionWorker runs passes in a background thread; only
+one process runs a pass at a time.
+"""
+
+import os
+import gzip
+import shutil
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from pipeline_config import PipelineConfig
+from src.models.blob_store import get_blob_store
+from src.models.session_artifacts import stored_artifacts
+from src.models.session_manager import (
+    cleanup_session,
+    deduplicate_session,
+    get_session_index,
+    get_session_metadata,
+    session_disk_bytes,
+    update_session_metadata,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COLD_DIRS = ('component1', 'component2', 'component3')
+COLD_EXTENSIONS = {'.json', '.pdf', '.txt'}
+COMPRESSED_SUFFIXES = ('.zst', '.gz')
+ZSTD_LEVEL = 10
+
+LOCK_FILE = 'retention.lock'
+
+
+def compress_file(path: Path) -> Path:
+    """
+    Replace a file with a compressed copy (.zst, or .gz without zstandard).
+
+    Returns:
+        Path of the compressed file
+    """
+    target = path.with_name(path.name + ('.zst' if zstandard else '.gz'))
+    temp_path = target.with_name(target.name + '.tmp')
+
+    with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+        if zstandard:
+            zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(src, dst)
+        else:
+            with gzip.GzipFile(fileobj=dst, mode='wb', mtime=0) as gz:
+                shutil.copyfileobj(src, gz)
+
+    os.replace(temp_path, target)
+    path.unlink()
+    return target
+
+
+def decompress_file(path: Path) -> Path:
+    """
+    Restore a file compressed by compress_file.
+
+    Returns:
+        Path of the restored file
+    """
+    target = path.with_suffix('')
+    temp_path = target.with_name(target.name + '.tmp')
+
+    with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+        if path.suffix == '.zst':
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to decompress {path}")
+            zstandard.ZstdDecompressor().copy_stream(src, dst)
+        else:
+            with gzip.GzipFile(fileobj=src, mode='rb') as gz:
+                shutil.copyfileobj(gz, dst)
+
+    os.replace(temp_path, target)
+    path.unlink()
+    return target
+
+
+def freeze_session(session_id: str) -> int:
+    """
+    Compress a session's transcripts, JSON outputs and source PDFs.
+
+    Files shared with other sessions through the blob store are left alone
+    (they are already stored once); a blob only this session used is
+    released.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Number of files compressed
+    """
+    session_path = PipelineConfig.SESSIONS_DIR / session_id
+    blob_store = get_blob_store()
+    digests = {artifact['name']: artifact['sha256'] for artifact in stored_artifacts(session_id)}
+    released = []
+    compressed = 0
+
+    for directory in COLD_DIRS:
+        for path in sorted((session_path / directory).rglob('*')):
+            if not path.is_file() or path.suffix.lower() not in COLD_EXTENSIONS:
+                continue
+
+            digest = digests.get(path.relative_to(session_path).as_posix())
+            linked = digest is not None and blob_store.is_linked(path, digest)
+            if path.stat().st_nlink > (2 if linked else 1):
+                continue
+
+            compress_file(path)
+            compressed += 1
+            if linked:
+                released.append(digest)
+
+    blob_store.release(released)
+
+    update_session_metadata(session_id, {
+        'cold_at': datetime.now().isoformat(),
+        'disk_bytes': session_disk_bytes(session_id)
+    })
+    return compressed
+
+
+def thaw_session(session_id: str) -> int:
+    """
+    Decompress a cold session's files so components can read them again.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Number of files restored
+    """
+    session_path = PipelineConfig.SESSIONS_DIR / session_id
+    restored = 0
+
+    for directory in COLD_DIRS:
+        for path in sorted((session_path / directory).rglob('*')):
+            if path.is_file() and path.suffix in COMPRESSED_SUFFIXES:
+                if path.with_suffix('').exists():
+                    # Crashed mid-compression: the original is intact
+                    path.unlink()
+                else:
+                    decompress_file(path)
+                restored += 1
+
+    deduplicate_session(session_id)
+    update_session_metadata(session_id, {
+        'cold_at': None,
+        'disk_bytes': session_disk_bytes(session_id)
+    })
+    return restored
+
+
+def thaw_if_cold(session_id: str) -> bool:
+    """
+    Thaw a session if it is in the cold tier.
+
+    Returns:
+        True if the session was thawed
+    """
+    if not get_session_metadata(session_id).get('cold_at'):
+        return False
+    thaw_session(session_id)
+    return True
+
+
+def _try_lock(path: Path):
+    """Open and exclusively lock path without blocking; None if held elsewhere."""
+    f = open(path, 'a')
+    if fcntl is None:
+        return f
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return f
+    except BlockingIOError:
+        f.close()
+        return None
+
+
+def run_retention_pass(now: Optional[datetime] = None, batch_size: int = None) -> Dict:
+    """
+    Run one incremental retention pass.
+
+    Args:
+        now: Current time (for testing)
+        batch_size: Maximum sessions per step (default: RETENTION_BATCH_SIZE)
+
+    Returns:
+        Dictionary with expired, frozen and evicted (expired sessions deleted
+        beyond the batch to get under quota) session counts and the recorded
+        disk usage afterwards ({'skipped': True} if another process
+        is running a pass)
+    """
+    now = now or datetime.now()
+    batch_size = batch_size or PipelineConfig.RETENTION_BATCH_SIZE
+
+    lock = _try_lock(PipelineConfig.SESSIONS_DIR / LOCK_FILE)
+    if lock is None:
+        return {'skipped': True}
+
+    try:
+        index = get_session_index()
+        result = {'expired': 0, 'frozen': 0, 'evicted': 0}
+
+        # 1. Expire sessions past the retention limit
+        cutoff = (now - timedelta(days=PipelineConfig.SESSION_RETENTION_DAYS)).isoformat()
+        for session_id in index.created_before(cutoff, limit=batch_size):
+            try:
+                cleanup_session(session_id)
+            except Exception as e:
+                print(f"⚠ Could not delete session {session_id}: {e}")
+                continue
+            result['expired'] += 1
+
+        # 2. Move finished sessions to the cold tier (including thawed ones).
+        # Sessions still unfinished are not candidates and are left to expire.
+        cold_cutoff = (now - timedelta(hours=PipelineConfig.SESSION_COLD_AFTER_HOURS)).isoformat()
+        for metadata in index.warm_finished(cold_cutoff, limit=batch_size):
+            freeze_session(metadata['session_id'])
+            result['frozen'] += 1
+
+        # 3. Enforce the disk quota: compress finished sessions of any age,
+        # then delete more of the expired backlog. Nothing within the
+        # retention limit is deleted.
+        quota = PipelineConfig.SESSION_DISK_QUOTA_MB * 1024 * 1024
+        usage = index.disk_usage()
+        if usage > quota:
+            for metadata in index.warm_finished(now.isoformat(), limit=batch_size):
+                freeze_session(metadata['session_id'])
+                result['frozen'] += 1
+                usage = index.disk_usage()
+                if usage <= quota:
+                    break
+        if usage > quota:
+            for session_id in index.created_before(cutoff, limit=batch_size):
+                try:
+                    cleanup_session(session_id)
+                except Exception as e:
+                    print(f"⚠ Could not delete session {session_id}: {e}")
+                    continue
+                result['evicted'] += 1
+                usage = index.disk_usage()
+                if usage <= quota:
+                    break
+        if usage > quota:
+            print(f"⚠ Session storage still over quota: {usage / (1024 * 1024):.0f}MB "
+                  f"(quota {PipelineConfig.SESSION_DISK_QUOTA_MB}MB)")
+
+        result['disk_bytes'] = usage
+        if result['expired'] or result['frozen'] or result['evicted']:
+            print(f"✓ Retention: {result['expired']} expired, {result['frozen']} compressed, "
+                  f"{result['evicted']} evicted for quota")
+        return result
+
+    finally:
+        lock.close()
+
+
+class RetentionWorker(threading.Thread):
+    """Background thread running a retention pass every interval."""
+
+    def __init__(self, interval: float = None):
+        """
+        Args:
+            interval: Seconds between passes (default: RETENTION_INTERVAL_SECONDS)
+        """
+        super().__init__(name='session-retention', daemon=True)
+        self.interval = interval or PipelineConfig.RETENTION_INTERVAL_SECONDS
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                run_retention_pass()
+            except Exception as e:
+                print(f"✗ Retention pass failed: {e}")
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        """Stop after the current pass."""
+        self._stopped.set()
+
+
+_worker: Optional[RetentionWorker] = None
+
+
+def start_retention_worker(interval: float = None) -> RetentionWorker:
+    """Start the background retention worker (once per process)."""
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = RetentionWorker(interval)
+        _worker.start()
+    return _worker
@@ -0,0 +1,229 @@
+"""
+Session Artifact Manifest
+
+Each component records the files it writes in the session's manifest.json
+(name, kind, index, size, SHA-256, content type), so finding a session's
+outputs is one small read instead of probing a fixed set of paths, and a
+session can have any number of sources.
+
+Kinds: audio, input_text, transcript, keywords, source_metadata, source,
+summary, highlighted_source, final_zip. Sources and highlighted sources carry
+their 1-based index; artifacts published to the storage backend carry their
+object key. URLs are made from the key when requested, since presigned ones
+expire.
+"""
+
+import os
+import re
+import json
+import mimetypes
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pipeline_config import PipelineConfig
+from src.models.blob_store import file_sha256
+
+MANIFEST_FILE = 'manifest.json'
+
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.json': 'application/json',
+    '.zip': 'application/zip',
+    '.txt': 'text/plain',
+}
+
+# Known session file names, for backfilling sessions written before the manifest
+KNOWN_FILES = [
+    (re.compile(r'input/audio\.\w+'), 'audio'),
+    (re.compile(r'input/transcript\.txt'), 'input_text'),
+    (re.compile(r'component1/transcript\.json'), 'transcript'),
+    (re.compile(r'component2/keywords\.json'), 'keywords'),
+    (re.compile(r'component3/metadata\.json'), 'source_metadata'),
+    (re.compile(r'component3/source_(\d+)\.pdf'), 'source'),
+    (re.compile(r'component4/summary\.pdf'), 'summary'),
+    (re.compile(r'component4/source_(\d+)_highlighted\.pdf'), 'highlighted_source'),
+    (re.compile(r'component4/final\.zip'), 'final_zip'),
+]
+
+# A session's components run in one process, one at a time; this guards
+# threads within it
+_lock = threading.Lock()
+
+
+def _session_path(session_id: str) -> Path:
+    return PipelineConfig.SESSIONS_DIR / session_id
+
+
+def content_type(path: Path) -> str:
+    """MIME type of a session file."""
+    return (CONTENT_TYPES.get(path.suffix.lower())
+            or mimetypes.guess_type(path.name)[0]
+            or 'application/octet-stream')
+
+
+def artifact_key(session_id: str, name: str) -> str:
+    """Storage backend key of a session file (name is relative to the session)."""
+    return f"{session_id}/{name}"
+
+
+def _read(session_path: Path) -> Optional[Dict[str, Dict]]:
+    try:
+        with open(session_path / MANIFEST_FILE, 'r') as f:
+            artifacts = json.load(f)['artifacts']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+    for entry in artifacts.values():
+        # Older manifests stored the (possibly expiring) URL instead of the key
+        if 'url' in entry:
+            del entry['url']
+            entry['key'] = artifact_key(session_path.name, entry['name'])
+    return artifacts
+
+
+def _write(session_path: Path, artifacts: Dict[str, Dict]):
+    manifest_path = session_path / MANIFEST_FILE
+    temp_path = manifest_path.with_name(MANIFEST_FILE + '.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump({'artifacts': artifacts}, f, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+def _entry(
+    session_path: Path,
+    path: Path,
+    kind: str,
+    index: Optional[int],
+    sha256: Optional[str],
+    key: Optional[str] = None
+) -> Dict:
+    entry = {
+        'name': path.relative_to(session_path).as_posix(),
+        'kind': kind,
+        'size': path.stat().st_size,
+        'sha256': sha256 or file_sha256(path),
+        'content_type': content_type(path),
+        'created_at': datetime.now().isoformat()
+    }
+    if index is not None:
+        entry['index'] = index
+    if key is not None:
+        entry['key'] = key
+    return entry
+
+
+def record_artifact(
+    session_id: str,
+    path: Path,
+    kind: str,
+    index: Optional[int] = None,
+    sha256: Optional[str] = None,
+    key: Optional[str] = None
+) -> Dict:
+    """
+    Add (or replace) a file in the session's manifest.
+
+    Args:
+        session_id: The session ID
+        path: The written file, inside the session directory
+        kind: Artifact kind (see module docstring)
+        index: 1-based position for sources and highlighted sources
+        sha256: The file's SHA-256, if already known
+        key: Storage backend key the artifact was published under, if it was
+
+    Returns:
+        The manifest entry
+    """
+    session_path = _session_path(session_id)
+    entry = _entry(session_path, Path(path), kind, index, sha256, key)
+
+    with _lock:
+        artifacts = _read(session_path)
+        if artifacts is None:
+            artifacts = _scan(session_path)
+        artifacts[entry['name']] = entry
+        _write(session_path, artifacts)
+    return entry
+
+
+def remove_artifacts(session_id: str, kind: str):
+    """
+    Drop all artifacts of a kind from the manifest (before a component re-run).
+
+    Args:
+        session_id: The session ID
+        kind: Artifact kind
+    """
+    session_path = _session_path(session_id)
+    with _lock:
+        artifacts = _read(session_path)
+        if artifacts is None:
+            artifacts = _scan(session_path)
+        artifacts = {name: a for name, a in artifacts.items() if a['kind'] != kind}
+        _write(session_path, artifacts)
+
+
+def _scan(session_path: Path) -> Dict[str, Dict]:
+    """Build manifest entries from the files of a session written without one."""
+    artifacts = {}
+    for path in sorted(session_path.glob('*/*')):
+        name = path.relative_to(session_path).as_posix()
+        for pattern, kind in KNOWN_FILES:
+            match = pattern.fullmatch(name)
+            if match and path.is_file():
+                index = int(match.group(1)) if match.groups() else None
+                artifacts[name] = _entry(session_path, path, kind, index, None)
+                break
+    return artifacts
+
+
+def list_artifacts(session_id: str, kind: str = None) -> List[Dict]:
+    """
+    Artifacts of a session, optionally of one kind, ordered by index.
+
+    A session without a manifest is scanned once and the manifest written;
+    a session in the retention cold tier is decompressed first, so the
+    listed files can be read.
+
+    Args:
+        session_id: The session ID
+        kind: Optional artifact kind
+
+    Returns:
+        List of manifest entries
+    """
+    from src.models.retention import thaw_if_cold
+    thaw_if_cold(session_id)
+
+    entries = [a for a in _load(session_id).values() if kind is None or a['kind'] == kind]
+    return sorted(entries, key=lambda a: (a.get('index', 0), a['name']))
+
+
+def _load(session_id: str) -> Dict[str, Dict]:
+    """The manifest's entries as stored, backfilling it if missing."""
+    session_path = _session_path(session_id)
+    artifacts = _read(session_path)
+    if artifacts is None:
+        if not session_path.is_dir():
+            return {}
+        with _lock:
+            artifacts = _scan(session_path)
+            _write(session_path, artifacts)
+    return artifacts
+
+
+def stored_artifacts(session_id: str) -> List[Dict]:
+    """
+    Manifest entries as stored, without thawing a cold-tier session.
+
+    Their SHA-256 is also how the blob store knows which blob a session
+    file links to.
+    """
+    return list(_load(session_id).values())
+
+
+def artifact_paths(session_id: str, kind: str) -> List[Path]:
+    """Paths of a session's artifacts of one kind, ordered by index."""
+    session_path = _session_path(session_id)
+    return [session_path / a['name'] for a in list_artifacts(session_id, kind)]
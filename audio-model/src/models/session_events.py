@@ -0,0 +1,137 @@
+"""
+Session Event Log
+
+Each session directory has an append-only events.jsonl: every metadata
+update is one line, appended with a single O_APPEND write, so concurrent
+writers never rewrite or clobber each other's updates. metadata.json is a
+snapshot that compact() folds the log into (on completion or failure);
+the current metadata is always the snapshot plus the events after it.
+
+Appends hold a shared flock and compaction an exclusive one, so a log is
+never truncated while another process is appending to it.
+"""
+
+import os
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still atomic, compaction unlocked
+    fcntl = None
+
+EVENTS_FILE = 'events.jsonl'
+SNAPSHOT_FILE = 'metadata.json'
+
+
+@contextmanager
+def _flock(fd: int, exclusive: bool):
+    """Hold a shared or exclusive lock on an open file."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def append_event(session_path: Path, updates: Dict):
+    """
+    Append a metadata update to a session's event log.
+
+    Args:
+        session_path: Session directory
+        updates: Fields set by this update
+    """
+    line = json.dumps({'ts': datetime.now().isoformat(), 'updates': updates}) + '\n'
+    fd = os.open(session_path / EVENTS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        with _flock(fd, exclusive=False):
+            os.write(fd, line.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def _parse_events(data: bytes) -> List[Dict]:
+    events = []
+    for line in data.decode('utf-8', errors='replace').splitlines():
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Torn last line from a crashed writer
+            continue
+    return events
+
+
+def read_events(session_path: Path) -> List[Dict]:
+    """Events appended since the last compaction, oldest first."""
+    events_path = session_path / EVENTS_FILE
+    if not events_path.exists():
+        return []
+    return _parse_events(events_path.read_bytes())
+
+
+def _read_snapshot(session_path: Path) -> Optional[Dict]:
+    try:
+        with open(session_path / SNAPSHOT_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_snapshot(session_path: Path, metadata: Dict):
+    """Atomically replace a session's metadata.json."""
+    snapshot_path = session_path / SNAPSHOT_FILE
+    temp_path = snapshot_path.with_name(SNAPSHOT_FILE + '.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(temp_path, snapshot_path)
+
+
+def _apply(metadata: Optional[Dict], events: List[Dict], session_id: str) -> Optional[Dict]:
+    if metadata is None and not events:
+        return None
+    metadata = dict(metadata or {'session_id': session_id})
+    for event in events:
+        metadata.update(event.get('updates', {}))
+    return metadata
+
+
+def load_metadata(session_path: Path) -> Optional[Dict]:
+    """
+    Materialize a session's metadata from its snapshot and event log.
+
+    Returns:
+        Metadata dictionary, or None if the session has neither
+    """
+    return _apply(_read_snapshot(session_path), read_events(session_path), session_path.name)
+
+
+def compact(session_path: Path) -> Optional[Dict]:
+    """
+    Fold the event log into metadata.json and empty the log.
+
+    Replaying events is idempotent, so a crash between writing the
+    snapshot and truncating the log loses nothing.
+
+    Returns:
+        The compacted metadata
+    """
+    fd = os.open(session_path / EVENTS_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        with _flock(fd, exclusive=True):
+            with os.fdopen(os.dup(fd), 'rb') as f:
+                events = _parse_events(f.read())
+
+            metadata = _apply(_read_snapshot(session_path), events, session_path.name)
+            if metadata is not None:
+                write_snapshot(session_path, metadata)
+            os.ftruncate(fd, 0)
+    finally:
+        os.close(fd)
+    return metadata
@@ -0,0 +1,250 @@
+"""
+Session Index
+
+SQLite index of session metadata, so listing, counting and expiring
+sessions are indexed queries instead of a scan of every session directory.
+Session directories hold only files (inputs and component outputs) and
+the per-session metadata log (session_events.py), which rebuild() replays.
+Triggers keep a running total of the sessions' disk_bytes, so disk_usage()
+is a single-row read.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Statuses of sessions that are done processing (also spelled out in the SQL below)
+FINAL_STATUSES = ('completed', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    disk_bytes INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_status_created ON sessions (status, created_at);
+CREATE INDEX IF NOT EXISTS sessions_created ON sessions (created_at);
+-- Finished sessions not in the retention cold tier (see warm_finished)
+CREATE INDEX IF NOT EXISTS sessions_warm_finished ON sessions (created_at, session_id)
+    WHERE status IN ('completed', 'failed') AND json_extract(metadata, '$.cold_at') IS NULL;
+"""
+
+TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS sessions_disk_insert AFTER INSERT ON sessions BEGIN
+    UPDATE totals SET value = value + NEW.disk_bytes WHERE name = 'disk_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS sessions_disk_update AFTER UPDATE OF disk_bytes ON sessions BEGIN
+    UPDATE totals SET value = value + NEW.disk_bytes - OLD.disk_bytes WHERE name = 'disk_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS sessions_disk_delete AFTER DELETE ON sessions BEGIN
+    UPDATE totals SET value = value - OLD.disk_bytes WHERE name = 'disk_bytes';
+END;
+"""
+
+
+class SessionIndex:
+    """SQLite-backed store of session metadata."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self.path.exists()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            conn.executescript(TRIGGERS)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Rows removed by INSERT OR REPLACE must fire the delete trigger
+        conn.execute("PRAGMA recursive_triggers=ON")
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add the disk_bytes column to older indexes and seed the running total."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if 'disk_bytes' not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN disk_bytes INTEGER NOT NULL DEFAULT 0")
+            conn.execute(
+                "UPDATE sessions SET disk_bytes = COALESCE(json_extract(metadata, '$.disk_bytes'), 0)"
+            )
+        if conn.execute("SELECT 1 FROM totals WHERE name = 'disk_bytes'").fetchone() is None:
+            conn.execute(
+                "INSERT INTO totals (name, value) SELECT 'disk_bytes', COALESCE(SUM(disk_bytes), 0) FROM sessions"
+            )
+
+    @staticmethod
+    def _row(metadata: Dict) -> tuple:
+        return (
+            metadata['session_id'],
+            metadata.get('status'),
+            metadata.get('created_at'),
+            metadata.get('updated_at'),
+            int(metadata.get('disk_bytes') or 0),
+            json.dumps(metadata)
+        )
+
+    def put(self, metadata: Dict):
+        """Insert or replace a session's metadata."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, status, created_at, updated_at, disk_bytes, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(metadata)
+            )
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Metadata of a session, or None if it is not indexed."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT metadata FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, session_id: str, updates: Dict, default: Optional[Dict] = None) -> Dict:
+        """
+        Merge updates into a session's metadata atomically.
+
+        Args:
+            session_id: The session ID
+            updates: Fields to set
+            default: Metadata to start from if the session is not indexed
+
+        Returns:
+            The merged metadata
+        """
+        with self._lock, self._connect() as conn:
+            # Take the write lock before reading so concurrent updates don't interleave
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT metadata FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+            metadata = json.loads(row[0]) if row else dict(default or {'session_id': session_id})
+            metadata.update(updates)
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, status, created_at, updated_at, disk_bytes, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(metadata)
+            )
+        return metadata
+
+    def delete(self, session_id: str):
+        """Remove a session from the index."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def list(self, status: str = None, limit: int = None, offset: int = 0) -> List[Dict]:
+        """
+        Session metadata, newest first.
+
+        Args:
+            status: Optional status filter
+            limit: Page size (None for all)
+            offset: Number of sessions to skip
+
+        Returns:
+            List of metadata dictionaries
+        """
+        query = "SELECT metadata FROM sessions"
+        params = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, status: str = None) -> int:
+        """Number of sessions, optionally with a given status."""
+        with self._lock, self._connect() as conn:
+            if status is None:
+                return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            return conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE status = ?",
+                (status,)
+            ).fetchone()[0]
+
+    def created_before(self, cutoff: str, limit: int = None) -> List[str]:
+        """IDs of sessions created before an ISO timestamp, oldest first."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT session_id FROM sessions WHERE created_at < ? ORDER BY created_at LIMIT ?",
+                (cutoff, -1 if limit is None else limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def warm_finished(self, created_before: str, limit: int = None) -> List[Dict]:
+        """
+        Finished sessions not yet in the cold tier, oldest first.
+
+        Served by a partial index, so sessions already compressed are never
+        rescanned, and a thawed session (cold_at cleared) is picked up again.
+
+        Args:
+            created_before: Only sessions created before this ISO timestamp
+            limit: Maximum number of sessions
+
+        Returns:
+            List of metadata dictionaries
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT metadata FROM sessions INDEXED BY sessions_warm_finished "
+                "WHERE status IN ('completed', 'failed') AND json_extract(metadata, '$.cold_at') IS NULL "
+                "AND created_at < ? ORDER BY created_at, session_id LIMIT ?",
+                (created_before, -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def disk_usage(self) -> int:
+        """Total of the sessions' recorded disk_bytes (kept up to date by triggers)."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value FROM totals WHERE name = 'disk_bytes'").fetchone()
+        return row[0] if row else 0
+
+    def rebuild(self, sessions: Iterable[Dict]) -> int:
+        """
+        Replace the index contents.
+
+        Args:
+            sessions: Metadata of every session
+
+        Returns:
+            Number of sessions indexed
+        """
+        rows = [self._row(metadata) for metadata in sessions]
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (session_id, status, created_at, updated_at, disk_bytes, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
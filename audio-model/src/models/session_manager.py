@@ -2,15 +2,75 @@
 Session Management Utilities
 
 Handles session-based storage for web API mode.
+
+Session metadata lives in a SQLite index (see session_index.py), so listing,
+counting and cleanup never scan the session directories. Each session
+directory holds the session's files plus an append-only metadata log
+(see session_events.py) that rebuild_session_index() can recover the index
+from. Binary artifacts of finished sessions are hard links into the shared
+content-addressed blob store (see blob_store.py).
 """
 
+import io
+import os
 import uuid
-import json
 import shutil
+import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union, BinaryIO, Iterable
 from pipeline_config import PipelineConfig
+from src.models.session_index import SessionIndex, FINAL_STATUSES
+from src.models import session_events
+from src.models.blob_store import DEDUP_EXTENSIONS, file_sha256, get_blob_store
+from src.models.session_artifacts import (
+    record_artifact, list_artifacts, stored_artifacts, content_type, artifact_key
+)
+from src.models.artifact_storage import Upload, get_storage_backend
+
+# Audio can be ingested from bytes, a file path, an open binary file or a chunk iterator
+AudioSource = Union[bytes, str, Path, BinaryIO, Iterable[bytes]]
+
+INGEST_CHUNK_SIZE = 1024 * 1024
+
+_session_indexes: Dict[Path, SessionIndex] = {}
+
+
+def get_session_index() -> SessionIndex:
+    """
+    Return the session index for the current SESSIONS_DIR.
+
+    A new index is backfilled from existing session directories once.
+    """
+    path = PipelineConfig.SESSIONS_DIR / PipelineConfig.SESSION_INDEX_FILE
+    index = _session_indexes.get(path)
+    if index is None:
+        index = SessionIndex(path)
+        if index.created:
+            count = index.rebuild(_load_all_metadata())
+            if count:
+                print(f"✓ Indexed {count} existing sessions")
+        _session_indexes[path] = index
+    return index
+
+
+def _load_all_metadata() -> Iterable[Dict]:
+    """Materialize the metadata of every session directory on disk."""
+    for session_path in PipelineConfig.SESSIONS_DIR.iterdir():
+        if session_path.is_dir():
+            metadata = session_events.load_metadata(session_path)
+            if metadata is not None:
+                yield metadata
+
+
+def rebuild_session_index() -> int:
+    """
+    Re-create the session index from the metadata logs on disk.
+
+    Returns:
+        Number of sessions indexed
+    """
+    return get_session_index().rebuild(_load_all_metadata())
 
 
 def create_session(session_id: str = None) -> str:
@@ -35,15 +95,15 @@ def create_session(session_id: str = None) -> str:
     (session_path / 'component3').mkdir(parents=True, exist_ok=True)
     (session_path / 'component4').mkdir(parents=True, exist_ok=True)
 
-    # Create metadata file
+    # Index metadata
     metadata = {
         'session_id': session_id,
         'created_at': datetime.now().isoformat(),
         'status': 'initialized'
     }
 
-    with open(session_path / 'metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=2)
+    session_events.write_snapshot(session_path, metadata)
+    get_session_index().put(metadata)
 
     return session_id
 
@@ -82,52 +142,255 @@ def get_session_metadata(session_id: str) -> Dict:
     Returns:
         Dictionary with session metadata
     """
-    metadata_path = PipelineConfig.SESSIONS_DIR / session_id / 'metadata.json'
+    metadata = get_session_index().get(session_id)
 
-    if not metadata_path.exists():
+    if metadata is None:
+        # Not indexed yet (e.g. written by an older version): read the log
+        session_path = PipelineConfig.SESSIONS_DIR / session_id
+        if session_path.is_dir():
+            metadata = session_events.load_metadata(session_path)
+
+    if metadata is None:
         return {'session_id': session_id, 'status': 'not_found'}
 
-    with open(metadata_path, 'r') as f:
-        return json.load(f)
+    return metadata
 
 
 def update_session_metadata(session_id: str, updates: Dict):
     """
     Update session metadata.
 
+    The update is appended to the session's event log and merged into the
+    index in one transaction, so concurrent updates are never lost. The log
+    is compacted into metadata.json once the session reaches a final status.
+
     Args:
         session_id: The session ID
         updates: Dictionary of updates to apply
     """
-    metadata_path = PipelineConfig.SESSIONS_DIR / session_id / 'metadata.json'
+    session_path = PipelineConfig.SESSIONS_DIR / session_id
+    if not session_path.exists():
+        # e.g. a failure before the session was created
+        return
+
+    updates = {**updates, 'updated_at': datetime.now().isoformat()}
+    session_events.append_event(session_path, updates)
+    get_session_index().update(session_id, updates)
+
+    # Once finished, compact the log and move artifacts into the blob store
+    if updates.get('status') in FINAL_STATUSES:
+        session_events.compact(session_path)
+        deduplicate_session(session_id)
+        update_session_metadata(session_id, {'disk_bytes': session_disk_bytes(session_id)})
+
+
+def session_disk_bytes(session_id: str) -> int:
+    """
+    Disk space used by a session.
+
+    Files shared via the blob store are split evenly between the sessions
+    linking them.
 
-    # Read current metadata
-    if metadata_path.exists():
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Size in bytes
+    """
+    total = 0
+    for path in (PipelineConfig.SESSIONS_DIR / session_id).rglob('*'):
+        if path.is_file():
+            st = path.stat()
+            total += st.st_size // (st.st_nlink - 1) if st.st_nlink > 1 else st.st_size
+    return total
+
+
+def deduplicate_session(session_id: str) -> Dict[str, str]:
+    """
+    Replace a session's binary artifacts with links into the blob store.
+
+    Blobs are keyed by the SHA-256 recorded in the artifact manifest; a file
+    whose size no longer matches its entry is re-hashed and re-recorded.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Deduplicated files (relative path -> SHA-256)
+    """
+    session_path = PipelineConfig.SESSIONS_DIR / session_id
+    if not session_path.exists():
+        return {}
+
+    blob_store = get_blob_store()
+    linked = {}
+    for artifact in stored_artifacts(session_id):
+        path = session_path / artifact['name']
+        if path.suffix.lower() not in DEDUP_EXTENSIONS or not path.is_file():
+            continue
+
+        digest = artifact['sha256']
+        if path.stat().st_size != artifact['size']:
+            # Rewritten since it was recorded: the old blob may now be unused
+            digest = file_sha256(path)
+            record_artifact(session_id, path, artifact['kind'], artifact.get('index'), digest, artifact.get('key'))
+            blob_store.release([artifact['sha256']])
+
+        if blob_store.add(path, digest):
+            linked[artifact['name']] = digest
+    return linked
+
+
+def open_artifact_upload(session_id: str, name: str, content_type: str) -> Optional[Upload]:
+    """
+    Start publishing a session file to the storage backend while it is written.
+
+    Args:
+        session_id: The session ID
+        name: File path relative to the session directory
+        content_type: MIME type
+
+    Returns:
+        A streaming upload, or None if the backend stores the session file
+        itself (the default local backend)
+    """
+    backend = get_storage_backend()
+    key = artifact_key(session_id, name)
+    if backend.local_path(key) == PipelineConfig.SESSIONS_DIR / session_id / name:
+        return None
+    return backend.open_upload(key, content_type)
+
+
+def artifact_url(session_id: str, name: str) -> str:
+    """
+    URL of a published session file.
+
+    Generated on each call: S3 URLs may be presigned and expire, so they are
+    never stored.
+    """
+    return get_storage_backend().url(artifact_key(session_id, name))
+
+
+def _iter_audio_chunks(source: AudioSource, chunk_size: int) -> Iterable[bytes]:
+    """Yield an audio source as byte chunks without loading it all at once."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    elif isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+    elif isinstance(source, io.IOBase) or hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), b'')
     else:
-        metadata = {'session_id': session_id}
+        yield from source
+
+
+def ingest_audio(
+    session_id: str,
+    source: AudioSource,
+    format: str,
+    max_bytes: Optional[int] = None
+) -> Dict:
+    """
+    Stream audio into the session input directory in a single pass.
 
-    # Apply updates
-    metadata.update(updates)
-    metadata['updated_at'] = datetime.now().isoformat()
+    Size and SHA-256 are computed while writing, and the size limit is
+    enforced as soon as it is crossed (or up front for file paths). The file
+    is written as .part and renamed once complete, and published to the
+    storage backend in the same pass.
 
-    # Write back
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    Args:
+        session_id: The session ID
+        source: Bytes, file path, binary file object or iterator of byte chunks
+        format: Audio format, used as the file extension
+        max_bytes: Optional maximum size in bytes
+
+    Returns:
+        Dictionary with path, size_bytes, sha256 and url
+
+    Raises:
+        ValueError: If the audio is larger than max_bytes
+    """
+    if max_bytes is not None and isinstance(source, (str, Path)):
+        size = Path(source).stat().st_size
+        if size > max_bytes:
+            raise ValueError(
+                f"Audio file too large: {size / (1024 * 1024):.1f}MB "
+                f"(max: {max_bytes / (1024 * 1024):.0f}MB)"
+            )
+
+    input_path = get_session_path(session_id) / 'input' / f'audio.{format}'
+    input_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = input_path.with_name(input_path.name + '.part')
+
+    name = f'input/{input_path.name}'
+    upload = open_artifact_upload(session_id, name, content_type(input_path))
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial_path, 'wb') as f:
+            for chunk in _iter_audio_chunks(source, INGEST_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise ValueError(
+                        f"Audio file too large: over {max_bytes / (1024 * 1024):.0f}MB"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+                if upload:
+                    upload.write(chunk)
+        os.replace(partial_path, input_path)
+        if upload:
+            upload.complete()
+    except BaseException:
+        if upload:
+            upload.abort()
+        raise
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+
+    record_artifact(session_id, input_path, 'audio', sha256=digest.hexdigest(), key=artifact_key(session_id, name))
+
+    return {
+        'path': input_path,
+        'size_bytes': size,
+        'sha256': digest.hexdigest(),
+        'url': artifact_url(session_id, name)
+    }
 
 
 def cleanup_session(session_id: str):
     """
     Delete all files for a session.
 
+    Published copies in the storage backend are deleted first, so a backend
+    error leaves the session (and its manifest) in place to retry later.
+    Blobs the session linked to are freed once no other session uses them.
+
     Args:
         session_id: The session ID to delete
     """
     session_path = PipelineConfig.SESSIONS_DIR / session_id
 
     if session_path.exists():
+        artifacts = stored_artifacts(session_id)
+        backend = get_storage_backend()
+        for artifact in artifacts:
+            if 'key' not in artifact:
+                continue
+            # The default local backend stores the session file itself
+            if backend.local_path(artifact['key']) != session_path / artifact['name']:
+                backend.delete(artifact['key'])
+
+        # Releasing a blob the session never linked is a no-op
+        digests = [artifact['sha256'] for artifact in artifacts]
         shutil.rmtree(session_path)
+        get_blob_store().release(digests)
+
+    get_session_index().delete(session_id)
 
 
 def cleanup_old_sessions(days: int = None):
@@ -144,64 +407,54 @@ def cleanup_old_sessions(days: int = None):
         days = PipelineConfig.SESSION_RETENTION_DAYS
 
     cutoff_date = datetime.now() - timedelta(days=days)
-    deleted_count = 0
-
-    for session_path in PipelineConfig.SESSIONS_DIR.iterdir():
-        if not session_path.is_dir():
-            continue
+    expired = get_session_index().created_before(cutoff_date.isoformat())
 
-        metadata_path = session_path / 'metadata.json'
-        if not metadata_path.exists():
-            continue
-
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-
-            created_at = datetime.fromisoformat(metadata['created_at'])
-
-            if created_at < cutoff_date:
-                shutil.rmtree(session_path)
-                deleted_count += 1
-
-        except (KeyError, ValueError, json.JSONDecodeError):
-            # Skip sessions with invalid metadata
-            continue
+    for session_id in expired:
+        cleanup_session(session_id)
 
-    return deleted_count
+    return len(expired)
 
 
-def list_sessions(status: str = None) -> List[Dict]:
+def list_sessions(status: str = None, limit: int = None, offset: int = 0) -> List[Dict]:
     """
-    List all sessions, optionally filtered by status.
+    List sessions, newest first, optionally filtered by status.
 
     Args:
         status: Optional status filter ('initialized', 'processing', 'completed', 'failed')
+        limit: Optional page size
+        offset: Number of sessions to skip (for pagination)
 
     Returns:
         List of session metadata dictionaries
     """
-    sessions = []
+    return get_session_index().list(status=status, limit=limit, offset=offset)
 
-    for session_path in PipelineConfig.SESSIONS_DIR.iterdir():
-        if not session_path.is_dir():
-            continue
 
-        metadata_path = session_path / 'metadata.json'
-        if not metadata_path.exists():
-            continue
+def count_sessions(status: str = None) -> int:
+    """
+    Count sessions, optionally filtered by status.
+
+    Args:
+        status: Optional status filter
 
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+    Returns:
+        Number of sessions
+    """
+    return get_session_index().count(status=status)
 
-            if status is None or metadata.get('status') == status:
-                sessions.append(metadata)
 
-        except (json.JSONDecodeError, KeyError):
-            continue
+def get_session_artifacts(session_id: str, kind: str = None) -> List[Dict]:
+    """
+    Get a session's artifact manifest entries, ready to be read.
+
+    Args:
+        session_id: The session ID
+        kind: Optional artifact kind (see session_artifacts.py)
 
-    return sorted(sessions, key=lambda x: x.get('created_at', ''), reverse=True)
+    Returns:
+        List of manifest entries (name is relative to the session directory)
+    """
+    return list_artifacts(session_id, kind)
 
 
 def get_session_files(session_id: str) -> Dict[str, Path]:
@@ -217,43 +470,22 @@ def get_session_files(session_id: str) -> Dict[str, Path]:
     session_path = PipelineConfig.SESSIONS_DIR / session_id
     files = {}
 
-    # Component outputs
-    component1_path = session_path / 'component1' / 'transcript.json'
-    if component1_path.exists():
-        files['transcript'] = component1_path
-
-    component2_path = session_path / 'component2' / 'keywords.json'
-    if component2_path.exists():
-        files['keywords'] = component2_path
-
-    # Component 3 sources
-    component3_path = session_path / 'component3'
-    source_files = []
-    for i in range(1, 10):  # Check for up to 9 sources
-        source_path = component3_path / f'source_{i}.pdf'
-        if source_path.exists():
-            source_files.append(source_path)
-    if source_files:
-        files['sources'] = source_files
-
-    # Component 4 outputs
-    component4_path = session_path / 'component4'
-
-    summary_pdf = component4_path / 'summary.pdf'
-    if summary_pdf.exists():
-        files['summary_pdf'] = summary_pdf
-
-    final_zip = component4_path / 'final.zip'
-    if final_zip.exists():
-        files['final_zip'] = final_zip
-
-    # Highlighted sources
-    highlighted_files = []
-    for i in range(1, 10):
-        highlighted_path = component4_path / f'source_{i}_highlighted.pdf'
-        if highlighted_path.exists():
-            highlighted_files.append(highlighted_path)
-    if highlighted_files:
-        files['highlighted_sources'] = highlighted_files
+    single = {
+        'transcript': 'transcript',
+        'keywords': 'keywords',
+        'summary': 'summary_pdf',
+        'final_zip': 'final_zip'
+    }
+    multiple = {
+        'source': 'sources',
+        'highlighted_source': 'highlighted_sources'
+    }
+
+    for artifact in get_session_artifacts(session_id):
+        path = session_path / artifact['name']
+        if artifact['kind'] in single:
+            files[single[artifact['kind']]] = path
+        elif artifact['kind'] in multiple:
+            files.setdefault(multiple[artifact['kind']], []).append(path)
 
     return files
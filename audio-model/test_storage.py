@@ -0,0 +1,135 @@
+"""
+Test the S3 Storage Backend Against an In-Memory Stand-In
+
+Exercises S3StorageBackend with MemoryS3Client (no network, no boto3):
+small objects, multipart uploads larger than a part, and uploads that fail
+partway, plus publishing and deleting a session's input audio.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pipeline_config import PipelineConfig
+from src.models.artifact_storage import MemoryS3Client, S3StorageBackend, set_storage_backend
+
+BUCKET = 'sessions'
+PART_SIZE = 5 * 1024 * 1024
+
+
+def make_backend(client: MemoryS3Client) -> S3StorageBackend:
+    return S3StorageBackend(BUCKET, prefix='test', part_size=PART_SIZE, client=client)
+
+
+def chunked(data: bytes, size: int = 1024 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_small_upload():
+    """Objects smaller than a part are sent with one put_object"""
+    client = MemoryS3Client()
+    data = os.urandom(1024 * 1024)
+
+    url = make_backend(client).upload_chunks('a/small.bin', chunked(data), 'application/octet-stream')
+
+    assert client.objects[BUCKET]['test/a/small.bin'] == data
+    assert client.parts_uploaded == 0
+    print(f"✓ Small upload: {len(data)} bytes, {url}")
+
+
+def test_multipart_upload():
+    """Objects larger than a part are sent as multipart parts"""
+    client = MemoryS3Client()
+    data = os.urandom(2 * PART_SIZE + 123456)
+
+    make_backend(client).upload_chunks('a/large.bin', chunked(data), 'application/octet-stream')
+
+    assert client.objects[BUCKET]['test/a/large.bin'] == data
+    assert client.parts_uploaded == 3
+    assert not client.uploads
+    print(f"✓ Multipart upload: {len(data)} bytes in {client.parts_uploaded} parts")
+
+
+def test_producer_fails_partway():
+    """An error while writing aborts the multipart upload"""
+    client = MemoryS3Client()
+
+    def failing_chunks():
+        yield from chunked(os.urandom(PART_SIZE + 1024))
+        raise RuntimeError("producer failed")
+
+    try:
+        make_backend(client).upload_chunks('a/broken.bin', failing_chunks(), 'application/octet-stream')
+        raise AssertionError("upload should have failed")
+    except RuntimeError:
+        pass
+
+    assert 'test/a/broken.bin' not in client.objects.get(BUCKET, {})
+    assert not client.uploads
+    print("✓ Failed producer: upload aborted, no object")
+
+
+def test_part_upload_fails():
+    """A failed part upload aborts the multipart upload"""
+    client = MemoryS3Client(fail_on_part=2)
+
+    try:
+        make_backend(client).upload_chunks('a/lost.bin', chunked(os.urandom(3 * PART_SIZE)), 'application/octet-stream')
+        raise AssertionError("upload should have failed")
+    except ConnectionError:
+        pass
+
+    assert 'test/a/lost.bin' not in client.objects.get(BUCKET, {})
+    assert not client.uploads
+    print("✓ Failed part: upload aborted, no object")
+
+
+def test_session_publish_and_cleanup():
+    """Session input audio is published while ingested and deleted with the session"""
+    from src.models.session_manager import create_session, ingest_audio, artifact_url, cleanup_session
+
+    client = MemoryS3Client()
+    sessions_dir, blobs_dir = PipelineConfig.SESSIONS_DIR, PipelineConfig.BLOBS_DIR
+    with tempfile.TemporaryDirectory() as work_dir:
+        PipelineConfig.SESSIONS_DIR = Path(work_dir) / 'sessions'
+        PipelineConfig.BLOBS_DIR = Path(work_dir) / 'blobs'
+        PipelineConfig.SESSIONS_DIR.mkdir()
+        set_storage_backend(make_backend(client))
+        try:
+            session_id = create_session()
+            data = os.urandom(PART_SIZE + 1)
+            ingest_audio(session_id, data, 'm4a')
+
+            key = f'test/{session_id}/input/audio.m4a'
+            assert client.objects[BUCKET][key] == data
+            assert artifact_url(session_id, 'input/audio.m4a').startswith(f'memory://{BUCKET}/{key}')
+
+            cleanup_session(session_id)
+            assert key not in client.objects[BUCKET]
+        finally:
+            set_storage_backend(None)
+            PipelineConfig.SESSIONS_DIR, PipelineConfig.BLOBS_DIR = sessions_dir, blobs_dir
+    print("✓ Session audio published and deleted with the session")
+
+
+if __name__ == '__main__':
+    print("\n🧪 TESTING S3 STORAGE BACKEND\n")
+
+    tests = [
+        test_small_upload,
+        test_multipart_upload,
+        test_producer_fails_partway,
+        test_part_upload_fails,
+        test_session_publish_and_cleanup
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print()
+    print("✓ All storage tests passed" if not failed else f"✗ {failed} storage test(s) failed")
@@ -25,18 +25,6 @@ sys.path.insert(0, str(PROJECT_ROOT))
 AUDIO_EXTENSIONS = {'.m4a', '.wav', '.mp3', '.flac', '.aac', '.ogg', '.wma', '.m4p', '.aiff'}
 TEXT_EXTENSIONS = {'.txt'}
 
-def get_current_iteration() -> int:
-    """Get the current iteration number."""
-    iteration_tracker = PROJECT_ROOT / 'data' / 'components' / 'iteration_tracker.txt'
-    try:
-        with open(iteration_tracker, 'r') as f:
-            content = f.read().strip()
-            if '=' in content:
-                return int(content.split('=')[1])
-            return 0
-    except (FileNotFoundError, ValueError):
-        return 0
-
 def create_transcript_output(text: str, iteration: int) -> Path:
     """
     Create a Component 1-style output file from text input.
@@ -92,8 +80,9 @@ def run_pipeline(input_file: Path):
     print(f"File type: {ext}")
     print()
 
-    # Get current iteration
-    iteration = get_current_iteration()
+    # Reserve this run's iteration up front, so concurrent runs never share one
+    from src.models.iteration_tracker import reserve_iteration
+    iteration = reserve_iteration()
     print(f"Current iteration: {iteration}")
     print()
 
@@ -113,7 +102,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 1: Audio Transcription")
         print("=" * 70)
-        result1 = transcribe_audio(input_file)
+        result1 = transcribe_audio(input_file, iteration=iteration)
         print(f"✓ Transcription complete")
         print()
 
@@ -121,7 +110,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 2: Keyword Extraction")
         print("=" * 70)
-        result2 = extract_keywords()
+        result2 = extract_keywords(iteration=iteration)
         print(f"✓ Keyword extraction complete")
         print()
 
@@ -129,7 +118,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 3: Medical Literature Search")
         print("=" * 70)
-        result3 = run_medical_rag()
+        result3 = run_medical_rag(iteration=iteration)
         print(f"✓ Literature search complete")
         print()
 
@@ -137,7 +126,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 4: Final Summary Generation")
         print("=" * 70)
-        result4 = run_cot_summarizer()
+        result4 = run_cot_summarizer(iteration=iteration)
         print(f"✓ Final summary complete")
         print()
 
@@ -179,7 +168,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 2: Keyword Extraction")
         print("=" * 70)
-        result2 = extract_keywords()
+        result2 = extract_keywords(iteration=iteration)
         print(f"✓ Keyword extraction complete")
         print()
 
@@ -187,7 +176,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 3: Medical Literature Search")
         print("=" * 70)
-        result3 = run_medical_rag()
+        result3 = run_medical_rag(iteration=iteration)
         print(f"✓ Literature search complete")
         print()
 
@@ -195,7 +184,7 @@ def run_pipeline(input_file: Path):
         print("=" * 70)
         print("COMPONENT 4: Final Summary Generation")
         print("=" * 70)
-        result4 = run_cot_summarizer()
+        result4 = run_cot_summarizer(iteration=iteration)
         print(f"✓ Final summary complete")
         print()
 